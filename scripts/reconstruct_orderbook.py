@@ -1,6 +1,7 @@
 
 import json
 import csv
+from bisect import bisect_left, insort
 import glob
 import os
 import pandas as pd
@@ -16,6 +17,10 @@ class OrderBook:
     def __init__(self):
         self.bids: Dict[float, float] = {}  # Price -> Qty
         self.asks: Dict[float, float] = {}  # Price -> Qty
+        # Level prices kept sorted (ascending) alongside the dicts, so the best
+        # bid/ask is an index instead of a max()/min() over every level per tick
+        self._bid_prices: List[float] = []
+        self._ask_prices: List[float] = []
         self.last_update_id = 0
         self.timestamp = 0
 
@@ -36,6 +41,9 @@ class OrderBook:
         # Load asks
         for price_str, qty_str in snapshot['asks']:
             self.asks[float(price_str)] = float(qty_str)
+
+        self._bid_prices = sorted(self.bids)
+        self._ask_prices = sorted(self.asks)
             
         print(f"Snapshot applied. ID: {self.last_update_id}. Bids: {len(self.bids)}, Asks: {len(self.asks)}")
 
@@ -59,33 +67,31 @@ class OrderBook:
         
         self.last_update_id = update_data['u']
         
-        # Apply Bids
-        for price, qty in update_data['b']:
-            price_f = float(price)
-            qty_f = float(qty)
-            if qty_f == 0.0:
-                if price_f in self.bids:
-                    del self.bids[price_f]
-            else:
-                self.bids[price_f] = qty_f
-                
-        # Apply Asks
-        for price, qty in update_data['a']:
+        self._apply_levels(self.bids, self._bid_prices, update_data['b'])
+        self._apply_levels(self.asks, self._ask_prices, update_data['a'])
+
+    @staticmethod
+    def _apply_levels(levels: Dict[float, float], prices: List[float], changes: list) -> None:
+        """Set or remove (qty 0) levels on one side, keeping `prices` sorted."""
+        for price, qty in changes:
             price_f = float(price)
             qty_f = float(qty)
             if qty_f == 0.0:
-                if price_f in self.asks:
-                    del self.asks[price_f]
+                if price_f in levels:
+                    del levels[price_f]
+                    del prices[bisect_left(prices, price_f)]
             else:
-                self.asks[price_f] = qty_f
+                if price_f not in levels:
+                    insort(prices, price_f)
+                levels[price_f] = qty_f
 
     def get_best_bid_ask(self) -> Tuple[float, float, float, float]:
         """Return (best_bid, best_ask, bid_qty, ask_qty)."""
         if not self.bids or not self.asks:
             return 0.0, 0.0, 0.0, 0.0
             
-        best_bid = max(self.bids.keys())
-        best_ask = min(self.asks.keys())
+        best_bid = self._bid_prices[-1]
+        best_ask = self._ask_prices[0]
         return best_bid, best_ask, self.bids[best_bid], self.asks[best_ask]
 
     def get_mid_price(self) -> float:
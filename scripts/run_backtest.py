@@ -470,8 +470,8 @@ async def run_backtest(symbol: str, days: int, strategy_name: str, provider: str
         
         # Inject Current Signal/Position State for Hysteresis
         current_active_signal = None
-        if backtester.positions:
-            pos = backtester.positions[0]
+        if backtester.position is not None:
+            pos = backtester.position
             current_active_signal = Signal(
                 timestamp=kline.timestamp,
                 symbol=symbol,
@@ -496,9 +496,9 @@ async def run_backtest(symbol: str, days: int, strategy_name: str, provider: str
         }
         
         if strategy_name == "momentum":
-            result = await momentum_strategy_node(state) # type: ignore
+            result = momentum_strategy_node(state) # type: ignore
         elif strategy_name == "mean_reversion":
-            result = await mean_reversion_strategy_node(state) # type: ignore
+            result = mean_reversion_strategy_node(state) # type: ignore
         else:
             print(f"Unknown strategy: {strategy_name}")
             return
@@ -537,11 +537,11 @@ async def run_backtest(symbol: str, days: int, strategy_name: str, provider: str
         ax1.plot(times, prices, label='Price', color='gray', alpha=0.5)
         
         for trade in backtester.trades:
-            timestamp = trade['timestamp']
-            price = trade['price']
-            side = trade['side'] # LONG or SHORT
+            timestamp = trade.timestamp
+            price = trade.price
+            side = trade.side # LONG or SHORT
             
-            if trade['type'] == 'OPEN':
+            if trade.type == 'OPEN':
                 # Mark Entry
                 color = 'g' if side == 'LONG' else 'r'
                 marker = '^' if side == 'LONG' else 'v'
@@ -549,7 +549,7 @@ async def run_backtest(symbol: str, days: int, strategy_name: str, provider: str
                 label = 'Entry' if 'Entry' not in ax1.get_legend_handles_labels()[1] else ""
                 ax1.scatter(timestamp, price, c=color, marker=marker, s=100, label=label, zorder=5)
             
-            elif trade['type'] == 'CLOSE':
+            elif trade.type == 'CLOSE':
                  # Mark Exit
                  # Only label once
                  label = 'Exit' if 'Exit' not in ax1.get_legend_handles_labels()[1] else ""
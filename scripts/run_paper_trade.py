@@ -112,7 +112,7 @@ async def main():
                     print("Warning: No klines fetched.")
 
                 # 2. Compute Features (OFI, Volatility, etc.)
-                current_state = await compute_features_node(current_state)
+                current_state = compute_features_node(current_state)
                 features = current_state.get("features")
                 if features:
                     print(f"Features: OFI={features.ofi}, VolForecast={features.volatility_forecast}")
@@ -128,8 +128,8 @@ async def main():
                 # Here we just run both for simplicity and let router decide? 
                 # Actually, let's run both and let Risk Manager filter based on confidence.
                 
-                mom_state = await momentum_strategy_node(current_state)
-                mr_state = await mean_reversion_strategy_node(current_state)
+                mom_state = momentum_strategy_node(current_state)
+                mr_state = mean_reversion_strategy_node(current_state)
                 
                 # Merge signals
                 all_signals = mom_state.get("signals", []) + mr_state.get("signals", [])
@@ -58,11 +58,15 @@ class Settings(BaseSettings):
     # Trading Configuration
     symbol: str = "BTCUSDT"
     testnet: bool = True
+    binance_websockets: bool = False  # Stream depth/trades instead of polling REST
 
     # Reliability
     MAX_RETRIES: int = 3
     RETRY_DELAY_MIN: float = 1.0
     RETRY_DELAY_MAX: float = 10.0
+    alpaca_max_concurrency: int = 10  # Max in-flight Alpaca REST calls
+    alpaca_breaker_failures: int = 5  # Consecutive failures before an endpoint trips
+    alpaca_breaker_reset_seconds: int = 30  # How long a tripped endpoint stays open
 
     # Risk Limits
     REQUIRE_STOP_LOSS: bool = True
@@ -94,6 +98,13 @@ class Settings(BaseSettings):
     llm_model: str = "gemini-pro-latest"
     llm_temperature: float = 0.0
     llm_max_tokens: int = 1024
+    llm_timeout_seconds: float = 2.0  # Deadline for one Gemini call
+    llm_breaker_failures: int = 5  # Consecutive failures before LLM calls are skipped
+    llm_breaker_reset_seconds: int = 30  # How long LLM calls stay skipped
+
+    # World Model (TS-JEPA)
+    jepa_bfloat16: bool = False  # Cast weights/inputs to bfloat16 for inference
+    jepa_compile: bool = False  # Prefer torch.compile(reduce-overhead) over TorchScript
 
     # Application Settings
     log_level: str = "INFO"
@@ -132,11 +143,15 @@ class Settings(BaseSettings):
             # Trading Configuration
             self.symbol = os.getenv("SYMBOL", "BTCUSDT")
             self.testnet = os.getenv("TESTNET", "true").lower() in {"1", "true", "yes"}
+            self.binance_websockets = os.getenv("BINANCE_WEBSOCKETS", "false").lower() in {"1", "true", "yes"}
 
             # Reliability
             self.MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
             self.RETRY_DELAY_MIN = float(os.getenv("RETRY_DELAY_MIN", "1.0"))
             self.RETRY_DELAY_MAX = float(os.getenv("RETRY_DELAY_MAX", "10.0"))
+            self.alpaca_max_concurrency = int(os.getenv("ALPACA_MAX_CONCURRENCY", "10"))
+            self.alpaca_breaker_failures = int(os.getenv("ALPACA_BREAKER_FAILURES", "5"))
+            self.alpaca_breaker_reset_seconds = int(os.getenv("ALPACA_BREAKER_RESET_SECONDS", "30"))
 
             # Risk Limits
             self.REQUIRE_STOP_LOSS = os.getenv("REQUIRE_STOP_LOSS", "true").lower() in {"1", "true", "yes"}
@@ -166,6 +181,13 @@ class Settings(BaseSettings):
             self.llm_model = os.getenv("LLM_MODEL", "gemini-pro-latest")
             self.llm_temperature = float(os.getenv("LLM_TEMPERATURE", "0.0"))
             self.llm_max_tokens = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+            self.llm_timeout_seconds = float(os.getenv("LLM_TIMEOUT_SECONDS", "2.0"))
+            self.llm_breaker_failures = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+            self.llm_breaker_reset_seconds = int(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+            # World Model (TS-JEPA)
+            self.jepa_bfloat16 = os.getenv("JEPA_BFLOAT16", "false").lower() in {"1", "true", "yes"}
+            self.jepa_compile = os.getenv("JEPA_COMPILE", "false").lower() in {"1", "true", "yes"}
 
             # Application Settings
             self.log_level = os.getenv("LOG_LEVEL", "INFO")
@@ -9,6 +9,7 @@ from app.tools.trading_provider import trading_provider
 from app.schemas.models import RiskLimits
 from app.healthcheck import run_all_checks, HealthCheckError
 from app.utils.logging_config import setup_logging
+from app.utils.clock import begin_tick
 
 # Configure logging
 logger = setup_logging()
@@ -103,7 +104,7 @@ async def run_trading_loop() -> None:
             # Reset state for new iteration
             state = {
                 **initial_state,
-                "timestamp": datetime.now()
+                "timestamp": begin_tick()
             }
 
             # Execute the graph
@@ -200,7 +201,7 @@ async def run_single_iteration() -> None:
         ),
         "execution_results": [],
         "symbol": settings.symbol,
-        "timestamp": datetime.now()
+        "timestamp": begin_tick()
     }
 
     result = await graph.ainvoke(state)
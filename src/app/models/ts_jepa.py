@@ -51,5 +51,5 @@ class TS_JEPA(nn.Module):
 
     def get_latent_state(self, x_input):
         """Helper to get the clean state vector."""
-        with torch.no_grad():
+        with torch.inference_mode():
             return self.context_encoder(x_input)    
\ No newline at end of file
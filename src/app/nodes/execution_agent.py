@@ -6,6 +6,7 @@ import asyncio
 from app.schemas.models import Order, ExecutionResult
 from app.tools.trading_provider import trading_provider
 from app.config import settings
+from app.utils.clock import now
 
 
 class ExecutionState(TypedDict):
@@ -60,7 +61,7 @@ async def execution_agent_node(state: ExecutionState) -> ExecutionState:
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
             execution_results.append(error_result)
             print(f"Exception during order execution: {e}")
@@ -68,7 +69,7 @@ async def execution_agent_node(state: ExecutionState) -> ExecutionState:
     return {
         **state,
         "execution_results": execution_results,
-        "timestamp": datetime.now()
+        "timestamp": now()
     }
 
 
@@ -1,6 +1,7 @@
 """Feature engineering node for computing technical indicators."""
-from typing import TypedDict
+from typing import Hashable, TypedDict
 from datetime import datetime
+import math
 import numpy as np
 from collections import deque
 
@@ -9,13 +10,65 @@ from app.schemas.models import MarketFeatures
 from app.config import settings
 from app.utils.statistics import check_stationarity, calculate_hurst, forecast_volatility
 from app.utils.persistence import persistence
+from app.utils.clock import now
+from app.utils.jit import NUMBA_AVAILABLE, njit
+from app.utils.ring_buffer import RingBuffer
+
+
+@njit(cache=True, fastmath=True)
+def _ema_loop(prices, alpha: float) -> float:
+    """Run the EMA recurrence over ``prices`` and return the final value."""
+    ema = prices[0]
+    for i in range(1, len(prices)):
+        ema = prices[i] * alpha + ema * (1.0 - alpha)
+    return ema
+
+
+@njit(cache=True)
+def _wilder_smooth(data: np.ndarray, period: int) -> np.ndarray:
+    """Wilder running sum: the first `period` values summed, then prev - prev/period + x."""
+    out = np.empty(data.shape[0] - period + 1)
+    total = 0.0
+    for i in range(period):
+        total += data[i]
+    out[0] = total
+    for i in range(period, data.shape[0]):
+        total = total - total / period + data[i]
+        out[i - period + 1] = total
+    return out
+
+
+@njit(cache=True)
+def _wilder_average(data: np.ndarray, period: int) -> float:
+    """Wilder moving average of `data`, seeded with the mean of its first `period` values."""
+    avg = 0.0
+    for i in range(period):
+        avg += data[i]
+    avg /= period
+    for i in range(period, data.shape[0]):
+        avg = (avg * (period - 1) + data[i]) / period
+    return avg
+
+
+def _true_range(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """True range of each bar after the first."""
+    prev_closes = closes[:-1]
+    return np.maximum.reduce([
+        highs[1:] - lows[1:],
+        np.abs(highs[1:] - prev_closes),
+        np.abs(lows[1:] - prev_closes),
+    ])
+
+
+# Entries kept by the Bollinger band cache
+BB_CACHE_SIZE = 128
 
 
 class FeatureState(TypedDict):
     """State for feature engineering."""
     trades: list[TradeEvent]
     orderbook: OrderbookUpdate | None
-    klines: list[KlineEvent]
+    klines: list[KlineEvent] | np.ndarray  # events, or a KLINE_DTYPE batch
     features: MarketFeatures | None
     symbol: str
     timestamp: datetime
@@ -31,24 +84,52 @@ class FeatureEngine:
         
         # Ensure price buffer is large enough for Bollinger Bands and Volatility
         max_price_lookback = max(settings.volatility_lookback, settings.bollinger_period)
-        self.price_buffer: deque[float] = deque(maxlen=max_price_lookback)
+        self.price_buffer = RingBuffer(max_price_lookback)
         
         # Ensure close buffer is large enough for RSI and ADX
         # ADX needs 2x period for smoothing
         max_close_lookback = max(settings.atr_period, settings.rsi_period + 1, 50) 
-        self.high_buffer: deque[float] = deque(maxlen=max_close_lookback)
-        self.low_buffer: deque[float] = deque(maxlen=max_close_lookback)
-        self.close_buffer: deque[float] = deque(maxlen=max_close_lookback)
+        # Kept column-wise (one float64 ring per field) so indicators read arrays directly
+        self.high_buffer = RingBuffer(max_close_lookback)
+        self.low_buffer = RingBuffer(max_close_lookback)
+        self.close_buffer = RingBuffer(max_close_lookback)
 
         self.ema_9: float | None = None
         self.ema_50: float | None = None
         self.ema_200: float | None = None
+        # Streaming EMA values keyed by (symbol, period); the buffers above only
+        # collect warm-up samples until a key has been seeded
+        self._ema_state: dict[tuple[str, int], float] = {}
+        # Open time (ns) of the newest kline folded into each symbol's EMAs
+        self.ema_last_kline_ns: dict[str, int] = {}
+        # Bollinger bands by (cache_key, period, std_dev), oldest evicted first
+        self._bb_cache: dict[Hashable, tuple[float, float, float]] = {}
         
         # OFI Smoothing (Phase 4)
         self.ofi_buffer: deque[float] = deque(maxlen=5) # 5-period SMA
         self.ofi_sma: float | None = None
         
-        self.prev_orderbook: OrderbookUpdate | None = None
+        # Best-of-book of the previous snapshot, cached as plain floats for OFI (NaN = none)
+        self._prev_orderbook: OrderbookUpdate | None = None
+        self._prev_bid_p = self._prev_bid_q = math.nan
+        self._prev_ask_p = self._prev_ask_q = math.nan
+
+    @property
+    def prev_orderbook(self) -> OrderbookUpdate | None:
+        """Previous orderbook snapshot; setting it caches its top of book."""
+        return self._prev_orderbook
+
+    @prev_orderbook.setter
+    def prev_orderbook(self, orderbook: OrderbookUpdate | None) -> None:
+        self._prev_orderbook = orderbook
+        if orderbook is not None and orderbook.has_both_sides():
+            self._prev_bid_p = float(orderbook.bid_prices[0])
+            self._prev_bid_q = float(orderbook.bid_sizes[0])
+            self._prev_ask_p = float(orderbook.ask_prices[0])
+            self._prev_ask_q = float(orderbook.ask_sizes[0])
+        else:
+            self._prev_bid_p = self._prev_bid_q = math.nan
+            self._prev_ask_p = self._prev_ask_q = math.nan
 
     def compute_ema(self, prices: list[float], period: int) -> float | None:
         """Compute Exponential Moving Average."""
@@ -56,27 +137,53 @@ class FeatureEngine:
             return None
 
         multiplier = 2.0 / (period + 1)
-        ema = prices[0]
-
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
 
+        # The recurrence is sequential, so it only gets faster when compiled;
+        # without numba the list is iterated directly rather than boxed into an array.
+        if NUMBA_AVAILABLE:
+            return float(_ema_loop(np.asarray(prices, dtype=np.float64), multiplier))
+        return float(_ema_loop(prices, multiplier))
+
+    def seed_ema(self, symbol: str, prices: list[float], period: int) -> float | None:
+        """Start the streaming EMA for (symbol, period) from a batch of prices."""
+        ema = self.compute_ema(prices, period)
+        if ema is not None:
+            self._ema_state[(symbol, period)] = ema
         return ema
 
-    def update_ema(self, price: float) -> None:
-        """Update EMAs incrementally."""
-        self.ema_9_buffer.append(price)
-        self.ema_50_buffer.append(price)
-        self.ema_200_buffer.append(price)
+    def is_ema_seeded(self, symbol: str, period: int) -> bool:
+        """Whether (symbol, period) has a streaming EMA yet."""
+        return (symbol, period) in self._ema_state
+
+    def compute_ema_streaming(self, symbol: str, price: float, period: int) -> float:
+        """Advance the EMA for (symbol, period) by one price in O(1)."""
+        key = (symbol, period)
+        alpha = 2.0 / (period + 1)
+        prev = self._ema_state.get(key, price)
+        ema = alpha * price + (1.0 - alpha) * prev
+        self._ema_state[key] = ema
+        return ema
 
-        if len(self.ema_9_buffer) >= settings.ema_short_period:
-            self.ema_9 = self.compute_ema(list(self.ema_9_buffer), settings.ema_short_period)
+    def update_ema(self, price: float, symbol: str | None = None) -> None:
+        """Update EMAs incrementally with one closed-candle price.
 
-        if len(self.ema_50_buffer) >= settings.ema_long_period:
-            self.ema_50 = self.compute_ema(list(self.ema_50_buffer), settings.ema_long_period)
-            
-        if len(self.ema_200_buffer) >= 200:
-            self.ema_200 = self.compute_ema(list(self.ema_200_buffer), 200)
+        Each EMA warms up on its buffer until `period` prices are available,
+        is seeded from them once, and from then on is a streaming update.
+        `symbol` defaults to the configured symbol at call time.
+        """
+        if symbol is None:
+            symbol = settings.symbol
+        for attr, buffer, period in (
+            ("ema_9", self.ema_9_buffer, settings.ema_short_period),
+            ("ema_50", self.ema_50_buffer, settings.ema_long_period),
+            ("ema_200", self.ema_200_buffer, 200),
+        ):
+            if self.is_ema_seeded(symbol, period):
+                setattr(self, attr, self.compute_ema_streaming(symbol, price, period))
+                continue
+            buffer.append(price)
+            if len(buffer) >= period:
+                setattr(self, attr, self.seed_ema(symbol, list(buffer), period))
 
     def update_ofi(self, ofi_val: float) -> None:
         """Update OFI buffer and compute SMA."""
@@ -94,35 +201,21 @@ class FeatureEngine:
         if len(self.high_buffer) < settings.atr_period:
             return None
 
-        highs = list(self.high_buffer)
-        lows = list(self.low_buffer)
-        closes = list(self.close_buffer)
-
-        true_ranges: list[float] = []
-
-        for i in range(1, len(highs)):
-            high_low = highs[i] - lows[i]
-            high_close = abs(highs[i] - closes[i-1])
-            low_close = abs(lows[i] - closes[i-1])
-            true_ranges.append(max(high_low, high_close, low_close))
+        true_ranges = _true_range(
+            self.high_buffer.view(), self.low_buffer.view(), self.close_buffer.view()
+        )
 
-        return sum(true_ranges) / len(true_ranges) if true_ranges else None
+        return float(true_ranges.mean()) if true_ranges.size else None
 
     def compute_realized_volatility(self) -> float | None:
         """Compute realized volatility from recent prices."""
         if len(self.price_buffer) < 2:
             return None
 
-        prices = list(self.price_buffer)
-        returns = [
-            (prices[i] - prices[i-1]) / prices[i-1]
-            for i in range(1, len(prices))
-        ]
+        prices = self.price_buffer.view()
+        returns = np.diff(prices) / prices[:-1]
 
-        if not returns:
-            return None
-
-        return float(np.std(returns)) * np.sqrt(len(returns))
+        return float(returns.std()) * np.sqrt(returns.size)
 
     def compute_vwap(self, trades: list[TradeEvent]) -> float | None:
         """Compute Volume Weighted Average Price."""
@@ -165,15 +258,37 @@ class FeatureEngine:
         return rsi
 
     def compute_bollinger_bands(
-        self, prices: list[float], period: int = 20, std_dev: float = 2.0
+        self,
+        prices: list[float],
+        period: int = 20,
+        std_dev: float = 2.0,
+        cache_key: Hashable = None
     ) -> tuple[float, float, float] | None:
-        """Compute Bollinger Bands (Upper, Mid, Lower)."""
+        """
+        Compute Bollinger Bands (Upper, Mid, Lower).
+
+        With a `cache_key` that identifies the window (e.g. symbol and last
+        kline timestamp), repeated calls for an unchanged window are served
+        from a small cache instead of being recomputed.
+        """
+        if cache_key is not None:
+            key = (cache_key, period, std_dev)
+            cached = self._bb_cache.get(key)
+            if cached is not None:
+                return cached
+            bands = self.compute_bollinger_bands(prices, period, std_dev)
+            if bands is not None:
+                if len(self._bb_cache) >= BB_CACHE_SIZE:
+                    del self._bb_cache[next(iter(self._bb_cache))]
+                self._bb_cache[key] = bands
+            return bands
+
         if len(prices) < period:
             return None
 
-        recent_prices = prices[-period:]
-        sma = sum(recent_prices) / period
-        std = float(np.std(recent_prices))
+        recent_prices = np.asarray(prices[-period:], dtype=np.float64)
+        sma = float(recent_prices.mean())
+        std = float(recent_prices.std())
 
         upper = sma + (std * std_dev)
         lower = sma - (std * std_dev)
@@ -189,96 +304,44 @@ class FeatureEngine:
         if len(self.high_buffer) < period * 2:
             return None
 
-        highs = list(self.high_buffer)
-        lows = list(self.low_buffer)
-        closes = list(self.close_buffer)
+        highs = self.high_buffer.view()
+        lows = self.low_buffer.view()
+        closes = self.close_buffer.view()
         
         # Need at least period + 1 data points to calculate changes
         if len(highs) < period + 1:
             return None
 
-        tr_list = []
-        dm_plus_list = []
-        dm_minus_list = []
+        tr = _true_range(highs, lows, closes)
 
-        for i in range(1, len(highs)):
-            # True Range
-            h_l = highs[i] - lows[i]
-            h_pc = abs(highs[i] - closes[i-1])
-            l_pc = abs(lows[i] - closes[i-1])
-            tr = max(h_l, h_pc, l_pc)
-            tr_list.append(tr)
-
-            # Directional Movement
-            up_move = highs[i] - highs[i-1]
-            down_move = lows[i-1] - lows[i]
-
-            if up_move > down_move and up_move > 0:
-                dm_plus_list.append(up_move)
-            else:
-                dm_plus_list.append(0.0)
+        # Directional Movement
+        up_move = highs[1:] - highs[:-1]
+        down_move = lows[:-1] - lows[1:]
+        dm_plus = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        dm_minus = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
 
-            if down_move > up_move and down_move > 0:
-                dm_minus_list.append(down_move)
-            else:
-                dm_minus_list.append(0.0)
-
-        if len(tr_list) < period:
+        if len(tr) < period:
             return None
 
-        # Wilder's Smoothing
-        def smooth(data: list[float], period: int) -> list[float]:
-            smoothed = []
-            # First value is simple sum (or average? Wilder uses sum for first, then smooth)
-            # Standard Wilder's: First = Sum(first N), Subsequent = Prev - (Prev/N) + Current
-            
-            # Initialize with sum of first 'period' elements
-            curr_smooth = sum(data[:period])
-            smoothed.append(curr_smooth)
-            
-            for i in range(period, len(data)):
-                curr_smooth = curr_smooth - (curr_smooth / period) + data[i]
-                smoothed.append(curr_smooth)
-            return smoothed
-
-        tr_smooth = smooth(tr_list, period)
-        dm_plus_smooth = smooth(dm_plus_list, period)
-        dm_minus_smooth = smooth(dm_minus_list, period)
-
-        dx_list = []
-        for i in range(len(tr_smooth)):
-            if tr_smooth[i] == 0:
-                dx_list.append(0.0)
-                continue
-                
-            di_plus = 100 * (dm_plus_smooth[i] / tr_smooth[i])
-            di_minus = 100 * (dm_minus_smooth[i] / tr_smooth[i])
-            
+        # Wilder's Smoothing (first = sum of the first N, then prev - prev/N + current)
+        tr_smooth = _wilder_smooth(tr, period)
+        dm_plus_smooth = _wilder_smooth(dm_plus, period)
+        dm_minus_smooth = _wilder_smooth(dm_minus, period)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            di_plus = 100 * (dm_plus_smooth / tr_smooth)
+            di_minus = 100 * (dm_minus_smooth / tr_smooth)
             denom = di_plus + di_minus
-            if denom == 0:
-                dx = 0.0
-            else:
-                dx = 100 * abs(di_plus - di_minus) / denom
-            dx_list.append(dx)
+            dx = 100 * np.abs(di_plus - di_minus) / denom
+        dx = np.where((tr_smooth == 0) | (denom == 0), 0.0, dx)
 
-        # ADX is smoothed DX
-        # We need at least 'period' DX values to smooth them? 
-        # Actually standard ADX usually smooths DX over 'period' as well.
-        
-        if len(dx_list) < period:
+        if len(dx) < period:
             # Not enough data for full ADX smoothing
             # Fallback: simple average of available DX
-            return sum(dx_list) / len(dx_list)
-            
-        # Smooth DX to get ADX
-        # Initialize ADX with average of first 'period' DX values
-        adx = sum(dx_list[:period]) / period
-        
-        # Smooth remaining
-        for i in range(period, len(dx_list)):
-            adx = ((adx * (period - 1)) + dx_list[i]) / period
-            
-        return adx
+            return float(dx.sum() / len(dx))
+
+        # ADX is DX smoothed with Wilder's average, seeded with the mean of the first `period`
+        return float(_wilder_average(dx, period))
 
     def compute_ofi(self, current: OrderbookUpdate) -> float | None:
         """
@@ -287,19 +350,16 @@ class FeatureEngine:
         OFI = Change in Bid Depth - Change in Ask Depth
         Tracks aggressive buying/selling pressure at the Best Bid/Ask.
         """
-        if not self.prev_orderbook:
-            return None
-            
-        if not current.bids or not current.asks or not self.prev_orderbook.bids or not self.prev_orderbook.asks:
+        if math.isnan(self._prev_bid_p) or not current.has_both_sides():
             return None
 
         # Best Bid/Ask (Price, Qty)
-        bb_curr_p, bb_curr_q = current.bids[0]
-        bb_prev_p, bb_prev_q = self.prev_orderbook.bids[0]
-        
-        bo_curr_p, bo_curr_q = current.asks[0]
-        bo_prev_p, bo_prev_q = self.prev_orderbook.asks[0]
-        
+        bb_curr_p, bb_curr_q = float(current.bid_prices[0]), float(current.bid_sizes[0])
+        bb_prev_p, bb_prev_q = self._prev_bid_p, self._prev_bid_q
+
+        bo_curr_p, bo_curr_q = float(current.ask_prices[0]), float(current.ask_sizes[0])
+        bo_prev_p, bo_prev_q = self._prev_ask_p, self._prev_ask_q
+
         # Bid Side Impact
         if bb_curr_p > bb_prev_p:
             bid_impact = bb_curr_q
@@ -317,7 +377,7 @@ class FeatureEngine:
             ask_impact = bo_curr_q - bo_prev_q
             
         # OFI = Net Buying Pressure
-        return bid_impact - ask_impact
+        return float(bid_impact - ask_impact)
 
     def to_dict(self) -> dict:
         """Serialize state to dict."""
@@ -332,6 +392,8 @@ class FeatureEngine:
             "ema_9": self.ema_9,
             "ema_50": self.ema_50,
             "ema_200": self.ema_200,
+            "ema_state": [[symbol, period, ema] for (symbol, period), ema in self._ema_state.items()],
+            "ema_last_kline_ns": self.ema_last_kline_ns,
             "ofi_buffer": list(self.ofi_buffer),
             "ofi_sma": self.ofi_sma
         }
@@ -360,6 +422,9 @@ class FeatureEngine:
             self.ema_9 = data.get("ema_9")
             self.ema_50 = data.get("ema_50")
             self.ema_200 = data.get("ema_200")
+            for symbol, period, ema in data.get("ema_state", []):
+                self._ema_state[(symbol, period)] = ema
+            self.ema_last_kline_ns.update(data.get("ema_last_kline_ns", {}))
             
             if "ofi_buffer" in data:
                  self.ofi_buffer.extend(data["ofi_buffer"])
@@ -377,7 +442,12 @@ feature_engine = FeatureEngine()
 # Flag to track if state has been initialized/loaded
 _features_loaded = False
 
-async def compute_features_node(state: FeatureState) -> FeatureState:
+def _kline_ns(klines: list[KlineEvent] | np.ndarray, i: int) -> int:
+    """Open time in nanoseconds of kline `i` in either accepted batch format."""
+    return int(klines["ts"][i]) if isinstance(klines, np.ndarray) else klines[i].timestamp_ns
+
+
+def compute_features_node(state: FeatureState) -> FeatureState:
     """
     Compute technical features from market data.
 
@@ -410,52 +480,41 @@ async def compute_features_node(state: FeatureState) -> FeatureState:
     elif trades:
         # Use last trade if no orderbook
         current_price = trades[-1].price
-    elif klines:
+    elif len(klines):
         # Fallback to last closed candle (least preferred for live trading)
-        current_price = klines[-1].close
+        last = klines[-1]
+        current_price = float(last["close"]) if isinstance(klines, np.ndarray) else last.close
 
     if current_price == 0.0:
         return state
 
     # Update price buffers with kline data
     lookback_needed = 200 # Need deeper lookback for 200 EMA
-    for kline in klines[-lookback_needed:]:
-        feature_engine.high_buffer.append(kline.high)
-        feature_engine.low_buffer.append(kline.low)
-        feature_engine.close_buffer.append(kline.close)
-        feature_engine.price_buffer.append(kline.close)
-        feature_engine.ema_200_buffer.append(kline.close) # Ensure buffer is fed
-
-    # Compute EMA values from available klines to avoid long warm-up delays.
-    closes = [k.close for k in klines]
-
-    ema9_val = None
-    ema50_val = None
-    ema200_val = None
-
-    if len(closes) >= settings.ema_short_period:
-        ema9_val = feature_engine.compute_ema(
-            closes[-settings.ema_short_period :], settings.ema_short_period
-        )
-    if len(closes) >= settings.ema_long_period:
-        ema50_val = feature_engine.compute_ema(
-            closes[-settings.ema_long_period :], settings.ema_long_period
-        )
-    if len(closes) >= 200:
-        ema200_val = feature_engine.compute_ema(
-            closes[-200 :], 200
-        )
-
-    # Assign computed EMAs if available
-    if ema9_val is not None:
-        feature_engine.ema_9 = ema9_val
-    if ema50_val is not None:
-        feature_engine.ema_50 = ema50_val
-    if ema200_val is not None:
-        feature_engine.ema_200 = ema200_val
-
-    # Also keep incremental update
-    feature_engine.update_ema(current_price)
+    recent_klines = klines[-lookback_needed:]
+    if len(recent_klines):
+        if isinstance(recent_klines, np.ndarray):
+            # KLINE_DTYPE batch: the columns are already packed
+            highs, lows, kline_closes = recent_klines["high"], recent_klines["low"], recent_klines["close"]
+        else:
+            # Transpose the events into columns once, then write each ring in one batch
+            highs, lows, kline_closes = np.array(
+                [(k.high, k.low, k.close) for k in recent_klines], dtype=np.float64
+            ).T
+        feature_engine.high_buffer.extend(highs)
+        feature_engine.low_buffer.extend(lows)
+        feature_engine.close_buffer.extend(kline_closes)
+        feature_engine.price_buffer.extend(kline_closes)
+
+        # EMAs advance once per closed kline, never on intra-bar ticks. Only
+        # klines newer than the last one consumed are fed: usually none or one,
+        # and the whole window on a cold start (warm-up, then O(1) updates).
+        last_ns = feature_engine.ema_last_kline_ns.get(symbol)
+        start = len(recent_klines)
+        while start > 0 and (last_ns is None or _kline_ns(recent_klines, start - 1) > last_ns):
+            start -= 1
+        for close in kline_closes[start:].tolist():
+            feature_engine.update_ema(close, symbol)
+        feature_engine.ema_last_kline_ns[symbol] = _kline_ns(recent_klines, -1)
 
     # Compute ATR
     atr = feature_engine.compute_atr()
@@ -502,7 +561,7 @@ async def compute_features_node(state: FeatureState) -> FeatureState:
     if len(closes_list) > 30:
         returns = [(closes_list[i] - closes_list[i-1])/closes_list[i-1] for i in range(1, len(closes_list))]
         # Use GARCH if available
-        vol_forecast = forecast_volatility(returns, method='GARCH')
+        vol_forecast = forecast_volatility(returns, method='GARCH', cache_key=symbol)
 
     # Compute Bollinger Bands (Dynamic GARCH Logic)
     # Default std dev from settings
@@ -540,9 +599,10 @@ async def compute_features_node(state: FeatureState) -> FeatureState:
         recent_sigma = 0.0
         if len(closes_list) > 0:
              # Re-calc simple std dev of recent returns
-             r_slice = [(closes_list[i] - closes_list[i-1])/closes_list[i-1] for i in range(1, len(closes_list))]
-             if r_slice:
-                 recent_sigma = float(np.std(r_slice))
+             closes_arr = np.asarray(closes_list, dtype=np.float64)
+             r_slice = np.diff(closes_arr) / closes_arr[:-1]
+             if r_slice.size:
+                 recent_sigma = float(r_slice.std())
                  
         if recent_sigma > 0:
             ratio = vol_forecast / recent_sigma
@@ -557,7 +617,7 @@ async def compute_features_node(state: FeatureState) -> FeatureState:
     bb_mid = None
     bb_lower = None
     bb_res = feature_engine.compute_bollinger_bands(
-        list(feature_engine.price_buffer),
+        feature_engine.price_buffer.view(),
         settings.bollinger_period,
         std_dev_mult # Dynamic!
     )
@@ -565,7 +625,7 @@ async def compute_features_node(state: FeatureState) -> FeatureState:
         bb_upper, bb_mid, bb_lower = bb_res
 
     features = MarketFeatures(
-        timestamp=datetime.now(),
+        timestamp=now(),
         symbol=symbol,
         price=current_price,
         ema_9=feature_engine.ema_9,
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from app.schemas.models import Signal, PortfolioState, MarketFeatures
 from app.config import settings
+from app.utils.clock import now
 
 
 class HedgeAgentState(TypedDict):
@@ -29,33 +30,22 @@ def hedge_agent_node(state: HedgeAgentState) -> HedgeAgentState:
     # If no portfolio state, we can't really hedge existing positions, 
     # but we can hedge new signals.
     
-    # 1. Calculate current Spot Exposure
+    # 1. & 3. Current Spot Exposure and current Hedge (Future Short), in one pass
     current_spot_qty = 0.0
-    if portfolio and portfolio.positions:
-        for pos in portfolio.positions:
-            if pos.symbol == symbol and pos.instrument_type == "SPOT" and pos.side == "LONG":
-                current_spot_qty += pos.quantity
-                
-    # 2. Calculate Incoming Spot Exposure (from signals)
-    incoming_spot_qty = 0.0
-    for signal in signals:
-        if signal.symbol == symbol and signal.instrument_type == "SPOT" and signal.direction == "LONG":
-            # We don't know the exact quantity yet as Risk Manager calculates it.
-            # But we can signal the INTENT to hedge.
-            # Or, we can wait for the next cycle? 
-            # Ideally, we want to hedge immediately.
-            # Since we don't know the quantity, we might issue a "HEDGE_RATIO" signal?
-            # Or we can estimate based on signal strength/risk limits?
-            # For MVP, let's assume we want to hedge existing positions mostly.
-            pass
-
-    # 3. Calculate Current Hedge (Future Short)
     current_hedge_qty = 0.0
     if portfolio and portfolio.positions:
         for pos in portfolio.positions:
-            if pos.symbol == symbol and pos.instrument_type == "FUTURE" and pos.side == "SHORT":
+            if pos.symbol != symbol:
+                continue
+            if pos.instrument_type == "SPOT" and pos.side == "LONG":
+                current_spot_qty += pos.quantity
+            elif pos.instrument_type == "FUTURE" and pos.side == "SHORT":
                 current_hedge_qty += pos.quantity
 
+    # 2. Incoming Spot Exposure (from signals) is not counted: the quantity of a
+    # SPOT LONG signal is only known once the Risk Manager sizes it, so for the
+    # MVP we hedge existing positions only (see below).
+
     # 4. Determine Desired Hedge
     # Strategy: Delta Neutral? Or Partial Hedge?
     # Let's assume we want to be Delta Neutral for now (1:1 hedge).
@@ -114,7 +104,7 @@ def hedge_agent_node(state: HedgeAgentState) -> HedgeAgentState:
         signal_direction = "SHORT" if hedge_diff > 0 else "LONG"
         
         hedge_signal = Signal(
-            timestamp=datetime.now(),
+            timestamp=now(),
             symbol=symbol,
             instrument_type="FUTURE",
             strategy="hedge",
@@ -7,8 +7,9 @@ import csv
 from pathlib import Path
 
 from app.schemas.events import TradeEvent, OrderbookUpdate, KlineEvent
-from app.tools.trading_provider import trading_provider
+from app.tools.trading_provider import gather_market_snapshot, trading_provider
 from app.config import settings
+from app.utils.clock import now
 
 
 class IngestState(TypedDict):
@@ -34,15 +35,10 @@ async def ingest_market_data_node(state: IngestState) -> IngestState:
 
     # Otherwise fetch live data from trading provider
     try:
-        # Fetch orderbook
-        orderbook = await trading_provider.get_orderbook(symbol, limit=20)
-
-        # Fetch recent trades
-        trades = await trading_provider.get_recent_trades(symbol, limit=100)
-
-        # Fetch recent klines
-        # Fetch recent klines (Fetch enough to resample)
-        klines_1m = await trading_provider.get_klines(symbol, interval="1m", limit=1000)
+        # Fetch orderbook, recent trades and klines (enough to resample) concurrently
+        orderbook, trades, klines_1m = await gather_market_snapshot(
+            trading_provider, symbol, ob_limit=20, trade_limit=100, kline_interval="1m", kline_limit=1000
+        )
         
         # --- Resampling Logic (1m -> 15m) ---
         klines = []
@@ -81,7 +77,7 @@ async def ingest_market_data_node(state: IngestState) -> IngestState:
             "orderbook": orderbook,
             "klines": klines,
             "symbol": symbol,
-            "timestamp": datetime.now()
+            "timestamp": now()
         }
 
     except Exception as e:
@@ -92,7 +88,7 @@ async def ingest_market_data_node(state: IngestState) -> IngestState:
             "orderbook": state.get("orderbook"),
             "klines": state.get("klines", []),
             "symbol": symbol,
-            "timestamp": datetime.now()
+            "timestamp": now()
         }
 
 
@@ -155,7 +151,7 @@ async def _load_from_csv(state: IngestState, csv_path: str) -> IngestState:
             "orderbook": orderbook,
             "klines": klines,
             "symbol": state.get("symbol", settings.symbol),
-            "timestamp": datetime.now()
+            "timestamp": now()
         }
 
     except Exception as e:
@@ -6,6 +6,10 @@ from app.schemas.models import MarketFeatures, Signal
 from app.schemas.events import KlineEvent
 from app.nodes.feature_engineering import feature_engine
 from app.config import settings
+from app.utils.clock import now
+
+_SIDES = {1: "LONG", -1: "SHORT"}
+_PRESSURE = {1: "Buying", -1: "Selling"}
 
 
 class MeanReversionState(TypedDict):
@@ -17,7 +21,7 @@ class MeanReversionState(TypedDict):
     timestamp: datetime
 
 
-async def mean_reversion_strategy_node(state: MeanReversionState) -> MeanReversionState:
+def mean_reversion_strategy_node(state: MeanReversionState) -> MeanReversionState:
     """
     Generate mean reversion trading signals.
 
@@ -33,7 +37,7 @@ async def mean_reversion_strategy_node(state: MeanReversionState) -> MeanReversi
         return {
             **state,
             "signal": Signal(
-                timestamp=datetime.now(),
+                timestamp=now(),
                 symbol=symbol,
                 strategy="mean_reversion",
                 direction="NEUTRAL",
@@ -80,95 +84,57 @@ async def mean_reversion_strategy_node(state: MeanReversionState) -> MeanReversi
             prev_closes = [k.close for k in klines[-(settings.bollinger_period + 1):-1]]
             
             if len(prev_closes) == settings.bollinger_period:
+                # The previous window only changes when a new kline closes,
+                # so the bands are cached on the kline that ends it
                 res = feature_engine.compute_bollinger_bands(
                     prev_closes, 
                     settings.bollinger_period, 
-                    settings.bollinger_std_dev
+                    settings.bollinger_std_dev,
+                    cache_key=(symbol, prev_kline.timestamp_ns)
                 )
                 if res:
                     prev_bb_upper, _, prev_bb_lower = res
 
-        # LONG SIGNAL Logic
-        # 1. Previous Close < Prev Lower Band (Was Oversold)
-        # 2. Current Close > Current Lower Band (Returned to Range)
-        # 3. RSI is low (e.g. < 40) - allowing some recovery from < 30
-        
-        if prev_bb_lower is not None:
-            was_below = prev_kline.close < prev_bb_lower
-            is_above = price > bb_lower
-            
-            # Allow RSI to be slightly higher than strict oversold during the turn
-            rsi_threshold_long = settings.rsi_oversold + 10 
-            
-            if was_below and is_above and rsi < rsi_threshold_long:
-                # Phase 4 Alpha: Check OFI Confirmation
-                # We need buying pressure (OFI > 0) to confirm the reversal
-                if ofi is not None and ofi > 0:
-                    direction = "LONG"
-                    strength = 0.9 # High confidence reversal
-                    confidence = 0.90
-                    reasoning = (
-                        f"Mean Reversion Long (Confirmed): Price returned to band with Buying Pressure "
-                        f"(OFI {ofi:.2f}). RSI {rsi:.2f}"
-                    )
-                elif ofi is None:
-                    # Fallback
-                    direction = "LONG"
-                    strength = 0.7
-                    confidence = 0.75
-                    reasoning = (
-                        f"Mean Reversion Long (Unconfirmed): Price returned to band (No OFI). RSI {rsi:.2f}"
-                    )
-                else: 
-                     # OFI < 0: Selling pressure still dominant
-                     reasoning = (
-                        f"Mean Reversion Long Rejected: Price returned but Selling Pressure remains (OFI {ofi:.2f})"
-                     )
-                     # Stay Neutral or take very small position? Stay Neutral.
-                     direction = "NEUTRAL"
-
-                take_profit = bb_mid
-                stop_loss = price * 0.98  # 2% stop or use ATR
-
-        # SHORT SIGNAL Logic
-        # 1. Previous Close > Prev Upper Band (Was Overbought)
-        # 2. Current Close < Current Upper Band (Returned to Range)
-        # 3. RSI is high (e.g. > 60)
-        
-        if prev_bb_upper is not None:
-            was_above = prev_kline.close > prev_bb_upper
-            is_below = price < bb_upper
-            
-            # Allow RSI to be slightly lower than strict overbought during the turn
-            rsi_threshold_short = settings.rsi_overbought - 10
-            
-            if was_above and is_below and rsi > rsi_threshold_short:
-                 # Phase 4 Alpha: Check OFI
-                 # We need selling pressure (OFI < 0) to confirm the reversal
-                if ofi is not None and ofi < 0:
-                    direction = "SHORT"
-                    strength = 0.9
-                    confidence = 0.90
-                    reasoning = (
-                        f"Mean Reversion Short (Confirmed): Price returned to band with Selling Pressure "
-                        f"(OFI {ofi:.2f}). RSI {rsi:.2f}"
-                    )
-                elif ofi is None:
-                    direction = "SHORT"
-                    strength = 0.7
-                    confidence = 0.75
-                    reasoning = (
-                        f"Mean Reversion Short (Unconfirmed): Price returned to band (No OFI). RSI {rsi:.2f}"
-                    )
-                else:
-                    # OFI > 0: Buying pressure still dominant
-                    reasoning = (
-                        f"Mean Reversion Short Rejected: Price returned but Buying Pressure remains (OFI {ofi:.2f})"
-                    )
-                    direction = "NEUTRAL"
-
-                take_profit = bb_mid
-                stop_loss = price * 1.02 # 2% stop
+        # LONG: previous close below its lower band, current price back above the
+        # lower band, RSI still low (oversold + 10 allows for recovery during the turn).
+        # SHORT mirrors it against the upper band. The two cannot both fire.
+        long_fire = (
+            prev_bb_lower is not None
+            and prev_kline.close < prev_bb_lower
+            and price > bb_lower
+            and rsi < settings.rsi_oversold + 10
+        )
+        short_fire = (
+            prev_bb_upper is not None
+            and prev_kline.close > prev_bb_upper
+            and price < bb_upper
+            and rsi > settings.rsi_overbought - 10
+        )
+        sig = int(long_fire) - int(short_fire)  # +1 long, -1 short, 0 none
+
+        if sig:
+            side = _SIDES[sig]
+            # Phase 4 Alpha: OFI must point the same way as the reversal to confirm it
+            if ofi is None:
+                direction, strength, confidence = side, 0.7, 0.75
+                reasoning = (
+                    f"Mean Reversion {side.title()} (Unconfirmed): Price returned to band (No OFI). RSI {rsi:.2f}"
+                )
+            elif ofi * sig > 0:
+                direction, strength, confidence = side, 0.9, 0.90
+                reasoning = (
+                    f"Mean Reversion {side.title()} (Confirmed): Price returned to band with "
+                    f"{_PRESSURE[sig]} Pressure (OFI {ofi:.2f}). RSI {rsi:.2f}"
+                )
+            else:
+                # Opposing pressure still dominant: stay Neutral
+                reasoning = (
+                    f"Mean Reversion {side.title()} Rejected: Price returned but "
+                    f"{_PRESSURE[-sig]} Pressure remains (OFI {ofi:.2f})"
+                )
+
+            take_profit = bb_mid
+            stop_loss = price * (0.98 if sig > 0 else 1.02)  # 2% stop or use ATR
 
     # If still Neutral, provide reasoning if near bands
     if direction == "NEUTRAL":
@@ -181,7 +147,7 @@ async def mean_reversion_strategy_node(state: MeanReversionState) -> MeanReversi
             confidence = 0.5
 
     signal = Signal(
-        timestamp=datetime.now(),
+        timestamp=now(),
         symbol=symbol,
         strategy="mean_reversion",
         direction=direction,  # type: ignore
@@ -1,9 +1,25 @@
 """Momentum trading strategy implementation."""
-from typing import TypedDict
+from typing import Final, NamedTuple, TypedDict
 from datetime import datetime
 
+import numpy as np
+
 from app.schemas.models import MarketFeatures, Signal
 from app.config import settings
+from app.utils.clock import now
+from app.utils.jit import NUMBA_AVAILABLE, njit, prange
+
+# Entry thresholds (strict), shared by the node and the batch kernel
+ENTRY_ADX_THRESHOLD: Final[float] = 25.0
+ENTRY_RSI_LONG_MIN: Final[float] = 50.0
+ENTRY_RSI_LONG_MAX: Final[float] = 70.0
+ENTRY_RSI_SHORT_MIN: Final[float] = 30.0
+ENTRY_RSI_SHORT_MAX: Final[float] = 50.0
+OFI_CONFIRM_THRESHOLD: Final[float] = 5.0
+TRAILING_ATR_MULTIPLE: Final[float] = 3.0
+
+# Below this many symbols the thread fan-out of the parallel kernel costs more than it saves
+PARALLEL_MIN_SYMBOLS: Final[int] = 8
 
 
 class MomentumState(TypedDict):
@@ -14,7 +30,7 @@ class MomentumState(TypedDict):
     timestamp: datetime
 
 
-async def momentum_strategy_node(state: MomentumState) -> MomentumState:
+def momentum_strategy_node(state: MomentumState) -> MomentumState:
     """
     Generate momentum-based trading signals.
 
@@ -31,7 +47,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
         return {
             **state,
             "signals": [Signal(
-                timestamp=datetime.now(),
+                timestamp=now(),
                 symbol=symbol,
                 strategy="momentum",
                 direction="NEUTRAL",
@@ -69,14 +85,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
     previous_signal = state.get("signal")
     current_direction = previous_signal.direction if previous_signal else "NEUTRAL"
 
-    # Define Thresholds
-    # Entry (Strict)
-    ENTRY_ADX_THRESHOLD = 25.0
-    ENTRY_RSI_LONG_MIN = 50.0
-    ENTRY_RSI_LONG_MAX = 70.0
-    ENTRY_RSI_SHORT_MIN = 30.0
-    ENTRY_RSI_SHORT_MAX = 50.0
-    
+    # Define Thresholds (entry thresholds are module constants)
     # Maintain (Relaxed - Hysteresis)
     MAINTAIN_ADX_THRESHOLD = 20.0
     MAINTAIN_RSI_LONG_MIN = 45.0
@@ -92,7 +101,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
         return {
             **state,
             "signals": [Signal(
-                timestamp=datetime.now(),
+                timestamp=now(),
                 symbol=symbol,
                 strategy="momentum",
                 direction="NEUTRAL",
@@ -167,7 +176,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
                 confidence = 0.8
                 reasoning = "ENTRY LONG: EMA Cross + Trend + RSI"
                 
-                if ofi_sma and ofi_sma > 5.0:
+                if ofi_sma and ofi_sma > OFI_CONFIRM_THRESHOLD:
                     confidence += 0.1
                     reasoning += f" + OFI ({ofi_sma:.2f})"
         
@@ -179,7 +188,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
                 confidence = 0.8
                 reasoning = "ENTRY SHORT: EMA Cross + Trend + RSI"
                 
-                if ofi_sma and ofi_sma < -5.0:
+                if ofi_sma and ofi_sma < -OFI_CONFIRM_THRESHOLD:
                     confidence += 0.1
                     reasoning += f" + OFI ({ofi_sma:.2f})"
 
@@ -193,7 +202,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
         # Fallback if ATR is missing
         atr_val = atr if atr else price * 0.01 
         
-        trailing_stop_distance = atr_val * 3.0
+        trailing_stop_distance = atr_val * TRAILING_ATR_MULTIPLE
         
         if direction == "LONG":
             # If we are maintaining, we might want to keep the old SL logic handled by the engine
@@ -231,7 +240,7 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
     return {
         **state,
         "signals": [Signal(
-            timestamp=datetime.now(),
+            timestamp=now(),
             symbol=symbol,
             strategy="momentum",
             direction=direction,  # type: ignore
@@ -245,3 +254,123 @@ async def momentum_strategy_node(state: MomentumState) -> MomentumState:
         )]
     }
 
+
+
+class MomentumEntries(NamedTuple):
+    """Per-symbol entry decisions from `momentum_entry_batch` (NaN where flat)."""
+    direction: np.ndarray  # int8: +1 LONG, -1 SHORT, 0 NEUTRAL
+    strength: np.ndarray
+    confidence: np.ndarray
+    stop_loss: np.ndarray
+    trailing_stop_distance: np.ndarray
+
+
+def momentum_entry_batch(
+    price: np.ndarray,
+    ema_9: np.ndarray,
+    ema_50: np.ndarray,
+    ema_200: np.ndarray,
+    adx: np.ndarray,
+    rsi: np.ndarray,
+    atr: np.ndarray,
+    ofi_sma: np.ndarray
+) -> MomentumEntries:
+    """
+    Entry decisions for many flat symbols at once.
+
+    Takes one array per feature (NaN for a missing value) and applies the
+    node's strict entry rules -- ADX regime, EMA 200 trend, EMA cross, RSI
+    band and OFI confirmation -- without a Python branch per symbol.
+    Equivalent to `momentum_strategy_node` with no previous signal. Large
+    universes are split across cores when numba is installed.
+    """
+    if NUMBA_AVAILABLE and price.size > PARALLEL_MIN_SYMBOLS:
+        return MomentumEntries(*_momentum_entry_nb(price, ema_9, ema_50, ema_200, adx, rsi, atr, ofi_sma))
+    return _momentum_entry_np(price, ema_9, ema_50, ema_200, adx, rsi, atr, ofi_sma)
+
+
+def _momentum_entry_np(
+    price: np.ndarray,
+    ema_9: np.ndarray,
+    ema_50: np.ndarray,
+    ema_200: np.ndarray,
+    adx: np.ndarray,
+    rsi: np.ndarray,
+    atr: np.ndarray,
+    ofi_sma: np.ndarray
+) -> MomentumEntries:
+    """Array-mask entry rules (serial path and no-numba fallback)."""
+    def present(x: np.ndarray) -> np.ndarray:
+        # Mirrors the node's truthiness checks: None (NaN here) and 0.0 count as missing
+        return ~np.isnan(x) & (x != 0)
+
+    has_emas = present(ema_9) & present(ema_50)
+    chop = present(adx) & (adx < ENTRY_ADX_THRESHOLD)
+    has_ema_200 = present(ema_200)
+    bull_trend = ~has_ema_200 | (price > ema_200)
+    bear_trend = ~has_ema_200 | (price < ema_200)
+    has_rsi = present(rsi)
+    rsi_long = ~has_rsi | ((ENTRY_RSI_LONG_MIN < rsi) & (rsi < ENTRY_RSI_LONG_MAX))
+    rsi_short = ~has_rsi | ((ENTRY_RSI_SHORT_MIN < rsi) & (rsi < ENTRY_RSI_SHORT_MAX))
+
+    active = has_emas & ~chop
+    long_mask = active & (ema_9 > ema_50) & (price > ema_9) & bull_trend & rsi_long
+    short_mask = active & (ema_9 < ema_50) & (price < ema_9) & bear_trend & rsi_short
+    entered = long_mask | short_mask
+    side = long_mask.astype(np.int8) - short_mask.astype(np.int8)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ema_diff_pct = (ema_9 - ema_50) / ema_50 * 100
+    strength = np.where(entered, np.minimum(np.abs(ema_diff_pct) / 2.0, 1.0), 0.0)
+    ofi_confirmed = (long_mask & (ofi_sma > OFI_CONFIRM_THRESHOLD)) | \
+        (short_mask & (ofi_sma < -OFI_CONFIRM_THRESHOLD))
+    confidence = np.where(entered, 0.8 + 0.1 * ofi_confirmed, 0.0)
+
+    atr_val = np.where(present(atr), atr, price * 0.01)
+    trailing = np.where(entered, atr_val * TRAILING_ATR_MULTIPLE, np.nan)
+    stop_loss = price - side * trailing
+
+    return MomentumEntries(side, strength, confidence, stop_loss, trailing)
+
+
+@njit(cache=True)
+def _present(x: float) -> bool:
+    return not np.isnan(x) and x != 0.0
+
+
+@njit(parallel=True, cache=True)
+def _momentum_entry_nb(price, ema_9, ema_50, ema_200, adx, rsi, atr, ofi_sma):
+    """Per-symbol entry rules, one symbol per `prange` iteration."""
+    n = price.shape[0]
+    side = np.zeros(n, dtype=np.int8)
+    strength = np.zeros(n)
+    confidence = np.zeros(n)
+    stop_loss = np.full(n, np.nan)
+    trailing = np.full(n, np.nan)
+
+    for i in prange(n):
+        p, e9, e50, e200, r = price[i], ema_9[i], ema_50[i], ema_200[i], rsi[i]
+        if not (_present(e9) and _present(e50)):
+            continue
+        if _present(adx[i]) and adx[i] < ENTRY_ADX_THRESHOLD:
+            continue
+
+        if e9 > e50 and p > e9 and (not _present(e200) or p > e200) and \
+                (not _present(r) or ENTRY_RSI_LONG_MIN < r < ENTRY_RSI_LONG_MAX):
+            direction = 1
+            confirmed = ofi_sma[i] > OFI_CONFIRM_THRESHOLD
+        elif e9 < e50 and p < e9 and (not _present(e200) or p < e200) and \
+                (not _present(r) or ENTRY_RSI_SHORT_MIN < r < ENTRY_RSI_SHORT_MAX):
+            direction = -1
+            confirmed = ofi_sma[i] < -OFI_CONFIRM_THRESHOLD
+        else:
+            continue
+
+        side[i] = direction
+        strength[i] = min(abs((e9 - e50) / e50 * 100) / 2.0, 1.0)
+        confidence[i] = 0.8 + 0.1 if confirmed else 0.8
+        atr_val = atr[i] if _present(atr[i]) else p * 0.01
+        trailing[i] = atr_val * TRAILING_ATR_MULTIPLE
+        stop_loss[i] = p - direction * trailing[i]
+
+    return side, strength, confidence, stop_loss, trailing
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from app.schemas.models import MarketFeatures, MarketRegime
 from app.tools.llm_tool import llm_tool
+from app.utils.clock import now
 
 
 class RegimeState(TypedDict):
@@ -31,7 +32,7 @@ async def classify_regime_node(state: RegimeState) -> RegimeState:
             "regime": MarketRegime(
                 regime="UNKNOWN",
                 confidence=0.0,
-                timestamp=datetime.now()
+                timestamp=now()
             )
         }
 
@@ -107,7 +108,7 @@ async def classify_regime_node(state: RegimeState) -> RegimeState:
         confidence=confidence,
         volatility_percentile=volatility_percentile,
         trend_strength=trend_strength,
-        timestamp=datetime.now()
+        timestamp=now()
     )
 
     return {
@@ -2,16 +2,31 @@
 from typing import TypedDict, Literal
 from datetime import datetime
 
-from app.schemas.models import MarketRegime
+from app.schemas.models import MarketRegime, RegimeType
+
+
+StrategyName = Literal["momentum", "mean_reversion", "neutral"]
 
 
 class RouterState(TypedDict):
     """State for strategy routing."""
     regime: MarketRegime | None
-    selected_strategy: Literal["momentum", "mean_reversion", "neutral"] | None
+    selected_strategy: StrategyName | None
     timestamp: datetime
 
 
+_REGIME_TO_STRATEGY: dict[RegimeType, StrategyName] = {
+    RegimeType.TRENDING: "momentum",
+    RegimeType.RANGING: "mean_reversion",
+    RegimeType.HIGH_VOLATILITY: "neutral",  # Avoid trading in high vol
+    RegimeType.LOW_VOLATILITY: "momentum",
+    RegimeType.UNKNOWN: "neutral",
+}
+
+# Below this regime confidence we stay neutral regardless of regime
+_CONF_THRESHOLD = 0.4
+
+
 async def route_strategy_node(state: RouterState) -> RouterState:
     """
     Route to appropriate strategy based on market regime.
@@ -22,37 +37,15 @@ async def route_strategy_node(state: RouterState) -> RouterState:
     - HIGH_VOLATILITY -> neutral (reduce exposure)
     - LOW_VOLATILITY -> momentum strategy
     - UNKNOWN -> neutral
+
+    Returns only the keys it sets; the graph merges them into the state.
     """
     regime = state.get("regime")
 
-    if not regime:
-        return {
-            **state,
-            "selected_strategy": "neutral"
-        }
-
-    selected_strategy: Literal["momentum", "mean_reversion", "neutral"]
-
-    if regime.regime == "TRENDING":
-        selected_strategy = "momentum"
-    elif regime.regime == "RANGING":
-        selected_strategy = "mean_reversion"
-    elif regime.regime == "HIGH_VOLATILITY":
-        selected_strategy = "neutral"  # Avoid trading in high vol
-    elif regime.regime == "LOW_VOLATILITY":
-        selected_strategy = "momentum"
-    else:  # UNKNOWN
-        selected_strategy = "neutral"
-
-    # Override if confidence is too low
-    if regime.confidence < 0.4:
-        selected_strategy = "neutral"
-
-    return {
-        **state,
-        "selected_strategy": selected_strategy,
-        "timestamp": datetime.now()
-    }
+    if not regime or regime.confidence < _CONF_THRESHOLD:
+        return {"selected_strategy": "neutral"}
+
+    return {"selected_strategy": _REGIME_TO_STRATEGY.get(regime.regime, "neutral")}
 
 
 def get_strategy_node_name(state: RouterState) -> str:
@@ -1,7 +1,11 @@
 """Event schemas for the trading system."""
 from datetime import datetime
-from typing import Literal, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field, PrivateAttr
+
+from app.utils.clock import to_ns
 
 
 class TradeEvent(BaseModel):
@@ -16,33 +20,84 @@ class TradeEvent(BaseModel):
 
 
 class OrderbookUpdate(BaseModel):
-    """Event representing an orderbook snapshot or update."""
+    """Event representing an orderbook snapshot or update.
+
+    Levels are accepted and serialized as ``[(price, quantity), ...]`` but are
+    also unpacked once into column arrays (``bid_prices``, ``bid_sizes``,
+    ``ask_prices``, ``ask_sizes``) so consumers can read best-of-book scalars
+    and run depth reductions without walking Python tuples.
+    """
 
     timestamp: datetime
     symbol: str
     bids: list[tuple[float, float]]  # [(price, quantity), ...]
     asks: list[tuple[float, float]]
 
+    _bid_prices: np.ndarray = PrivateAttr()
+    _bid_sizes: np.ndarray = PrivateAttr()
+    _ask_prices: np.ndarray = PrivateAttr()
+    _ask_sizes: np.ndarray = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        """Build the SoA views of the book levels."""
+        bids = np.asarray(self.bids, dtype=np.float64).reshape(-1, 2)
+        asks = np.asarray(self.asks, dtype=np.float64).reshape(-1, 2)
+        self._bid_prices = bids[:, 0]
+        self._bid_sizes = bids[:, 1]
+        self._ask_prices = asks[:, 0]
+        self._ask_sizes = asks[:, 1]
+
+    @property
+    def bid_prices(self) -> np.ndarray:
+        """Bid prices, best first."""
+        return self._bid_prices
+
+    @property
+    def bid_sizes(self) -> np.ndarray:
+        """Bid quantities aligned with ``bid_prices``."""
+        return self._bid_sizes
+
+    @property
+    def ask_prices(self) -> np.ndarray:
+        """Ask prices, best first."""
+        return self._ask_prices
+
+    @property
+    def ask_sizes(self) -> np.ndarray:
+        """Ask quantities aligned with ``ask_prices``."""
+        return self._ask_sizes
+
+    def has_both_sides(self) -> bool:
+        """Whether the book has at least one bid and one ask level."""
+        return self._bid_prices.size > 0 and self._ask_prices.size > 0
+
     def get_mid_price(self) -> Optional[float]:
         """Calculate mid price from best bid/ask."""
-        if not self.bids or not self.asks:
+        if not self.has_both_sides():
             return None
-        best_bid = self.bids[0][0]
-        best_ask = self.asks[0][0]
-        return (best_bid + best_ask) / 2.0
+        return float(self._bid_prices[0] + self._ask_prices[0]) / 2.0
 
     def get_spread(self) -> Optional[float]:
         """Calculate bid-ask spread."""
-        if not self.bids or not self.asks:
+        if not self.has_both_sides():
             return None
-        return self.asks[0][0] - self.bids[0][0]
+        return float(self._ask_prices[0] - self._bid_prices[0])
 
     def get_imbalance(self) -> float:
         """Calculate orderbook imbalance at best level."""
-        if not self.bids or not self.asks:
+        if not self.has_both_sides():
             return 0.0
-        bid_qty = self.bids[0][1]
-        ask_qty = self.asks[0][1]
+        bid_qty = float(self._bid_sizes[0])
+        ask_qty = float(self._ask_sizes[0])
+        total = bid_qty + ask_qty
+        if total == 0:
+            return 0.0
+        return (bid_qty - ask_qty) / total
+
+    def get_depth_imbalance(self, depth: int = 5) -> float:
+        """Calculate size imbalance summed over the top ``depth`` levels."""
+        bid_qty = float(self._bid_sizes[:depth].sum())
+        ask_qty = float(self._ask_sizes[:depth].sum())
         total = bid_qty + ask_qty
         if total == 0:
             return 0.0
@@ -62,7 +117,32 @@ class KlineEvent(BaseModel):
     volume: float
     num_trades: int = 0
 
+    @property
+    def timestamp_ns(self) -> int:
+        """``timestamp`` as integer nanoseconds since the epoch."""
+        return to_ns(self.timestamp)
+
     def get_typical_price(self) -> float:
         """Calculate typical price (HLC/3)."""
         return (self.high + self.low + self.close) / 3.0
 
+
+# Packed kline record (48 bytes) for batches that skip per-event models,
+# e.g. replays feeding `compute_features_node` directly
+KLINE_DTYPE = np.dtype([
+    ("ts", "i8"),  # nanoseconds since the epoch, see KlineEvent.timestamp_ns
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
+
+def klines_to_array(klines: list[KlineEvent]) -> np.ndarray:
+    """Pack validated KlineEvents into a KLINE_DTYPE array."""
+    return np.array(
+        [(k.timestamp_ns, k.open, k.high, k.low, k.close, k.volume) for k in klines],
+        dtype=KLINE_DTYPE
+    )
+
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal
 
 class GeminiRegimeResponse(BaseModel):
     """Schema for Gemini regime classification response."""
+    model_config = ConfigDict(extra="ignore")
+
     regime: Literal["TRENDING", "RANGING", "HIGH_VOLATILITY", "LOW_VOLATILITY", "UNKNOWN"]
     confidence: float = Field(..., ge=0.0, le=1.0)
     reasoning: str
@@ -1,7 +1,30 @@
 """Data models for the trading system."""
 from datetime import datetime
+from enum import StrEnum
 from typing import Literal, Optional
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class RegimeType(StrEnum):
+    """Market regime labels.
+
+    Members are ``str`` subclasses, so they still compare equal to (and hash
+    like) the plain labels, while hot paths can compare by identity.
+    """
+
+    TRENDING = "TRENDING"
+    RANGING = "RANGING"
+    HIGH_VOLATILITY = "HIGH_VOLATILITY"
+    LOW_VOLATILITY = "LOW_VOLATILITY"
+    UNKNOWN = "UNKNOWN"
+
+
+class SignalDirection(StrEnum):
+    """Trading signal directions (string-compatible, see ``RegimeType``)."""
+
+    LONG = "LONG"
+    SHORT = "SHORT"
+    NEUTRAL = "NEUTRAL"
 
 
 class MarketFeatures(BaseModel):
@@ -47,7 +70,7 @@ class MarketFeatures(BaseModel):
 class MarketRegime(BaseModel):
     """Market regime classification."""
 
-    regime: Literal["TRENDING", "RANGING", "HIGH_VOLATILITY", "LOW_VOLATILITY", "UNKNOWN"]
+    regime: RegimeType
     confidence: float = Field(ge=0.0, le=1.0)
     volatility_percentile: Optional[float] = None
     trend_strength: Optional[float] = None
@@ -61,7 +84,7 @@ class Signal(BaseModel):
     symbol: str
     instrument_type: Literal["SPOT", "FUTURE"] = "SPOT"
     strategy: str  # "momentum", "mean_reversion", "neutral", "hedge"
-    direction: Literal["LONG", "SHORT", "NEUTRAL"]
+    direction: SignalDirection
     strength: float = Field(ge=0.0, le=1.0)
     confidence: float = Field(ge=0.0, le=1.0)
     entry_price: Optional[float] = None
@@ -124,7 +147,12 @@ class Order(BaseModel):
 
 
 class ExecutionResult(BaseModel):
-    """Result of an order execution."""
+    """Result of an order execution.
+
+    Immutable: results are produced once by a provider and only read afterwards.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     success: bool
     order_id: Optional[str] = None
@@ -0,0 +1,44 @@
+"""Shared HTTP connection-pool settings for exchange clients.
+
+Both SDKs already keep one session per client, but their default pools are
+small (``requests`` keeps 10 connections per host, aiohttp's connector drops
+idle sockets after 15s). Now that several calls can be in flight at once,
+these helpers size the pools so concurrent requests reuse warm TLS
+connections instead of opening new ones.
+"""
+import ssl
+
+import aiohttp
+import certifi
+
+try:
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_TIMEOUT = 75
+
+
+def create_connector() -> aiohttp.TCPConnector:
+    """Create a pooled aiohttp connector verified against certifi's CA bundle."""
+    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    return aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=MAX_CONNECTIONS,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+
+
+def mount_pooled_adapter(session: "Session") -> None:
+    """Widen a ``requests`` session's keep-alive pool for concurrent use."""
+    if not REQUESTS_AVAILABLE:
+        return
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=MAX_KEEPALIVE_CONNECTIONS,
+    )
+    session.mount("https://", adapter)
@@ -1,6 +1,13 @@
 """Alpaca exchange integration tool for paper trading."""
+import asyncio
+import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Optional
+
+import numpy as np
+from pydantic import TypeAdapter
 
 try:
     from alpaca.trading.client import TradingClient
@@ -19,16 +26,69 @@ except ImportError:
 from app.config import settings
 from app.schemas.events import TradeEvent, OrderbookUpdate, KlineEvent
 from app.schemas.models import Order, ExecutionResult, PortfolioState, Position
-from app.utils.resilience import api_retry_policy
+from app.utils.resilience import api_retry_policy, CircuitBreaker
+from app.utils.cache import ttl_cache
+from app.utils.clock import now
+from app.tools._http import mount_pooled_adapter
+
+logger = logging.getLogger(__name__)
+
+_TRADE_LIST_ADAPTER = TypeAdapter(list[TradeEvent])
+
+
+@lru_cache(maxsize=256)
+def _convert_symbol_cached(symbol: str, is_crypto: bool) -> str:
+    """Convert Binance-style symbol to Alpaca format.
+
+    Examples:
+        BTCUSDT -> BTC/USD
+        BTC/USD -> BTC/USD (already in Alpaca format)
+        AAPL -> AAPL (unchanged for stocks)
+    """
+    # If symbol already has a slash, it's already in Alpaca format
+    if "/" in symbol:
+        return symbol
+
+    if is_crypto:
+        # Convert BTCUSDT to BTC/USD
+        if symbol.endswith("USDT"):
+            base = symbol[:-4]
+            return f"{base}/USD"
+        elif symbol.endswith("USD"):
+            base = symbol[:-3]
+            return f"{base}/USD"
+    return symbol
 
 
 class AlpacaTool:
     """Tool for interacting with Alpaca exchange (paper trading)."""
 
+    # Map interval string to Alpaca TimeFrame (built once at import)
+    if ALPACA_AVAILABLE:
+        _INTERVAL_MAP = {
+            "1m": TimeFrame.Minute,
+            "5m": TimeFrame(5, "Min"),
+            "15m": TimeFrame(15, "Min"),
+            "1h": TimeFrame.Hour,
+            "1d": TimeFrame.Day,
+        }
+    else:
+        _INTERVAL_MAP: dict = {}
+
     def __init__(self) -> None:
         self.trading_client: Optional[TradingClient] = None
         self.data_client: Optional[object] = None
         self.is_crypto = settings.symbol.endswith("USD") or settings.symbol.endswith("USDT")
+        # The configured symbol is by far the most common lookup
+        self._symbol = settings.symbol
+        self._symbol_alpaca = _convert_symbol_cached(settings.symbol, self.is_crypto)
+        # Caps in-flight SDK calls so batched/gathered fetches stay under rate limits
+        self._sem = asyncio.Semaphore(settings.alpaca_max_concurrency)
+        # One breaker per SDK endpoint so a degraded endpoint fails fast
+        # without tripping the healthy ones
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # Trade schema is fixed per asset class, so pick the parser once
+        self._parse_trade = self._parse_crypto_trade if self.is_crypto else self._parse_stock_trade
 
     async def initialize(self) -> None:
         """Initialize the Alpaca clients."""
@@ -54,70 +114,137 @@ class AlpacaTool:
                 secret_key=settings.alpaca_api_secret,
             )
 
+        # Both SDK clients hold a requests.Session; widen their keep-alive pools
+        for client in (self.trading_client, self.data_client):
+            session = getattr(client, "_session", None)
+            if session is not None:
+                mount_pooled_adapter(session)
+
     async def close(self) -> None:
         """Close the client connection."""
         # Alpaca SDK doesn't require explicit cleanup
         pass
 
-    def _convert_symbol(self, symbol: str) -> str:
-        """Convert Binance-style symbol to Alpaca format.
+    async def _run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking SDK call in a worker thread, gated by the concurrency cap.
 
-        Examples:
-            BTCUSDT -> BTC/USD
-            BTC/USD -> BTC/USD (already in Alpaca format)
-            AAPL -> AAPL (unchanged for stocks)
+        Raises CircuitBreakerOpenException without calling the SDK while the
+        endpoint's breaker is open; the retry policy does not retry that.
         """
-        # If symbol already has a slash, it's already in Alpaca format
-        if "/" in symbol:
-            return symbol
+        breaker = self._breakers.get(fn.__name__)
+        if breaker is None:
+            breaker = self._breakers[fn.__name__] = CircuitBreaker(
+                failure_threshold=settings.alpaca_breaker_failures,
+                recovery_timeout=settings.alpaca_breaker_reset_seconds,
+            )
+        breaker.check()
 
-        if self.is_crypto:
-            # Convert BTCUSDT to BTC/USD
-            if symbol.endswith("USDT"):
-                base = symbol[:-4]
-                return f"{base}/USD"
-            elif symbol.endswith("USD"):
-                base = symbol[:-3]
-                return f"{base}/USD"
-        return symbol
+        try:
+            async with self._sem:
+                result = await asyncio.to_thread(fn, *args)
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
 
-    @api_retry_policy()
+    def _convert_symbol(self, symbol: str) -> str:
+        """Convert Binance-style symbol to Alpaca format (memoized)."""
+        if symbol == self._symbol:
+            return self._symbol_alpaca
+        return _convert_symbol_cached(symbol, self.is_crypto)
+
+    @staticmethod
+    def _parse_crypto_trade(trade: Any, symbol: str) -> dict[str, Any]:
+        """Map an Alpaca crypto trade to TradeEvent fields."""
+        return {
+            "timestamp": trade.timestamp,
+            "symbol": symbol,
+            "price": trade.price,
+            "quantity": trade.size,
+            "side": "BUY" if trade.taker_side == "buy" else "SELL",
+            "trade_id": str(trade.id),
+        }
+
+    @staticmethod
+    def _parse_stock_trade(trade: Any, symbol: str) -> dict[str, Any]:
+        """Map an Alpaca stock trade to TradeEvent fields (stocks carry no taker side)."""
+        return {
+            "timestamp": trade.timestamp,
+            "symbol": symbol,
+            "price": trade.price,
+            "quantity": trade.size,
+            "side": "SELL",
+            "trade_id": str(trade.id),
+        }
+
+    @ttl_cache(seconds=1.0)
     async def get_orderbook(self, symbol: str, limit: int = 20) -> OrderbookUpdate:
-        """Fetch current orderbook snapshot.
+        """Fetch current orderbook snapshot."""
+        batch = await self.get_orderbook_batch([symbol], limit=limit)
+        return batch[symbol]
+
+    @api_retry_policy()
+    async def get_orderbook_batch(
+        self,
+        symbols: list[str],
+        limit: int = 20
+    ) -> dict[str, OrderbookUpdate]:
+        """Fetch orderbook snapshots for several symbols.
 
         Strategy:
-        1. Try Real Snapshot (L1 Best Bid/Ask) - Preferred
-        2. Fallback to Synthetic from Bars (Approximation) - If Snapshot fails
+        1. Try Real Snapshots (L1 Best Bid/Ask) for all symbols in one request - Preferred
+        2. Fallback to Synthetic from Bars (Approximation) - For symbols without a quote
+
+        Returns a dict keyed by the symbols as passed in (not the Alpaca form).
         """
-        alpaca_symbol = self._convert_symbol(symbol)
-        
-        # 1. Try Real Snapshot (Best Bid/Ask)
+        alpaca_symbols = {symbol: self._convert_symbol(symbol) for symbol in symbols}
+        books: dict[str, OrderbookUpdate] = {}
+
+        # 1. Try Real Snapshots (Best Bid/Ask)
         try:
             if self.is_crypto:
-                request = CryptoSnapshotRequest(symbol_or_symbols=[alpaca_symbol])
-                snapshot = self.data_client.get_crypto_snapshot(request) # type: ignore
-                data = snapshot[alpaca_symbol]
-                quote = data.latest_quote
+                request = CryptoSnapshotRequest(symbol_or_symbols=list(alpaca_symbols.values()))
+                snapshots = await self._run_blocking(self.data_client.get_crypto_snapshot, request)  # type: ignore
             else:
-                request = StockSnapshotRequest(symbol_or_symbols=[alpaca_symbol])
-                snapshot = self.data_client.get_stock_snapshot(request) # type: ignore
-                data = snapshot[alpaca_symbol]
-                quote = data.latest_quote
-
-            if quote and quote.bid_price and quote.ask_price:
-                 return OrderbookUpdate(
-                    timestamp=datetime.now(),
-                    symbol=symbol,
-                    bids=[(float(quote.bid_price), float(quote.bid_size))],
-                    asks=[(float(quote.ask_price), float(quote.ask_size))]
-                 )
-            # If no quote, fall through to synthetic
-            print(f"No quote data for {symbol}, falling back to synthetic...")
-            
+                request = StockSnapshotRequest(symbol_or_symbols=list(alpaca_symbols.values()))
+                snapshots = await self._run_blocking(self.data_client.get_stock_snapshot, request)  # type: ignore
+
+            for symbol, alpaca_symbol in alpaca_symbols.items():
+                data = snapshots.get(alpaca_symbol)
+                quote = data.latest_quote if data else None
+                if quote and quote.bid_price and quote.ask_price:
+                    books[symbol] = OrderbookUpdate(
+                        timestamp=now(),
+                        symbol=symbol,
+                        bids=[(float(quote.bid_price), float(quote.bid_size))],
+                        asks=[(float(quote.ask_price), float(quote.ask_size))]
+                    )
+                else:
+                    # If no quote, fall through to synthetic
+                    logger.debug("No quote data for %s, falling back to synthetic", symbol)
+
         except Exception as e:
-            print(f"Snapshot fetch failed ({e}), falling back to synthetic...")
+            logger.debug("Snapshot fetch failed (%s), falling back to synthetic", e)
+
+        # 2. Synthetic Fallback, fetched concurrently for the symbols still missing
+        missing = [symbol for symbol in symbols if symbol not in books]
+        if missing:
+            synthetic = await asyncio.gather(*(
+                self._get_synthetic_orderbook(symbol, alpaca_symbols[symbol], limit)
+                for symbol in missing
+            ))
+            books.update(zip(missing, synthetic))
+
+        return books
 
-        # 2. Synthetic Fallback (Old Logic)
+    async def _get_synthetic_orderbook(
+        self,
+        symbol: str,
+        alpaca_symbol: str,
+        limit: int
+    ) -> OrderbookUpdate:
+        """Approximate an orderbook from the latest 1m bar's high/low range."""
         try:
             if self.is_crypto:
                 request = CryptoBarsRequest(
@@ -125,30 +252,27 @@ class AlpacaTool:
                     timeframe=TimeFrame.Minute,
                     limit=1
                 )
-                bars = self.data_client.get_crypto_bars(request)  # type: ignore
-                bar_data = bars[alpaca_symbol][0]
-
-                mid_price = (bar_data.high + bar_data.low) / 2
-                spread = (bar_data.high - bar_data.low) / 2
-
+                bars = await self._run_blocking(self.data_client.get_crypto_bars, request)  # type: ignore
             else:
                 request = StockBarsRequest(
                     symbol_or_symbols=[alpaca_symbol],
                     timeframe=TimeFrame.Minute,
                     limit=1
                 )
-                bars = self.data_client.get_stock_bars(request)  # type: ignore
-                bar_data = bars[alpaca_symbol][0]
+                bars = await self._run_blocking(self.data_client.get_stock_bars, request)  # type: ignore
+            bar_data = bars.data[alpaca_symbol][0]
 
-                mid_price = (bar_data.high + bar_data.low) / 2
-                spread = (bar_data.high - bar_data.low) / 2
+            mid_price = (bar_data.high + bar_data.low) / 2
+            spread = (bar_data.high - bar_data.low) / 2
 
-            # Create synthetic bids and asks
-            bids = [(mid_price - spread * (i + 1) / limit, 1.0) for i in range(limit)]
-            asks = [(mid_price + spread * (i + 1) / limit, 1.0) for i in range(limit)]
+            # Create synthetic bids and asks, evenly spaced across the bar's range
+            offsets = spread * (np.arange(1, limit + 1, dtype=np.float64) / limit)
+            sizes = [1.0] * limit
+            bids = list(zip((mid_price - offsets).tolist(), sizes))
+            asks = list(zip((mid_price + offsets).tolist(), sizes))
 
             return OrderbookUpdate(
-                timestamp=datetime.now(),
+                timestamp=now(),
                 symbol=symbol,
                 bids=bids,
                 asks=asks
@@ -156,10 +280,26 @@ class AlpacaTool:
         except Exception as e:
             raise RuntimeError(f"Failed to fetch orderbook (Real & Synthetic both failed): {e}")
 
-    @api_retry_policy()
+    @ttl_cache(seconds=1.0)
     async def get_recent_trades(self, symbol: str, limit: int = 100) -> list[TradeEvent]:
         """Fetch recent trades."""
-        alpaca_symbol = self._convert_symbol(symbol)
+        batch = await self.get_recent_trades_batch([symbol], limit=limit)
+        return batch[symbol]
+
+    @api_retry_policy()
+    async def get_recent_trades_batch(
+        self,
+        symbols: list[str],
+        limit: int = 100
+    ) -> dict[str, list[TradeEvent]]:
+        """Fetch recent trades for several symbols with a single trades request.
+
+        Returns a dict keyed by the symbols as passed in (not the Alpaca form).
+        """
+        alpaca_symbols = {self._convert_symbol(symbol): symbol for symbol in symbols}
+
+        # As with bars, `limit` caps the whole response rather than each symbol.
+        request_limit = limit if len(alpaca_symbols) == 1 else None
 
         try:
             end = datetime.now()
@@ -167,43 +307,35 @@ class AlpacaTool:
 
             if self.is_crypto:
                 request = CryptoTradesRequest(
-                    symbol_or_symbols=[alpaca_symbol],
+                    symbol_or_symbols=list(alpaca_symbols),
                     start=start,
                     end=end,
-                    limit=limit
+                    limit=request_limit
                 )
-                trades_response = self.data_client.get_crypto_trades(request)  # type: ignore
+                trades_response = await self._run_blocking(self.data_client.get_crypto_trades, request)  # type: ignore
             else:
                 request = StockTradesRequest(
-                    symbol_or_symbols=[alpaca_symbol],
+                    symbol_or_symbols=list(alpaca_symbols),
                     start=start,
                     end=end,
-                    limit=limit
+                    limit=request_limit
+                )
+                trades_response = await self._run_blocking(self.data_client.get_stock_trades, request)  # type: ignore
+
+            parse = self._parse_trade
+            result: dict[str, list[TradeEvent]] = {}
+            for alpaca_symbol, symbol in alpaca_symbols.items():
+                # Missing symbols are normal for some symbols/times and map to []
+                raw_trades = trades_response.data.get(alpaca_symbol) or []
+                result[symbol] = _TRADE_LIST_ADAPTER.validate_python(
+                    [parse(trade, symbol) for trade in islice(raw_trades, limit)]
                 )
-                trades_response = self.data_client.get_stock_trades(request)  # type: ignore
-
-            trade_events = []
-
-            # Check if the symbol exists in the response
-            if alpaca_symbol not in trades_response:
-                # Return empty list if no trades found (this is normal for some symbols/times)
-                return []
-
-            for trade in trades_response[alpaca_symbol]:
-                trade_events.append(TradeEvent(
-                    timestamp=trade.timestamp,
-                    symbol=symbol,
-                    price=float(trade.price),
-                    quantity=float(trade.size),
-                    side="BUY" if hasattr(trade, 'taker_side') and trade.taker_side == "buy" else "SELL",
-                    trade_id=str(getattr(trade, 'id', hash(trade)))
-                ))
 
-            return trade_events[:limit]
+            return result
         except Exception as e:
             raise RuntimeError(f"Failed to fetch trades: {e}")
 
-    @api_retry_policy()
+    @ttl_cache(seconds=30.0)
     async def get_klines(
         self,
         symbol: str,
@@ -211,17 +343,27 @@ class AlpacaTool:
         limit: int = 100
     ) -> list[KlineEvent]:
         """Fetch historical klines/candlesticks."""
-        alpaca_symbol = self._convert_symbol(symbol)
+        batch = await self.get_klines_batch([symbol], interval=interval, limit=limit)
+        return batch[symbol]
 
-        # Map interval string to Alpaca TimeFrame
-        interval_map = {
-            "1m": TimeFrame.Minute,
-            "5m": TimeFrame(5, "Min"),
-            "15m": TimeFrame(15, "Min"),
-            "1h": TimeFrame.Hour,
-            "1d": TimeFrame.Day,
-        }
-        timeframe = interval_map.get(interval, TimeFrame.Minute)
+    @api_retry_policy()
+    async def get_klines_batch(
+        self,
+        symbols: list[str],
+        interval: str = "1m",
+        limit: int = 100
+    ) -> dict[str, list[KlineEvent]]:
+        """Fetch klines for several symbols with a single bars request.
+
+        Returns a dict keyed by the symbols as passed in (not the Alpaca form).
+        """
+        alpaca_symbols = {self._convert_symbol(symbol): symbol for symbol in symbols}
+
+        timeframe = self._INTERVAL_MAP.get(interval, TimeFrame.Minute)
+
+        # Alpaca applies `limit` to the whole response, not per symbol, so a
+        # multi-symbol request fetches the full window and is sliced below.
+        request_limit = limit if len(alpaca_symbols) == 1 else None
 
         try:
             end = datetime.now()
@@ -229,41 +371,58 @@ class AlpacaTool:
 
             if self.is_crypto:
                 request = CryptoBarsRequest(
-                    symbol_or_symbols=[alpaca_symbol],
+                    symbol_or_symbols=list(alpaca_symbols),
                     timeframe=timeframe,
                     start=start,
                     end=end,
-                    limit=limit
+                    limit=request_limit
                 )
-                bars = self.data_client.get_crypto_bars(request)  # type: ignore
+                bars = await self._run_blocking(self.data_client.get_crypto_bars, request)  # type: ignore
             else:
                 request = StockBarsRequest(
-                    symbol_or_symbols=[alpaca_symbol],
+                    symbol_or_symbols=list(alpaca_symbols),
                     timeframe=timeframe,
                     start=start,
                     end=end,
-                    limit=limit
+                    limit=request_limit
                 )
-                bars = self.data_client.get_stock_bars(request)  # type: ignore
-
-            klines = []
-            for bar in bars[alpaca_symbol]:
-                klines.append(KlineEvent(
-                    timestamp=bar.timestamp,
-                    symbol=symbol,
-                    interval=interval,
-                    open=float(bar.open),
-                    high=float(bar.high),
-                    low=float(bar.low),
-                    close=float(bar.close),
-                    volume=float(bar.volume),
-                    num_trades=getattr(bar, 'trade_count', 0)
-                ))
-
-            return klines[:limit]
+                bars = await self._run_blocking(self.data_client.get_stock_bars, request)  # type: ignore
+
+            result: dict[str, list[KlineEvent]] = {}
+            for alpaca_symbol, symbol in alpaca_symbols.items():
+                # Stop after `limit` bars rather than building extras to slice off
+                result[symbol] = [
+                    KlineEvent(
+                        timestamp=bar.timestamp,
+                        symbol=symbol,
+                        interval=interval,
+                        open=float(bar.open),
+                        high=float(bar.high),
+                        low=float(bar.low),
+                        close=float(bar.close),
+                        volume=float(bar.volume),
+                        num_trades=int(getattr(bar, 'trade_count', 0) or 0)
+                    )
+                    for bar in islice(bars.data.get(alpaca_symbol, []), limit)
+                ]
+
+            return result
         except Exception as e:
             raise RuntimeError(f"Failed to fetch klines: {e}")
 
+    @staticmethod
+    def _order_result(alpaca_order: Any) -> ExecutionResult:
+        """Build a successful ExecutionResult from an Alpaca order."""
+        filled_avg_price = alpaca_order.filled_avg_price
+        return ExecutionResult(
+            success=True,
+            order_id=str(alpaca_order.id),
+            filled_quantity=float(alpaca_order.filled_qty or 0),
+            filled_price=float(filled_avg_price) if filled_avg_price else None,
+            status=str(alpaca_order.status),
+            timestamp=alpaca_order.updated_at or alpaca_order.submitted_at or now()
+        )
+
     @api_retry_policy()
     async def execute_order(self, order: Order) -> ExecutionResult:
         """Execute an order on Alpaca (paper trading)."""
@@ -315,22 +474,18 @@ class AlpacaTool:
                 raise ValueError(f"Unsupported order type: {order.order_type}")
 
             # Submit order
-            alpaca_order = self.trading_client.submit_order(order_request)
+            alpaca_order = await self._run_blocking(self.trading_client.submit_order, order_request)
 
-            return ExecutionResult(
-                success=True,
-                order_id=str(alpaca_order.id),
-                filled_quantity=float(alpaca_order.filled_qty or 0),
-                filled_price=float(alpaca_order.filled_avg_price) if alpaca_order.filled_avg_price else None,
-                status=str(alpaca_order.status),
-                timestamp=datetime.now()
-            )
+            # Fills and cancels change balances/positions
+            self.get_portfolio_state.cache_clear(self)  # type: ignore
+
+            return self._order_result(alpaca_order)
         except Exception as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     @api_retry_policy()
@@ -340,25 +495,21 @@ class AlpacaTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            self.trading_client.cancel_order_by_id(order_id)
+            await self._run_blocking(self.trading_client.cancel_order_by_id, order_id)
             
             # Fetch updated status
-            alpaca_order = self.trading_client.get_order_by_id(order_id)
+            alpaca_order = await self._run_blocking(self.trading_client.get_order_by_id, order_id)
             
-            return ExecutionResult(
-                success=True,
-                order_id=str(alpaca_order.id),
-                filled_quantity=float(alpaca_order.filled_qty or 0),
-                filled_price=float(alpaca_order.filled_avg_price) if alpaca_order.filled_avg_price else None,
-                status=str(alpaca_order.status),
-                timestamp=datetime.now()
-            )
+            # Fills and cancels change balances/positions
+            self.get_portfolio_state.cache_clear(self)  # type: ignore
+
+            return self._order_result(alpaca_order)
         except Exception as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     @api_retry_policy()
@@ -368,24 +519,18 @@ class AlpacaTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            alpaca_order = self.trading_client.get_order_by_id(order_id)
+            alpaca_order = await self._run_blocking(self.trading_client.get_order_by_id, order_id)
             
-            return ExecutionResult(
-                success=True,
-                order_id=str(alpaca_order.id),
-                filled_quantity=float(alpaca_order.filled_qty or 0),
-                filled_price=float(alpaca_order.filled_avg_price) if alpaca_order.filled_avg_price else None,
-                status=str(alpaca_order.status),
-                timestamp=datetime.now()
-            )
+            return self._order_result(alpaca_order)
         except Exception as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
+    @ttl_cache(seconds=5.0)
     @api_retry_policy()
     async def get_portfolio_state(self) -> PortfolioState:
         """Fetch current portfolio state from Alpaca."""
@@ -393,8 +538,12 @@ class AlpacaTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            account = self.trading_client.get_account()
-            positions = self.trading_client.get_all_positions()
+            # One timestamp for the whole snapshot rather than one per position
+            ts = now()
+            account, positions = await asyncio.gather(
+                self._run_blocking(self.trading_client.get_account),
+                self._run_blocking(self.trading_client.get_all_positions),
+            )
 
             position_list = []
             for pos in positions:
@@ -409,7 +558,7 @@ class AlpacaTool:
                     entry_price=entry_price,
                     current_price=current_price,
                     unrealized_pnl=float(pos.unrealized_pl),
-                    timestamp=datetime.now()
+                    timestamp=ts
                 ))
 
             return PortfolioState(
@@ -418,7 +567,7 @@ class AlpacaTool:
                 positions=position_list,
                 daily_pnl=float(account.equity) - float(account.last_equity),
                 total_pnl=float(account.equity) - float(account.cash),
-                timestamp=datetime.now()
+                timestamp=ts
             )
         except Exception as e:
             raise RuntimeError(f"Failed to fetch portfolio state: {e}")
@@ -1,23 +1,151 @@
 """Binance exchange integration tool."""
+import asyncio
+import logging
+import time
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Optional
+
+import numpy as np
 
 try:
     from binance.async_client import AsyncClient  # type: ignore
-    from binance.exceptions import BinanceAPIException  # type: ignore
+    from binance.streams import BinanceSocketManager  # type: ignore
+    from binance.exceptions import BinanceAPIException, BinanceRequestException  # type: ignore
 except Exception:  # pragma: no cover - test stub path
     AsyncClient = object  # type: ignore
+    BinanceSocketManager = None  # type: ignore
 
     class BinanceAPIException(Exception):  # type: ignore
         """Fallback stub when python-binance is not installed."""
 
-import ssl
-import certifi
-import aiohttp
+    class BinanceRequestException(Exception):  # type: ignore
+        """Fallback stub when python-binance is not installed."""
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from app.config import settings
 from app.schemas.events import TradeEvent, OrderbookUpdate, KlineEvent
 from app.schemas.models import Order, ExecutionResult, PortfolioState, Position
 from app.utils.resilience import api_retry_policy
+from app.utils.cache import ttl_cache
+from app.utils.clock import now
+from app.tools._http import create_connector
+
+logger = logging.getLogger(__name__)
+
+
+class _OrjsonAsyncClient(AsyncClient):  # type: ignore
+    """AsyncClient that decodes successful REST bodies with orjson.
+
+    Klines and trades responses are large arrays of numeric strings; orjson
+    decodes them several times faster than the stdlib ``json`` module that
+    aiohttp uses by default. Error responses keep the SDK's own handling.
+    """
+
+    async def _handle_response(self, response):  # type: ignore
+        if not str(response.status).startswith("2"):
+            return await super()._handle_response(response)
+        body = await response.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException(f"Invalid Response: {body[:200]!r}")
+
+
+class BinanceWSStream:
+    """Keeps the latest depth-20 book and recent trades for one symbol in memory.
+
+    Fed by ``@depth20@100ms`` and ``@trade`` websocket streams so reads are a
+    local lookup instead of a REST round trip. Each stream reconnects on error.
+    """
+
+    STALE_AFTER_SECONDS = 5.0
+
+    def __init__(self, client: AsyncClient, symbol: str, max_trades: int = 1000) -> None:
+        self.symbol = symbol
+        self._bsm = BinanceSocketManager(client)
+        self.trades: deque[TradeEvent] = deque(maxlen=max_trades)
+        # Depth arrives every 100ms but is read about once per tick, so keep
+        # the raw message and only build an OrderbookUpdate when it is read.
+        self._depth_msg: Optional[dict] = None
+        self._book: Optional[OrderbookUpdate] = None
+        self._last_depth = 0.0
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Spawn the background consumers."""
+        self._tasks = [
+            asyncio.create_task(self._consume(
+                lambda: self._bsm.depth_socket(self.symbol, depth=20, interval=100),
+                self._on_depth,
+            )),
+            asyncio.create_task(self._consume(
+                lambda: self._bsm.trade_socket(self.symbol),
+                self._on_trade,
+            )),
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the background consumers."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def orderbook(self) -> Optional[OrderbookUpdate]:
+        """Latest depth snapshot, materialized at most once per depth update."""
+        if self._book is None and self._depth_msg is not None:
+            msg = self._depth_msg
+            self._book = OrderbookUpdate(
+                timestamp=now(),
+                symbol=self.symbol,
+                bids=[(float(price), float(qty)) for price, qty in msg["bids"]],
+                asks=[(float(price), float(qty)) for price, qty in msg["asks"]],
+            )
+        return self._book
+
+    def has_fresh_orderbook(self) -> bool:
+        """Whether a depth update arrived within STALE_AFTER_SECONDS."""
+        return (
+            self._depth_msg is not None
+            and time.monotonic() - self._last_depth < self.STALE_AFTER_SECONDS
+        )
+
+    async def _consume(self, open_socket: Callable[[], Any], handler: Callable[[dict], None]) -> None:
+        while True:
+            try:
+                async with open_socket() as stream:
+                    while True:
+                        msg = await stream.recv()
+                        if msg.get("e") == "error":
+                            raise RuntimeError(msg.get("m"))
+                        handler(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Binance %s stream dropped (%s), reconnecting", self.symbol, e)
+                await asyncio.sleep(1.0)
+
+    def _on_depth(self, msg: dict) -> None:
+        self._depth_msg = msg
+        self._book = None
+        self._last_depth = time.monotonic()
+
+    def _on_trade(self, msg: dict) -> None:
+        self.trades.append(TradeEvent(
+            timestamp=datetime.fromtimestamp(msg["T"] / 1000),
+            symbol=self.symbol,
+            price=float(msg["p"]),
+            quantity=float(msg["q"]),
+            side="BUY" if msg["m"] else "SELL",
+            trade_id=str(msg["t"]),
+        ))
 
 
 class BinanceTool:
@@ -26,38 +154,61 @@ class BinanceTool:
     def __init__(self) -> None:
         self.client: Optional[AsyncClient] = None
         self.testnet = settings.testnet
+        self.stream: Optional[BinanceWSStream] = None
 
     async def initialize(self) -> None:
         """Initialize the Binance client."""
-        # Create an SSL context using certifi's CA bundle
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
+        # Pooled, keep-alive connector verified against certifi's CA bundle
+        connector = create_connector()
         
+        client_cls = _OrjsonAsyncClient if ORJSON_AVAILABLE else AsyncClient
+
         if settings.testnet:
-            self.client = await AsyncClient.create(
+            self.client = await client_cls.create(
                 api_key=settings.binance_api_key,
                 api_secret=settings.binance_api_secret,
                 testnet=True,
                 session_params={"connector": connector}
             )
         else:
-            self.client = await AsyncClient.create(
+            self.client = await client_cls.create(
                 api_key=settings.binance_api_key,
                 api_secret=settings.binance_api_secret,
                 session_params={"connector": connector}
             )
 
+        if settings.binance_websockets and BinanceSocketManager is not None:
+            self.stream = BinanceWSStream(self.client, settings.symbol)
+            self.stream.start()
+
     async def close(self) -> None:
         """Close the client connection."""
+        if self.stream:
+            await self.stream.stop()
+            self.stream = None
         if self.client:
             await self.client.close_connection()
 
+    @ttl_cache(seconds=1.0)
     @api_retry_policy()
     async def get_orderbook(self, symbol: str, limit: int = 20) -> OrderbookUpdate:
         """Fetch current orderbook snapshot."""
         if not self.client:
             raise RuntimeError("Client not initialized")
 
+        # Serve from the websocket book when it covers the request
+        stream = self.stream
+        if stream and stream.symbol == symbol and limit <= 20 and stream.has_fresh_orderbook():
+            book = stream.orderbook
+            if limit == 20:
+                return book
+            return OrderbookUpdate(
+                timestamp=book.timestamp,
+                symbol=symbol,
+                bids=book.bids[:limit],
+                asks=book.asks[:limit],
+            )
+
         try:
             data = await self.client.get_order_book(symbol=symbol, limit=limit)
 
@@ -65,7 +216,7 @@ class BinanceTool:
             asks = [(float(price), float(qty)) for price, qty in data['asks']]
 
             return OrderbookUpdate(
-                timestamp=datetime.now(),
+                timestamp=now(),
                 symbol=symbol,
                 bids=bids,
                 asks=asks
@@ -73,12 +224,18 @@ class BinanceTool:
         except BinanceAPIException as e:
             raise RuntimeError(f"Failed to fetch orderbook: {e}")
 
+    @ttl_cache(seconds=1.0)
     @api_retry_policy()
     async def get_recent_trades(self, symbol: str, limit: int = 100) -> list[TradeEvent]:
         """Fetch recent trades."""
         if not self.client:
             raise RuntimeError("Client not initialized")
 
+        # Serve from the websocket buffer once it holds enough trades
+        stream = self.stream
+        if stream and stream.symbol == symbol and len(stream.trades) >= limit:
+            return list(stream.trades)[-limit:]
+
         try:
             trades = await self.client.get_recent_trades(symbol=symbol, limit=limit)
 
@@ -96,6 +253,7 @@ class BinanceTool:
         except BinanceAPIException as e:
             raise RuntimeError(f"Failed to fetch trades: {e}")
 
+    @ttl_cache(seconds=30.0)
     @api_retry_policy()
     async def get_klines(
         self,
@@ -122,24 +280,38 @@ class BinanceTool:
                 kwargs["endTime"] = int(end_time.timestamp() * 1000)
 
             klines = await self.client.get_klines(**kwargs)
+            if not klines:
+                return []
+
+            # Convert whole columns at once instead of float()/int() per cell
+            raw = np.asarray(klines, dtype=object)
+            open_times = raw[:, 0].astype(np.int64).tolist()
+            ohlcv = raw[:, 1:6].astype(np.float64).tolist()
+            num_trades = raw[:, 8].astype(np.int64).tolist()
 
             return [
                 KlineEvent(
-                    timestamp=datetime.fromtimestamp(k[0] / 1000),
+                    timestamp=datetime.fromtimestamp(open_time / 1000),
                     symbol=symbol,
                     interval=interval,
-                    open=float(k[1]),
-                    high=float(k[2]),
-                    low=float(k[3]),
-                    close=float(k[4]),
-                    volume=float(k[5]),
-                    num_trades=int(k[8])
+                    open=o,
+                    high=h,
+                    low=l,
+                    close=c,
+                    volume=v,
+                    num_trades=n
                 )
-                for k in klines
+                for open_time, (o, h, l, c, v), n in zip(open_times, ohlcv, num_trades)
             ]
         except BinanceAPIException as e:
             raise RuntimeError(f"Failed to fetch klines: {e}")
 
+    @staticmethod
+    def _filled_price(result: dict) -> Optional[float]:
+        """Order price from a Binance order response, None when unset ("0.00000000")."""
+        price = float(result.get('price') or 0)
+        return price if price > 0 else None
+
     @api_retry_policy()
     async def execute_order(self, order: Order) -> ExecutionResult:
         """Execute an order on the exchange."""
@@ -166,13 +338,16 @@ class BinanceTool:
             else:
                 raise ValueError(f"Unsupported order type: {order.order_type}")
 
+            # Fills and cancels change balances/positions
+            self.get_portfolio_state.cache_clear(self)  # type: ignore
+
             return ExecutionResult(
                 success=True,
                 order_id=str(result['orderId']),
                 filled_quantity=float(result.get('executedQty', 0)),
-                filled_price=float(result.get('price', 0)) if result.get('price') else None,
+                filled_price=self._filled_price(result),
                 status=result['status'],
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
         except BinanceAPIException as e:
@@ -180,7 +355,7 @@ class BinanceTool:
                 success=False,
                 status="FAILED",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     @api_retry_policy()
@@ -195,20 +370,23 @@ class BinanceTool:
                 orderId=order_id
             )
             
+            # Fills and cancels change balances/positions
+            self.get_portfolio_state.cache_clear(self)  # type: ignore
+
             return ExecutionResult(
                 success=True,
                 order_id=str(result['orderId']),
                 filled_quantity=float(result.get('executedQty', 0)),
-                filled_price=float(result.get('price', 0)) if float(result.get('price', 0)) > 0 else None,
+                filled_price=self._filled_price(result),
                 status=result['status'],
-                timestamp=datetime.now()
+                timestamp=now()
             )
         except BinanceAPIException as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     @api_retry_policy()
@@ -227,16 +405,16 @@ class BinanceTool:
                 success=True,
                 order_id=str(result['orderId']),
                 filled_quantity=float(result.get('executedQty', 0)),
-                filled_price=float(result.get('price', 0)) if float(result.get('price', 0)) > 0 else None,
+                filled_price=self._filled_price(result),
                 status=result['status'],
-                timestamp=datetime.now()
+                timestamp=now()
             )
         except BinanceAPIException as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     @api_retry_policy()
@@ -254,6 +432,7 @@ class BinanceTool:
         except BinanceAPIException as e:
             raise RuntimeError(f"Failed to fetch balance: {e}")
 
+    @ttl_cache(seconds=5.0)
     @api_retry_policy()
     async def get_portfolio_state(self, symbol: str) -> PortfolioState:
         """Get current portfolio state."""
@@ -261,34 +440,36 @@ class BinanceTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            account = await self.client.get_account()
-            balance = 0.0
+            # One timestamp for the whole snapshot rather than one per position
+            ts = now()
+            # The ticker is only needed when a position is held, but fetching it
+            # alongside the account costs one RTT instead of two in that case.
+            account, ticker = await asyncio.gather(
+                self.client.get_account(),
+                self.client.get_symbol_ticker(symbol=symbol),
+            )
+            balances_by_asset = {bal['asset']: bal for bal in account['balances']}
             positions: list[Position] = []
 
             # Get USDT balance
-            for bal in account['balances']:
-                if bal['asset'] == 'USDT':
-                    balance = float(bal['free']) + float(bal['locked'])
+            usdt = balances_by_asset.get('USDT')
+            balance = float(usdt['free']) + float(usdt['locked']) if usdt else 0.0
 
             # Get current position (simplified for spot trading)
-            base_asset = symbol.replace('USDT', '')
-            for bal in account['balances']:
-                if bal['asset'] == base_asset:
-                    qty = float(bal['free']) + float(bal['locked'])
-                    if qty > 0:
-                        # Get current price
-                        ticker = await self.client.get_symbol_ticker(symbol=symbol)
-                        current_price = float(ticker['price'])
-
-                        positions.append(Position(
-                            symbol=symbol,
-                            side="LONG",
-                            quantity=qty,
-                            entry_price=current_price,  # Simplified
-                            current_price=current_price,
-                            unrealized_pnl=0.0,  # Would need to track entries
-                            timestamp=datetime.now()
-                        ))
+            base = balances_by_asset.get(symbol.replace('USDT', ''))
+            qty = float(base['free']) + float(base['locked']) if base else 0.0
+            if qty > 0:
+                current_price = float(ticker['price'])
+
+                positions.append(Position(
+                    symbol=symbol,
+                    side="LONG",
+                    quantity=qty,
+                    entry_price=current_price,  # Simplified
+                    current_price=current_price,
+                    unrealized_pnl=0.0,  # Would need to track entries
+                    timestamp=ts
+                ))
 
             equity = balance + sum(p.quantity * p.current_price for p in positions)
 
@@ -296,7 +477,7 @@ class BinanceTool:
                 balance=balance,
                 equity=equity,
                 positions=positions,
-                timestamp=datetime.now()
+                timestamp=ts
             )
 
         except BinanceAPIException as e:
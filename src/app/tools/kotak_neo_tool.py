@@ -1,28 +1,70 @@
 """Kotak Neo exchange integration tool."""
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
+from itertools import count
 import asyncio
+import csv
+import importlib.util
+import io
 import json
+import logging
 
-try:
-    import neo_api_client
-    from neo_api_client import NeoAPI
-    KOTAK_AVAILABLE = True
-except ImportError:
-    KOTAK_AVAILABLE = False
-    NeoAPI = object  # type: ignore
+import aiohttp
+
+# neo_api_client (requests + websocket-client) is only imported by initialize(),
+# so importing this module stays cheap; probe for it without loading it.
+KOTAK_AVAILABLE = importlib.util.find_spec("neo_api_client") is not None
+NeoAPI: Any = None
 
 from app.config import settings
 from app.schemas.events import TradeEvent, OrderbookUpdate, KlineEvent
 from app.schemas.models import Order, ExecutionResult, PortfolioState, Position
+from app.tools._http import create_connector
+from app.utils.clock import now
+
+logger = logging.getLogger(__name__)
+
+# Depth-feed keys for the 5 best levels: bid/ask price and bid/ask quantity
+_BID_PRICE_KEYS = ("bp", "bp1", "bp2", "bp3", "bp4")
+_ASK_PRICE_KEYS = ("sp", "sp1", "sp2", "sp3", "sp4")
+_BID_QTY_KEYS = ("bq", "bq1", "bq2", "bq3", "bq4")
+_ASK_QTY_KEYS = ("bs", "bs1", "bs2", "bs3", "bs4")
+
+# Scrip master is republished daily; reload it once per day
+SCRIP_MASTER_REFRESH_SECONDS = 24 * 60 * 60
+
+
+@lru_cache(maxsize=4096)
+def _split_symbol(symbol: str) -> tuple[str, str]:
+    """Split "EXCHANGE|SYMBOL" into (segment, trading symbol); no pipe means NSE_CM."""
+    segment, sep, trading_symbol = symbol.partition("|")
+    if not sep:
+        return "nse_cm", symbol
+    return segment, trading_symbol
 
 
 class KotakNeoTool:
     """Tool for interacting with Kotak Neo exchange."""
 
+    # Max order placements in flight at once in execute_orders_batch
+    MAX_BATCH_SIZE = 15
+
     def __init__(self) -> None:
-        self.client: Optional[NeoAPI] = None
+        self.client: Optional[Any] = None
         self.is_initialized = False
+        # neo_api_client is synchronous; its calls run here, off the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Latest book / recent trades per symbol, written by the websocket feed
+        self._ob_cache: dict[str, OrderbookUpdate] = {}
+        self._trades: dict[str, deque[TradeEvent]] = {}
+        self._token_to_symbol: dict[str, str] = {}
+        self._last_trade: dict[str, tuple[Any, float]] = {}
+        self._trade_seq = count(1)
+        # "EXCHANGE|SYMBOL" -> instrument token, loaded from the scrip master
+        self._symbol_to_token: dict[str, str] = {}
+        self._scrip_refresh_task: Optional[asyncio.Task] = None
 
     async def initialize(self) -> None:
         """Initialize the Kotak Neo client."""
@@ -32,6 +74,12 @@ class KotakNeoTool:
         if not settings.kotak_consumer_key:
             raise ValueError("KOTAK_CONSUMER_KEY not set in configuration")
 
+        global NeoAPI
+        if NeoAPI is None:
+            from neo_api_client import NeoAPI
+
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="kotak")
+
         # Initialize client
         self.client = NeoAPI(
             consumer_key=settings.kotak_consumer_key,
@@ -48,7 +96,8 @@ class KotakNeoTool:
             # If we have an access token, we might skip login, but the SDK usually requires login
             # We'll attempt the login flow described in docs
             if settings.kotak_mobile_number and settings.kotak_password:
-                self.client.login(
+                await self._run_blocking(
+                    self.client.login,
                     mobilenumber=settings.kotak_mobile_number,
                     password=settings.kotak_password
                 )
@@ -62,73 +111,219 @@ class KotakNeoTool:
                 # self.client.session_2fa(OTP) # This would require an OTP generator
                 pass
                 
+            # Market data arrives through the SDK's websocket callbacks
+            self.client.on_message = self._on_feed_message
+            self.client.on_error = lambda error: logger.warning("Kotak Neo feed error: %s", error)
+
             self.is_initialized = True
             
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Kotak Neo client: {e}")
 
+        # Resolve instrument tokens once up front rather than per quote
+        segment = self._get_exchange_segment(settings.symbol)
+        try:
+            if await self.load_scrip_master(segment):
+                self._scrip_refresh_task = asyncio.create_task(self._refresh_scrip_master(segment))
+                token = self._token(settings.symbol)
+                if token is not None:
+                    await self.subscribe_market_data({settings.symbol: token})
+        except Exception as e:
+            logger.warning("Kotak Neo scrip master unavailable, market data feed not subscribed: %s", e)
+
+    async def load_scrip_master(self, exchange_segment: str = "nse_cm") -> bool:
+        """Download and index the scrip master for one exchange segment.
+
+        Returns False if the SDK did not return a file to download.
+        """
+        if not self.client:
+            raise RuntimeError("Client not initialized")
+
+        result = await self._run_blocking(self.client.scrip_master, exchange_segment=exchange_segment)
+        if isinstance(result, dict):
+            paths = result.get("filesPaths") or []
+            result = next((p for p in paths if exchange_segment.lower() in p.lower()), None)
+        if not isinstance(result, str) or not result.startswith("http"):
+            return False
+
+        async with aiohttp.ClientSession(connector=create_connector()) as session:
+            async with session.get(result) as response:
+                response.raise_for_status()
+                text = await response.text()
+
+        tokens = {}
+        for row in csv.DictReader(io.StringIO(text)):
+            # Header cells carry stray whitespace, e.g. "pSymbol " in some segments
+            row = {k.strip(): v for k, v in row.items() if k}
+            segment, trading_symbol, token = row.get("pExchSeg"), row.get("pTrdSymbol"), row.get("pSymbol")
+            if segment and trading_symbol and token:
+                tokens[f"{segment.strip().upper()}|{trading_symbol.strip()}"] = token.strip()
+
+        self._symbol_to_token.update(tokens)
+        logger.info("Loaded %d Kotak Neo instrument tokens for %s", len(tokens), exchange_segment)
+        return True
+
+    async def _refresh_scrip_master(self, exchange_segment: str) -> None:
+        """Reload the scrip master once a day for newly listed instruments."""
+        while True:
+            await asyncio.sleep(SCRIP_MASTER_REFRESH_SECONDS)
+            try:
+                await self.load_scrip_master(exchange_segment)
+            except Exception as e:
+                logger.warning("Kotak Neo scrip master refresh failed: %s", e)
+
+    def _token(self, symbol: str) -> Optional[str]:
+        """Instrument token for an "EXCHANGE|SYMBOL" symbol, if known."""
+        segment, trading_symbol = _split_symbol(symbol)
+        return self._symbol_to_token.get(f"{segment.upper()}|{trading_symbol}")
+
+    async def subscribe_market_data(self, instrument_tokens: dict[str, str]) -> None:
+        """Subscribe to the depth feed for `{symbol: instrument_token}`.
+
+        Once subscribed, get_orderbook/get_recent_trades for those symbols are
+        served from memory instead of the network.
+        """
+        if not self.client:
+            raise RuntimeError("Client not initialized")
+
+        tokens = []
+        for symbol, token in instrument_tokens.items():
+            self._token_to_symbol[str(token)] = symbol
+            self._trades.setdefault(symbol, deque(maxlen=1000))
+            tokens.append({
+                "instrument_token": str(token),
+                "exchange_segment": self._get_exchange_segment(symbol),
+            })
+
+        await self._run_blocking(
+            self.client.subscribe,
+            instrument_tokens=tokens,
+            isIndex=False,
+            isDepth=True
+        )
+
+    def _on_feed_message(self, message: Any) -> None:
+        """Websocket callback (SDK thread): update the in-memory book and trades."""
+        ticks = message.get("data", []) if isinstance(message, dict) else message
+        for tick in ticks or []:
+            symbol = self._token_to_symbol.get(str(tick.get("tk", "")))
+            if symbol is None:
+                continue
+            try:
+                self._apply_tick(symbol, tick)
+            except (TypeError, ValueError) as e:
+                logger.debug("Skipping malformed Kotak Neo tick for %s: %s", symbol, e)
+
+    def _apply_tick(self, symbol: str, tick: dict) -> None:
+        ts = now()
+
+        if any(key in tick for key in _BID_PRICE_KEYS + _ASK_PRICE_KEYS):
+            previous = self._ob_cache.get(symbol)
+            bids = [
+                (float(tick[p]), float(tick.get(q, 0)))
+                for p, q in zip(_BID_PRICE_KEYS, _BID_QTY_KEYS) if float(tick.get(p, 0)) > 0
+            ]
+            asks = [
+                (float(tick[p]), float(tick.get(q, 0)))
+                for p, q in zip(_ASK_PRICE_KEYS, _ASK_QTY_KEYS) if float(tick.get(p, 0)) > 0
+            ]
+            # Depth ticks can be partial; keep the previous side when one is absent
+            self._ob_cache[symbol] = OrderbookUpdate(
+                timestamp=ts,
+                symbol=symbol,
+                bids=bids or (previous.bids if previous else []),
+                asks=asks or (previous.asks if previous else []),
+            )
+
+        if "ltp" in tick and "ltq" in tick:
+            price = float(tick["ltp"])
+            trade_key = (tick.get("ltt"), float(tick["ltq"]))
+            last = self._last_trade.get(symbol)
+            if last is None or last[0] != trade_key:
+                # Tick rule: an uptick (or unchanged after one) is buyer-initiated
+                side = "BUY" if last is None or price >= last[1] else "SELL"
+                self._trades[symbol].append(TradeEvent(
+                    timestamp=ts,
+                    symbol=symbol,
+                    price=price,
+                    quantity=trade_key[1],
+                    side=side,
+                    trade_id=f"{symbol}-{next(self._trade_seq)}",
+                ))
+                self._last_trade[symbol] = (trade_key, price)
+
     async def close(self) -> None:
         """Close the client connection."""
+        if self._scrip_refresh_task:
+            self._scrip_refresh_task.cancel()
+            self._scrip_refresh_task = None
         if self.client:
             try:
-                self.client.logout()
+                await self._run_blocking(self.client.logout)
             except Exception:
                 pass
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         self.is_initialized = False
 
+    async def _run_blocking(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking SDK call on the tool's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
     def _get_exchange_segment(self, symbol: str) -> str:
         """Determine exchange segment from symbol.
         
         Expected format: "EXCHANGE|SYMBOL" e.g., "NSE_CM|RELIANCE-EQ"
         If no pipe, defaults to NSE_CM.
         """
-        if "|" in symbol:
-            return symbol.split("|")[0]
-        return "nse_cm"
+        return _split_symbol(symbol)[0]
 
     def _get_trading_symbol(self, symbol: str) -> str:
         """Extract trading symbol.
         
         Expected format: "EXCHANGE|SYMBOL" e.g., "NSE_CM|RELIANCE-EQ"
         """
-        if "|" in symbol:
-            return symbol.split("|")[1]
-        return symbol
+        return _split_symbol(symbol)[1]
 
     async def get_orderbook(self, symbol: str, limit: int = 20) -> OrderbookUpdate:
         """Fetch current orderbook snapshot.
         
-        Kotak Neo might not provide a full orderbook via REST API easily.
-        We will use `quote` to get best 5 bids/asks if available, or just LTP.
+        Served from the websocket depth feed (best 5 levels) once the symbol
+        is subscribed via `subscribe_market_data`; empty otherwise.
         """
         if not self.client:
             raise RuntimeError("Client not initialized")
 
-        exchange_segment = self._get_exchange_segment(symbol)
-        trading_symbol = self._get_trading_symbol(symbol)
-        
-        # Need instrument token for quotes. 
-        # This is complex because we need to search scrip master or have a mapping.
-        # For this implementation, we'll assume we can get a quote by symbol if supported,
-        # or we might need to implement a scrip search first.
-        
-        # Simplified: Return a dummy or basic quote for now as full implementation 
-        # requires scrip master management.
-        
-        # TODO: Implement scrip master search to get token
-        
+        book = self._ob_cache.get(symbol)
+        if book is not None:
+            if len(book.bids) <= limit and len(book.asks) <= limit:
+                return book
+            return OrderbookUpdate(
+                timestamp=book.timestamp,
+                symbol=symbol,
+                bids=book.bids[:limit],
+                asks=book.asks[:limit]
+            )
+
         return OrderbookUpdate(
-            timestamp=datetime.now(),
+            timestamp=now(),
             symbol=symbol,
             bids=[],
             asks=[]
         )
 
     async def get_recent_trades(self, symbol: str, limit: int = 100) -> list[TradeEvent]:
-        """Fetch recent trades."""
-        # Kotak Neo API doesn't easily expose public trade history via simple REST call
-        # without subscription.
-        return []
+        """Fetch recent trades.
+
+        Kotak Neo has no public trade-history REST call, so trades come from
+        the websocket feed of subscribed symbols.
+        """
+        trades = self._trades.get(symbol)
+        if not trades:
+            return []
+        return list(trades)[-limit:]
 
     async def get_klines(
         self,
@@ -145,16 +340,36 @@ class KotakNeoTool:
         if not self.client:
             raise RuntimeError("Client not initialized")
 
+        return await self._place_order(order)
+
+    async def execute_orders_batch(self, orders: list[Order]) -> list[ExecutionResult]:
+        """Execute several orders, pipelining the placement calls.
+
+        Kotak Neo has no bulk order endpoint, so up to MAX_BATCH_SIZE
+        placements are kept in flight at once instead of paying one round
+        trip per order. Results are returned in the same order as `orders`.
+        """
+        if not self.client:
+            raise RuntimeError("Client not initialized")
+
+        results: list[ExecutionResult] = []
+        for start in range(0, len(orders), self.MAX_BATCH_SIZE):
+            chunk = orders[start:start + self.MAX_BATCH_SIZE]
+            results.extend(await asyncio.gather(*(self._place_order(order) for order in chunk)))
+        return results
+
+    async def _place_order(self, order: Order) -> ExecutionResult:
+        """Place one order; the blocking SDK call runs on the thread pool."""
         try:
-            exchange_segment = self._get_exchange_segment(order.symbol)
-            trading_symbol = self._get_trading_symbol(order.symbol)
+            exchange_segment, trading_symbol = _split_symbol(order.symbol)
             
             transaction_type = "B" if order.side == "BUY" else "S"
             product = "MIS" # Default to Intraday, make configurable?
             order_type = "MKT" if order.order_type == "MARKET" else "L"
             validity = "DAY"
             
-            response = self.client.place_order(
+            response = await self._run_blocking(
+                self.client.place_order,
                 exchange_segment=exchange_segment,
                 product=product,
                 price=str(order.price) if order.price else "0",
@@ -174,7 +389,7 @@ class KotakNeoTool:
                 filled_quantity=0.0, # Async fill
                 filled_price=None,
                 status="OPEN",
-                timestamp=datetime.now()
+                timestamp=now()
             )
             
         except Exception as e:
@@ -182,7 +397,7 @@ class KotakNeoTool:
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     async def cancel_order(self, order_id: str, symbol: str) -> ExecutionResult:
@@ -191,19 +406,19 @@ class KotakNeoTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            self.client.cancel_order(order_id=order_id)
+            await self._run_blocking(self.client.cancel_order, order_id=order_id)
             return ExecutionResult(
                 success=True,
                 order_id=order_id,
                 status="CANCELLED",
-                timestamp=datetime.now()
+                timestamp=now()
             )
         except Exception as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     async def get_order_status(self, order_id: str, symbol: str) -> ExecutionResult:
@@ -212,7 +427,7 @@ class KotakNeoTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            history = self.client.order_history(order_id=order_id)
+            history = await self._run_blocking(self.client.order_history, order_id=order_id)
             # Parse history to get latest status
             latest = history['data'][0] # Assumption on structure
             
@@ -222,14 +437,14 @@ class KotakNeoTool:
                 filled_quantity=float(latest.get('fldQty', 0)),
                 filled_price=float(latest.get('avgPrc', 0)) if latest.get('avgPrc') else None,
                 status=latest.get('ordSt', 'UNKNOWN'),
-                timestamp=datetime.now()
+                timestamp=now()
             )
         except Exception as e:
             return ExecutionResult(
                 success=False,
                 status="ERROR",
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now()
             )
 
     async def get_portfolio_state(self) -> PortfolioState:
@@ -238,23 +453,28 @@ class KotakNeoTool:
             raise RuntimeError("Client not initialized")
 
         try:
-            limits = self.client.limits()
-            positions_resp = self.client.positions()
+            limits, positions_resp = await asyncio.gather(
+                self._run_blocking(self.client.limits),
+                self._run_blocking(self.client.positions),
+            )
             
             # Parse limits for balance
             cash = 0.0 # Extract from limits
             
+            ts = now()
             position_list = []
             if positions_resp and 'data' in positions_resp:
                 for pos in positions_resp['data']:
+                    get = pos.get
+                    net_qty = float(get('netQty', 0))
                     position_list.append(Position(
-                        symbol=pos.get('trdSym', ''),
-                        side="LONG" if int(pos.get('netQty', 0)) > 0 else "SHORT",
-                        quantity=abs(float(pos.get('netQty', 0))),
-                        entry_price=float(pos.get('avgPrc', 0)),
-                        current_price=float(pos.get('ltp', 0)), # Might need separate quote call
-                        unrealized_pnl=float(pos.get('urPnl', 0)),
-                        timestamp=datetime.now()
+                        symbol=get('trdSym', ''),
+                        side="LONG" if net_qty > 0 else "SHORT",
+                        quantity=abs(net_qty),
+                        entry_price=float(get('avgPrc', 0)),
+                        current_price=float(get('ltp', 0)), # Might need separate quote call
+                        unrealized_pnl=float(get('urPnl', 0)),
+                        timestamp=ts
                     ))
 
             return PortfolioState(
@@ -263,7 +483,7 @@ class KotakNeoTool:
                 positions=position_list,
                 daily_pnl=0.0,
                 total_pnl=0.0,
-                timestamp=datetime.now()
+                timestamp=ts
             )
         except Exception as e:
             raise RuntimeError(f"Failed to fetch portfolio state: {e}")
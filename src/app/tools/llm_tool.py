@@ -1,33 +1,55 @@
 """LLM tool for regime classification and decision support (Gemini-based)."""
-from typing import Optional
-import google.generativeai as genai
+from collections import OrderedDict
+from typing import Any, Optional
+import asyncio
+import time
+from pydantic import TypeAdapter
 
 from app.config import settings
 from app.schemas.models import MarketFeatures, MarketRegime
 from app.schemas.llm import GeminiRegimeResponse
+from app.utils.resilience import CircuitBreaker, CircuitBreakerOpenException
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Built once; validate_json parses and validates in a single pass in pydantic-core
+_REGIME_RESPONSE_ADAPTER = TypeAdapter(GeminiRegimeResponse)
 
-class LLMTool:
-    """Tool for LLM-based analysis and decision making using Gemini."""
+# Structured output: Gemini is constrained to JSON matching GeminiRegimeResponse
+# (a plain dict, so building it does not need the Gemini SDK imported). Keys the
+# installed SDK does not know are dropped in `_supported_generation_config`; the
+# JSON block in the regime prompt still describes the shape for those SDKs.
+_REGIME_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": GeminiRegimeResponse,
+}
 
-    def __init__(self) -> None:
-        # Configure Gemini with API key
-        genai.configure(api_key=settings.gemini_api_key)
-        # Use gemini-pro-latest model (most stable, maps to latest gemini-pro version)
-        self.model = genai.GenerativeModel('gemini-pro-latest')
 
-    async def classify_regime_with_llm(
-        self,
-        features: MarketFeatures,
-        ambiguity_score: float,
-    ) -> MarketRegime:
-        """Use Gemini to classify market regime when rules are uncertain."""
+def _supported_generation_config(config: dict[str, Any], sdk_config_cls: Any) -> Optional[dict[str, Any]]:
+    """Keep only the options the SDK's GenerationConfig accepts (None if none are left).
+
+    Older google-generativeai releases (e.g. 0.3.x) reject response_mime_type
+    and response_schema outright, which would fail every request.
+    """
+    fields = getattr(sdk_config_cls, "__dataclass_fields__", {})
+    supported = {key: value for key, value in config.items() if key in fields}
+    return supported or None
+
 
-        system_prompt = """You are an expert quantitative trader analyzing market regimes.
+def _strip_json_fence(text: str) -> str:
+    """Unwrap a ```json fenced block; plain JSON is returned unchanged."""
+    if "```json" in text:
+        return text.split("```json")[1].split("```")[0]
+    if "```" in text:
+        return text.split("```")[1].split("```")[0]
+    return text
+
+# Prompts are built once; only the feature block is formatted per call. The
+# static system prefix also stays byte-identical across requests, which is what
+# Gemini context caching keys on.
+SYSTEM_PROMPT_REGIME = """You are an expert quantitative trader analyzing market regimes.
 Based on the provided market features, classify the current regime as one of:
 - TRENDING (strong directional movement)
 - RANGING (sideways, mean-reverting)
@@ -38,7 +60,9 @@ Based on the provided market features, classify the current regime as one of:
 Provide your classification and confidence score (0-1).
 Be concise and analytical."""
 
-        user_message = f"""Analyze these market features and classify the regime:
+_REGIME_PROMPT_PREFIX = SYSTEM_PROMPT_REGIME + "\n\n"
+
+_REGIME_USER_TEMPLATE = """Analyze these market features and classify the regime:
 
 Symbol: {features.symbol}
 Current Price: {features.price}
@@ -58,8 +82,124 @@ OUTPUT IN JSON FORMAT ONLY.
     "reasoning": "string"
 }}"""
 
-        # Combine system and user messages
-        full_prompt = f"{system_prompt}\n\n{user_message}"
+SYSTEM_PROMPT_ADVICE = """You are an expert algorithmic trader providing concise trading advice.
+Consider the market regime, features, and current position to suggest optimal actions.
+Be specific and actionable. Keep responses under 100 words."""
+
+_ADVICE_PROMPT_PREFIX = SYSTEM_PROMPT_ADVICE + "\n\n"
+
+_ADVICE_USER_TEMPLATE = """Current Market State:
+
+Symbol: {features.symbol}
+Price: {features.price}
+Regime: {regime.regime} (confidence: {regime.confidence:.2f})
+
+Features:
+- EMA(9): {features.ema_9}, EMA(50): {features.ema_50}
+- ATR: {features.atr}
+- Volatility: {features.realized_volatility}
+- OB Imbalance: {features.orderbook_imbalance}
+
+Current Position: {current_position}
+
+What action should be taken? Consider entry, exit, or hold."""
+
+# Regime classifications are reused while the bucketed features stay put
+REGIME_CACHE_TTL_SECONDS = 30.0
+REGIME_CACHE_MAX_ENTRIES = 1024
+
+
+def _bucket(value: Optional[float], ndigits: int) -> Optional[float]:
+    return None if value is None else round(value, ndigits)
+
+
+class LLMTool:
+    """Tool for LLM-based analysis and decision making using Gemini."""
+
+    def __init__(self) -> None:
+        # Created on first use; google.generativeai (gRPC + protobuf) is slow to
+        # import and runs that never consult the LLM should not pay for it
+        self._model: Optional[Any] = None
+        self._regime_config: Optional[dict[str, Any]] = None
+        # feature-bucket key -> (monotonic time stored, regime)
+        self._cache: OrderedDict[int, tuple[float, MarketRegime]] = OrderedDict()
+        # Skips Gemini entirely after repeated timeouts/errors
+        self._breaker = CircuitBreaker(
+            failure_threshold=settings.llm_breaker_failures,
+            recovery_timeout=settings.llm_breaker_reset_seconds,
+        )
+
+    @property
+    def model(self) -> Any:
+        """Gemini model, importing and configuring the SDK on first access."""
+        if self._model is None:
+            import google.generativeai as genai
+
+            # Configure Gemini with API key
+            genai.configure(api_key=settings.gemini_api_key)
+            # Use gemini-pro-latest model (most stable, maps to latest gemini-pro version)
+            self._model = genai.GenerativeModel('gemini-pro-latest')
+            self._regime_config = _supported_generation_config(
+                _REGIME_GENERATION_CONFIG, genai.types.GenerationConfig
+            )
+        return self._model
+
+    @property
+    def regime_generation_config(self) -> Optional[dict[str, Any]]:
+        """Regime-request options the installed Gemini SDK supports."""
+        self.model  # imports the SDK and resolves _regime_config on first use
+        return self._regime_config
+
+    async def _generate(self, prompt: str, **kwargs: Any) -> str:
+        """Call Gemini with a deadline and return the response text.
+
+        Raises CircuitBreakerOpenException without calling Gemini while open.
+        """
+        self._breaker.check()
+        try:
+            response = await asyncio.wait_for(
+                self.model.generate_content_async(prompt, **kwargs),
+                timeout=settings.llm_timeout_seconds,
+            )
+            text = response.text
+        except Exception:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        return text
+
+    @staticmethod
+    def _regime_cache_key(features: MarketFeatures, ambiguity_score: float) -> int:
+        """Hash features quantized coarsely enough that tick noise maps to one key."""
+        return hash((
+            features.symbol,
+            _bucket(features.price, 2),
+            _bucket(features.ema_9, 2),
+            _bucket(features.ema_50, 2),
+            _bucket(features.atr, 3),
+            _bucket(features.realized_volatility, 3),
+            _bucket(features.orderbook_imbalance, 2),
+            _bucket(ambiguity_score, 1),
+        ))
+
+    async def classify_regime_with_llm(
+        self,
+        features: MarketFeatures,
+        ambiguity_score: float,
+    ) -> MarketRegime:
+        """Use Gemini to classify market regime when rules are uncertain.
+
+        Results are cached for REGIME_CACHE_TTL_SECONDS per bucketed feature set.
+        """
+        cache_key = self._regime_cache_key(features, ambiguity_score)
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < REGIME_CACHE_TTL_SECONDS:
+            self._cache.move_to_end(cache_key)
+            return cached[1].model_copy(update={"timestamp": features.timestamp})
+
+        full_prompt = _REGIME_PROMPT_PREFIX + _REGIME_USER_TEMPLATE.format(
+            features=features, ambiguity_score=ambiguity_score
+        )
 
         logger.info(json.dumps({
             "event": "LLM_REQUEST",
@@ -70,30 +210,33 @@ OUTPUT IN JSON FORMAT ONLY.
 
         # Generate response using Gemini
         try:
-            response = self.model.generate_content(full_prompt)
-            content = response.text
-            
-            # Clean markdown code blocks if present
-            clean_content = content
-            if "```json" in clean_content:
-                clean_content = clean_content.split("```json")[1].split("```")[0]
-            elif "```" in clean_content:
-                clean_content = clean_content.split("```")[1].split("```")[0]
-
-            data = json.loads(clean_content)
-            validated = GeminiRegimeResponse(**data)
+            text = await self._generate(full_prompt, generation_config=self.regime_generation_config)
+            # Without JSON response mode the model may still wrap its answer in a fence
+            validated = _REGIME_RESPONSE_ADAPTER.validate_json(_strip_json_fence(text))
             
             # Log readable decision
             logger.info(f"LLM Decision: {validated.regime} (Conf: {validated.confidence:.2f})")
             if hasattr(validated, 'reasoning'):
                 logger.info(f"LLM Reasoning: {validated.reasoning}")
 
-            return MarketRegime(
+            regime = MarketRegime(
                 regime=validated.regime,
                 confidence=validated.confidence,
                 timestamp=features.timestamp,
                 # Store reasoning somehow if needed
             )
+            self._cache[cache_key] = (time.monotonic(), regime)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > REGIME_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+            return regime
+        except (CircuitBreakerOpenException, asyncio.TimeoutError) as e:
+            logger.warning(f"LLM unavailable, regime left UNKNOWN: {e!r}")
+            return MarketRegime(
+                regime="UNKNOWN",
+                confidence=0.0,
+                timestamp=features.timestamp
+            )
         except Exception as e:
             logger.error(f"LLM Parse Error: {e}")
             return MarketRegime(
@@ -110,34 +253,15 @@ OUTPUT IN JSON FORMAT ONLY.
     ) -> str:
         """Get trading advice from Gemini for complex scenarios."""
 
-        system_prompt = """You are an expert algorithmic trader providing concise trading advice.
-Consider the market regime, features, and current position to suggest optimal actions.
-Be specific and actionable. Keep responses under 100 words."""
-
-        user_message = f"""Current Market State:
-
-Symbol: {features.symbol}
-Price: {features.price}
-Regime: {regime.regime} (confidence: {regime.confidence:.2f})
-
-Features:
-- EMA(9): {features.ema_9}, EMA(50): {features.ema_50}
-- ATR: {features.atr}
-- Volatility: {features.realized_volatility}
-- OB Imbalance: {features.orderbook_imbalance}
-
-Current Position: {current_position or 'None'}
-
-What action should be taken? Consider entry, exit, or hold."""
-
-        # Combine system and user messages
-        full_prompt = f"{system_prompt}\n\n{user_message}"
+        full_prompt = _ADVICE_PROMPT_PREFIX + _ADVICE_USER_TEMPLATE.format(
+            features=features, regime=regime, current_position=current_position or "None"
+        )
 
         # Generate response using Gemini
-        response = self.model.generate_content(full_prompt)
+        text = await self._generate(full_prompt)
 
-        if response.text:
-            return response.text.strip()
+        if text:
+            return text.strip()
         return "Unable to generate advice"
 
 
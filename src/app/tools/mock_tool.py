@@ -1,10 +1,13 @@
 """Mock trading provider for testing and dry runs."""
-from datetime import datetime, timedelta
+from datetime import timedelta
 import random
 import asyncio
 
+import numpy as np
+
 from app.schemas.events import TradeEvent, OrderbookUpdate, KlineEvent
 from app.schemas.models import Order, ExecutionResult, PortfolioState, Position
+from app.utils.clock import now
 
 class MockTradingProvider:
     """Mock provider generating synthetic data."""
@@ -16,6 +19,9 @@ class MockTradingProvider:
         self.positions: dict[str, Position] = {}
         self.balance = 10000.0
         self.equity = 10000.0
+        self._rng = np.random.default_rng()
+        # Pre-drawn price-walk steps for get_orderbook, refilled in bulk
+        self._walk_steps: list[float] = []
         
     async def initialize(self) -> None:
         print("Mock Provider Initialized")
@@ -25,59 +31,64 @@ class MockTradingProvider:
         
     async def get_orderbook(self, symbol: str, limit: int = 20) -> OrderbookUpdate:
         # Simulate price walk
-        self.price += random.gauss(0, 10)
+        if not self._walk_steps:
+            self._walk_steps = self._rng.normal(0, 10, size=1024).tolist()
+        self.price += self._walk_steps.pop()
         
         # Generate spread around price
         best_bid = self.price - 1.0
         best_ask = self.price + 1.0
         
         return OrderbookUpdate(
-            timestamp=datetime.now(),
+            timestamp=now(),
             symbol=symbol,
             bids=[(best_bid, 1.0), (best_bid - 5, 2.0)],
             asks=[(best_ask, 1.0), (best_ask + 5, 2.0)]
         )
 
     async def get_recent_trades(self, symbol: str, limit: int = 100) -> list[TradeEvent]:
+        ts = now()
         return [
             TradeEvent(
-                timestamp=datetime.now(),
+                timestamp=ts,
                 symbol=symbol,
                 price=self.price,
                 quantity=0.1,
                 side=random.choice(["BUY", "SELL"]),
-                trade_id=f"trade_{int(datetime.now().timestamp())}"
+                trade_id=f"trade_{int(ts.timestamp())}"
             )
         ]
 
     async def get_klines(self, symbol: str, interval: str = "1m", limit: int = 100) -> list[KlineEvent]:
-        # Generate sequence of klines
-        klines = []
+        # Generate sequence of klines as a random walk, one vectorized pass
         base_price = self.price - (limit * 5)
-        now = datetime.now()
-        
-        for i in range(limit):
-            open_p = base_price
-            close_p = base_price + random.gauss(0, 20)
-            high_p = max(open_p, close_p) + 5
-            low_p = min(open_p, close_p) - 5
-            
-            klines.append(KlineEvent(
-                timestamp=now - timedelta(minutes=limit-i),
+        ts = now()
+        timestamps = [ts - timedelta(minutes=limit - i) for i in range(limit)]
+
+        closes = base_price + np.cumsum(self._rng.normal(0, 20, size=limit))
+        opens = np.concatenate(([base_price], closes[:-1]))
+        highs = np.maximum(opens, closes) + 5
+        lows = np.minimum(opens, closes) - 5
+
+        return [
+            KlineEvent(
+                timestamp=t,
                 symbol=symbol,
                 interval=interval,
-                open=open_p,
-                high=high_p,
-                low=low_p,
-                close=close_p,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
                 volume=100.0
-            ))
-            base_price = close_p
-            
-        return klines
+            )
+            for t, o, h, l, c in zip(
+                timestamps, opens.tolist(), highs.tolist(), lows.tolist(), closes.tolist()
+            )
+        ]
 
     async def execute_order(self, order: Order) -> ExecutionResult:
-        order_id = f"mock_ord_{int(datetime.now().timestamp())}"
+        ts = now()
+        order_id = f"mock_ord_{int(ts.timestamp())}"
         
         # Simulate fill
         filled_price = order.price if order.price else self.price
@@ -95,12 +106,12 @@ class MockTradingProvider:
             filled_quantity=order.quantity,
             filled_price=filled_price,
             status="FILLED",
-            timestamp=datetime.now()
+            timestamp=ts
         )
 
     async def get_portfolio_state(self) -> PortfolioState:
         return PortfolioState(
-            timestamp=datetime.now(),
+            timestamp=now(),
             equity=self.balance, # Simplified
             balance=self.balance,
             positions=[], # TODO: track positions if needed
@@ -111,14 +122,14 @@ class MockTradingProvider:
         return ExecutionResult(
             success=True,
             status="CANCELED",
-            timestamp=datetime.now()
+            timestamp=now()
         )
 
     async def get_order_status(self, order_id: str, symbol: str) -> ExecutionResult:
         return ExecutionResult(
             success=True,
             status="FILLED",
-            timestamp=datetime.now()
+            timestamp=now()
         )
 
 mock_tool = MockTradingProvider()
@@ -4,7 +4,10 @@ This module provides a unified interface for different trading backends
 (Binance, Alpaca) so the rest of the system doesn't need to know which
 provider is being used.
 """
-from typing import Protocol, runtime_checkable
+import asyncio
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Protocol, runtime_checkable
 
 from app.schemas.events import TradeEvent, OrderbookUpdate, KlineEvent
 from app.schemas.models import Order, ExecutionResult, PortfolioState
@@ -56,32 +59,60 @@ class TradingProvider(Protocol):
         ...
 
 
+async def gather_market_snapshot(
+    provider: TradingProvider,
+    symbol: str,
+    ob_limit: int = 20,
+    trade_limit: int = 100,
+    kline_interval: str = "1m",
+    kline_limit: int = 100
+) -> tuple[OrderbookUpdate, list[TradeEvent], list[KlineEvent]]:
+    """Fetch orderbook, recent trades and klines for one symbol concurrently."""
+    orderbook, trades, klines = await asyncio.gather(
+        provider.get_orderbook(symbol, limit=ob_limit),
+        provider.get_recent_trades(symbol, limit=trade_limit),
+        provider.get_klines(symbol, interval=kline_interval, limit=kline_limit),
+    )
+    return orderbook, trades, klines
+
+
+# Provider name (settings.trading_provider) -> (module, global instance name).
+# Modules are imported only when their provider is selected.
+_PROVIDERS: dict[str, tuple[str, str]] = {
+    "binance": ("app.tools.binance_tool", "binance_tool"),
+    "alpaca": ("app.tools.alpaca_tool", "alpaca_tool"),
+    "kotak_neo": ("app.tools.kotak_neo_tool", "kotak_neo_tool"),
+    "mock": ("app.tools.mock_tool", "mock_tool"),
+}
+
+
+@lru_cache(maxsize=1)
 def get_trading_provider() -> TradingProvider:
     """Factory function to get the configured trading provider.
 
     Returns the appropriate trading provider instance based on configuration.
+    The result is cached, so the provider module is resolved only once.
     """
     from app.config import settings
 
-    if settings.trading_provider == "alpaca":
-        from app.tools.alpaca_tool import alpaca_tool
-        return alpaca_tool  # type: ignore
-    elif settings.trading_provider == "binance":
-        from app.tools.binance_tool import binance_tool
-        return binance_tool  # type: ignore
-    elif settings.trading_provider == "kotak_neo":
-        from app.tools.kotak_neo_tool import kotak_neo_tool
-        return kotak_neo_tool  # type: ignore
-    elif settings.trading_provider == "mock":
-        from app.tools.mock_tool import mock_tool
-        return mock_tool # type: ignore
-    else:
+    try:
+        module_name, attr = _PROVIDERS[settings.trading_provider]
+    except KeyError:
         raise ValueError(
             f"Unknown trading provider: {settings.trading_provider}. "
-            f"Supported providers: binance, alpaca, kotak_neo, mock"
-        )
+            f"Supported providers: {', '.join(_PROVIDERS)}"
+        ) from None
+    return getattr(import_module(module_name), attr)  # type: ignore
 
 
-# Global instance - use this throughout the application
-trading_provider = get_trading_provider()
+def __getattr__(name: str) -> Any:
+    """Resolve the global `trading_provider` on first access (PEP 562).
+
+    `from app.tools.trading_provider import trading_provider` keeps working,
+    but importing this module (e.g. for the Protocol) no longer imports the
+    configured provider's SDK.
+    """
+    if name == "trading_provider":
+        return get_trading_provider()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -1,36 +1,344 @@
 """Backtesting utilities."""
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any
-import pandas as pd
+from itertools import count
+from typing import Any, Final, Optional, Sequence
+import math
+import numpy as np
 
-from app.schemas.models import ExecutionResult, PortfolioState, Position, Signal
+from app.schemas.models import ExecutionResult, Position, Signal
 from app.schemas.events import KlineEvent
-from app.utils.metrics import calculate_average_win_loss_ratio
+from app.utils.clock import to_ns
+from app.utils.jit import NUMBA_AVAILABLE, njit
+from app.utils.metrics import RunningMoments, TradeLog, aggregate_trade_stats
+
+# Integer codes used by the JIT kernel
+_SIDE_CODES = {"LONG": 1, "SHORT": -1, "NEUTRAL": 0}
+_EXIT_REASONS = ("SIGNAL", "STOP_LOSS", "TAKE_PROFIT")
+# Sharpe annualization for 15m bars (96 per day, 365 days)
+SQRT_15M_PERIODS: Final[float] = math.sqrt(35040)
+
+
+@dataclass(slots=True)
+class TradeRecord:
+    """One OPEN or CLOSE fill in the backtest trade log."""
+
+    timestamp: datetime
+    type: str
+    side: str
+    price: float
+    quantity: float
+    # Set on OPEN records
+    signal_confidence: Optional[float] = None
+    # Set on CLOSE records
+    pnl: Optional[float] = None
+    entry_price: Optional[float] = None
+    reason: Optional[str] = None
+
+
+def _or_nan(value: Optional[float]) -> float:
+    """Map an optional price level to the NaN sentinel used by the JIT kernel."""
+    return math.nan if value is None else float(value)
+
+
+@njit(cache=True)
+def _is_set(level):
+    """Mirror `if position.stop_loss:` truthiness: None (NaN) and 0.0 are unset."""
+    return not math.isnan(level) and level != 0.0
+
+
+@njit(cache=True)
+def _first_exit(start, side, sl, tp, lows, highs, directions):
+    """
+    First bar >= start that closes a position with fixed SL/TP levels.
+
+    A bar closes the position when its stop or target is touched or its
+    signal is NEUTRAL/opposite. Scans in doubling windows of vectorized
+    compares so the cost is proportional to the trade's length; returns
+    len(lows) if the position survives to the end.
+    """
+    n = lows.shape[0]
+    sl_set = _is_set(sl)
+    tp_set = _is_set(tp)
+    lo = start
+    width = 16
+    while lo < n:
+        hi = min(lo + width, n)
+        hit = directions[lo:hi] != side
+        if side == 1:
+            if sl_set:
+                hit = hit | (lows[lo:hi] <= sl)
+            if tp_set:
+                hit = hit | (highs[lo:hi] >= tp)
+        else:
+            if sl_set:
+                hit = hit | (highs[lo:hi] >= sl)
+            if tp_set:
+                hit = hit | (lows[lo:hi] <= tp)
+        if hit.any():
+            return lo + np.argmax(hit)
+        lo = hi
+        width *= 2
+    return n
+
+
+@njit(cache=True)
+def _backtest_kernel(
+    closes, highs, lows, directions, stop_losses, take_profits, trails,
+    cost_pct, quantity, balance
+):
+    """
+    Equivalent of calling `process_signal` on each bar, in order.
+
+    Inputs hold only the bars that carry a signal. Sides/directions are
+    +1 LONG, -1 SHORT, 0 NEUTRAL; unset levels are NaN. Stretches where a
+    position with fixed SL/TP is simply held are located with `_first_exit`
+    and marked to market in bulk; bars that open, close or trail a stop run
+    the scalar logic. Returns the equity samples, the trade log columns
+    and the final open position (side 0 when flat).
+    """
+    n = closes.shape[0]
+    # Every bar records exactly one equity sample
+    eq_values = np.empty(n, dtype=np.float64)
+
+    # At most one open and one close per bar
+    t_idx = np.empty(2 * n, dtype=np.int64)
+    t_close = np.empty(2 * n, dtype=np.bool_)
+    t_side = np.empty(2 * n, dtype=np.int8)
+    t_price = np.empty(2 * n, dtype=np.float64)
+    t_pnl = np.empty(2 * n, dtype=np.float64)
+    t_entry = np.empty(2 * n, dtype=np.float64)
+    t_reason = np.empty(2 * n, dtype=np.int8)
+    n_trades = 0
+
+    side = 0
+    entry = 0.0
+    sl = math.nan
+    tp = math.nan
+    trail = math.nan
+    open_idx = -1
+
+    i = 0
+    while i < n:
+        if side != 0 and not _is_set(trail):
+            # Bars before the exit bar only hold: record their equity in bulk
+            j = _first_exit(i, side, sl, tp, lows, highs, directions)
+            eq_values[i:j] = balance + side * (closes[i:j] - entry) * quantity
+            i = j
+            if i == n:
+                break
+
+        close = closes[i]
+        high = highs[i]
+        low = lows[i]
+        direction = directions[i]
+
+        if side != 0:
+            if _is_set(trail):
+                if side == 1:
+                    new_sl = high - trail
+                    if math.isnan(sl) or new_sl > sl:
+                        sl = new_sl
+                else:
+                    new_sl = low + trail
+                    if math.isnan(sl) or new_sl < sl:
+                        sl = new_sl
+
+            reason = 0
+            exit_price = close
+            if _is_set(sl):
+                if (side == 1 and low <= sl) or (side == -1 and high >= sl):
+                    reason = 1
+                    exit_price = sl
+            if reason == 0 and _is_set(tp):
+                if (side == 1 and high >= tp) or (side == -1 and low <= tp):
+                    reason = 2
+                    exit_price = tp
+
+            if reason != 0 or direction == 0 or direction == -side:
+                # Closing sells a long (lower fill) and buys back a short (higher fill)
+                exec_price = exit_price * (1.0 - side * cost_pct)
+                pnl = side * (exec_price - entry) * quantity
+                balance += pnl
+
+                t_idx[n_trades] = i
+                t_close[n_trades] = True
+                t_side[n_trades] = side
+                t_price[n_trades] = exec_price
+                t_pnl[n_trades] = pnl
+                t_entry[n_trades] = entry
+                t_reason[n_trades] = reason
+                n_trades += 1
+                side = 0
+
+                if reason != 0:
+                    # No re-entry on the bar a stop/target was hit
+                    eq_values[i] = balance
+                    i += 1
+                    continue
+
+        if direction != 0 and side == 0:
+            side = direction
+            entry = close * (1.0 + side * cost_pct)
+            sl = stop_losses[i]
+            tp = take_profits[i]
+            trail = trails[i]
+            open_idx = i
+
+            t_idx[n_trades] = i
+            t_close[n_trades] = False
+            t_side[n_trades] = side
+            t_price[n_trades] = entry
+            t_pnl[n_trades] = 0.0
+            t_entry[n_trades] = entry
+            t_reason[n_trades] = 0
+            n_trades += 1
+
+        equity = balance
+        if side != 0:
+            equity += side * (close - entry) * quantity
+        eq_values[i] = equity
+        i += 1
+
+    return (
+        eq_values,
+        t_idx[:n_trades], t_close[:n_trades], t_side[:n_trades], t_price[:n_trades],
+        t_pnl[:n_trades], t_entry[:n_trades], t_reason[:n_trades],
+        balance, side, entry, sl, tp, trail, open_idx,
+    )
+
+
+def warm_up_kernels() -> None:
+    """
+    Compile the backtest kernels ahead of the first real run.
+
+    The kernels are `cache=True`, so compiling once writes them to the Numba
+    on-disk cache and later processes (parameter sweeps, the container at
+    runtime) load the machine code instead of paying LLVM compile time.
+    Inputs use the same dtypes as `Backtester.run` so the cached
+    specialization is the one it hits. Without numba this is a cheap no-op replay.
+    """
+    bars = np.array([100.0, 101.0, 99.0], dtype=np.float64)
+    directions = np.array([1, 0, -1], dtype=np.int8)
+    levels = np.array([98.0, math.nan, 101.0], dtype=np.float64)
+    _backtest_kernel(bars, bars + 1.0, bars - 1.0, directions, levels, levels, levels, 0.001, 0.01, 10000.0)
 
 
 class Backtester:
     """Simple backtesting engine for strategy evaluation."""
 
-    def __init__(self, initial_balance: float = 10000.0, spread_pct: float = 0.0005, slippage_pct: float = 0.0005) -> None:
+    def __init__(
+        self,
+        initial_balance: float = 10000.0,
+        spread_pct: float = 0.0005,
+        slippage_pct: float = 0.0005,
+        equity_sampling_interval: Optional[timedelta] = None
+    ) -> None:
+        """
+        Args:
+            initial_balance: Starting cash
+            spread_pct: Half-spread charged on each fill
+            slippage_pct: Slippage charged on each fill
+            equity_sampling_interval: Minimum spacing between recorded equity
+                samples (e.g. one hour for tick data). None records every bar.
+                Drawdown and Sharpe are computed on the recorded samples.
+        """
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.spread_pct = spread_pct
         self.slippage_pct = slippage_pct
-        self.positions: list[Position] = []
-        self.trades: list[dict[str, Any]] = []
-        self.equity_curve: list[tuple[datetime, float]] = []
-
-    def _get_execution_price(self, price: float, side: str) -> float:
-        """Calculate execution price including spread and slippage."""
-        # Cost is spread + slippage
-        total_cost_pct = self.spread_pct + self.slippage_pct
-        
-        if side == "LONG" or side == "BUY":
-            # Buy higher
-            return price * (1.0 + total_cost_pct)
-        else:
-            # Sell lower
-            return price * (1.0 - total_cost_pct)
+        self.equity_sampling_interval = equity_sampling_interval
+        # The backtester holds at most one position at a time
+        self.position: Optional[Position] = None
+        # Signed (LONG +, SHORT -) exposure of the open position, so
+        # mark-to-market is branch-free: s*(p - e)*q = p*(s*q) - (s*q*e)
+        self._net_qty = 0.0
+        self._net_cost = 0.0
+        self.trades: list[TradeRecord] = []
+        # Sequential ids for simulated fills
+        self._order_seq = count(1)
+        # PnL of each closed trade, in order, for the summary statistics
+        self._closed_pnls = TradeLog()
+        # Equity samples: values in a preallocated array grown by doubling,
+        # so metrics slice it without rebuilding; see the equity_curve property
+        self._eq_times: list[datetime] = []
+        self._eq_values = np.empty(4096, dtype=np.float64)
+        self._eq_len = 0
+        # Latest marked equity, kept even when its sample is skipped
+        self._last_equity = initial_balance
+        # Running peak/drawdown and return moments, updated as samples are
+        # recorded so get_results does not rescan the curve
+        self._peak = -math.inf
+        self._max_drawdown = 0.0
+        self._returns = RunningMoments()
+
+    @property
+    def equity_curve(self) -> list[tuple[datetime, float]]:
+        """Recorded (timestamp, equity) samples."""
+        return list(zip(self._eq_times, self._eq_values[:self._eq_len].tolist()))
+
+    def _reserve_equity(self, extra: int) -> None:
+        """Ensure room for `extra` more equity samples."""
+        needed = self._eq_len + extra
+        if needed > self._eq_values.size:
+            grown = np.empty(max(needed, self._eq_values.size * 2), dtype=np.float64)
+            grown[:self._eq_len] = self._eq_values[:self._eq_len]
+            self._eq_values = grown
+
+    def _record_equity(self, timestamp: datetime, equity: float) -> None:
+        """Append one equity sample, subject to the sampling interval."""
+        self._last_equity = equity
+        if (
+            self.equity_sampling_interval is not None
+            and self._eq_len
+            and timestamp - self._eq_times[-1] < self.equity_sampling_interval
+        ):
+            return
+        if self._eq_len == self._eq_values.size:
+            self._reserve_equity(1)
+        if self._eq_len:
+            prev = self._eq_values[self._eq_len - 1]
+            r = (equity - prev) / prev
+            self._returns.update(r)
+        if equity > self._peak:
+            self._peak = equity
+        drawdown = (self._peak - equity) / self._peak * 100
+        if drawdown > self._max_drawdown:
+            self._max_drawdown = drawdown
+        self._eq_values[self._eq_len] = equity
+        self._eq_len += 1
+        self._eq_times.append(timestamp)
+
+    def _sample_indices(self, timestamps_ns: list[int]) -> list[int]:
+        """Indices of the (nanosecond) timestamps `_record_equity` would keep, in order."""
+        interval = to_ns(self.equity_sampling_interval)
+        last = to_ns(self._eq_times[-1]) if self._eq_len else None
+        keep = []
+        for k, ts in enumerate(timestamps_ns):
+            if last is None or ts - last >= interval:
+                keep.append(k)
+                last = ts
+        return keep
+
+    def _extend_equity_stats(self, values: np.ndarray) -> None:
+        """Fold a batch of new equity samples into the running metrics."""
+        if not values.size:
+            return
+        peak = np.maximum(np.maximum.accumulate(values), self._peak)
+        self._peak = float(peak[-1])
+        self._max_drawdown = max(self._max_drawdown, float(((peak - values) / peak * 100).max()))
+
+        if self._eq_len:
+            values = np.concatenate(([self._eq_values[self._eq_len - 1]], values))
+        returns = np.diff(values) / values[:-1]
+        self._returns.merge(RunningMoments.from_array(returns))
+
+    def _get_execution_price(self, price: float, sign: int) -> float:
+        """Calculate execution price including spread and slippage.
+
+        `sign` is +1 for buy-side fills (pay up) and -1 for sell-side (receive less).
+        """
+        return price * (1.0 + sign * (self.spread_pct + self.slippage_pct))
 
     def process_signal(
         self,
@@ -54,8 +362,8 @@ class Backtester:
             ExecutionResult with simulated execution
         """
         # Close existing position if signal is opposite or neutral
-        if self.positions:
-            position = self.positions[0]
+        position = self.position
+        if position is not None:
             
             # --- Trailing Stop Logic ---
             if position.trailing_stop_distance:
@@ -119,29 +427,136 @@ class Backtester:
                 if sl_hit or tp_hit:
                     # Update equity and return, don't open new position this tick
                      equity = self._calculate_equity(current_price)
-                     self.equity_curve.append((timestamp, equity))
+                     self._record_equity(timestamp, equity)
                      return ExecutionResult(
-                        success=True, order_id=f"exit_{timestamp.timestamp()}",
+                        success=True, order_id=f"exit_{next(self._order_seq)}",
                         filled_quantity=0.01, filled_price=final_price, status="FILLED", timestamp=timestamp
                      )
 
         # Open new position if signal is not neutral
-        if signal.direction in ["LONG", "SHORT"] and not self.positions:
+        if signal.direction in ["LONG", "SHORT"] and self.position is None:
             self._open_position(signal, current_price, timestamp)
 
         # Record equity
         equity = self._calculate_equity(current_price)
-        self.equity_curve.append((timestamp, equity))
+        self._record_equity(timestamp, equity)
 
         return ExecutionResult(
             success=True,
-            order_id=f"backtest_{timestamp.timestamp()}",
+            order_id=f"backtest_{next(self._order_seq)}",
             filled_quantity=0.01,
             filled_price=current_price, 
             status="FILLED",
             timestamp=timestamp
         )
 
+    def run(self, klines: Sequence[KlineEvent], signals: Sequence[Optional[Signal]]) -> None:
+        """
+        Replay precomputed signals over candles in one compiled pass.
+
+        Equivalent to calling `process_signal(signals[i], close, high, low, ts)`
+        for every bar whose signal is not None, but runs in the Numba kernel
+        instead of per-bar Python (without numba it does exactly that loop).
+        Only usable when signals do not depend on the backtester's position
+        state; strategies that read it back (e.g. for hysteresis) must keep
+        calling `process_signal`.
+
+        Args:
+            klines: Candles to replay
+            signals: One entry per candle; None means no signal on that bar
+        """
+        if len(klines) != len(signals):
+            raise ValueError("klines and signals must have the same length")
+        if self.position is not None:
+            raise ValueError("run() must start without an open position")
+
+        if not NUMBA_AVAILABLE:
+            # Interpreted, the kernel indexes arrays element by element and is
+            # slower than the per-bar path it replaces
+            for kline, signal in zip(klines, signals):
+                if signal is not None:
+                    self.process_signal(signal, kline.close, kline.high, kline.low, kline.timestamp)
+            return
+
+        # Bars without a signal are skipped by process_signal; drop them up front
+        bars = [i for i, signal in enumerate(signals) if signal is not None]
+        active = [signals[i] for i in bars]
+        n = len(bars)
+        closes = np.fromiter((klines[i].close for i in bars), dtype=np.float64, count=n)
+        highs = np.fromiter((klines[i].high for i in bars), dtype=np.float64, count=n)
+        lows = np.fromiter((klines[i].low for i in bars), dtype=np.float64, count=n)
+        directions = np.fromiter((_SIDE_CODES[s.direction] for s in active), dtype=np.int8, count=n)
+        stop_losses = np.fromiter((_or_nan(s.stop_loss) for s in active), dtype=np.float64, count=n)
+        take_profits = np.fromiter((_or_nan(s.take_profit) for s in active), dtype=np.float64, count=n)
+        trails = np.fromiter((_or_nan(s.trailing_stop_distance) for s in active), dtype=np.float64, count=n)
+
+        quantity = 0.01  # Fixed size, as in _open_position
+        (
+            eq_values,
+            t_idx, t_close, t_side, t_price, t_pnl, t_entry, t_reason,
+            balance, side, entry, sl, tp, trail, open_idx,
+        ) = _backtest_kernel(
+            closes, highs, lows, directions, stop_losses, take_profits, trails,
+            self.spread_pct + self.slippage_pct, quantity, self.balance
+        )
+
+        self.balance = float(balance)
+        self._closed_pnls.extend(t_pnl[t_close])
+        eq_times = [klines[i].timestamp for i in bars]
+        if n:
+            self._last_equity = float(eq_values[-1])
+        if self.equity_sampling_interval is not None:
+            keep = self._sample_indices([klines[i].timestamp_ns for i in bars])
+            eq_values = eq_values[keep]
+            eq_times = [eq_times[k] for k in keep]
+        self._extend_equity_stats(eq_values)
+        self._reserve_equity(len(eq_values))
+        self._eq_values[self._eq_len:self._eq_len + len(eq_values)] = eq_values
+        self._eq_len += len(eq_values)
+        self._eq_times.extend(eq_times)
+        for k, is_close, side_code, price, pnl, entry_price, reason in zip(
+            t_idx.tolist(), t_close.tolist(), t_side.tolist(), t_price.tolist(),
+            t_pnl.tolist(), t_entry.tolist(), t_reason.tolist()
+        ):
+            i = bars[k]
+            side_name = "LONG" if side_code == 1 else "SHORT"
+            if is_close:
+                self.trades.append(TradeRecord(
+                    timestamp=klines[i].timestamp,
+                    type="CLOSE",
+                    side=side_name,
+                    price=price,
+                    quantity=quantity,
+                    pnl=pnl,
+                    entry_price=entry_price,
+                    reason=_EXIT_REASONS[reason]
+                ))
+            else:
+                self.trades.append(TradeRecord(
+                    timestamp=klines[i].timestamp,
+                    type="OPEN",
+                    side=side_name,
+                    price=price,
+                    quantity=quantity,
+                    signal_confidence=signals[i].confidence  # type: ignore[union-attr]
+                ))
+
+        if side != 0:
+            open_idx = bars[open_idx]
+            signal = signals[open_idx]
+            self._add_position(Position(
+                symbol=signal.symbol,  # type: ignore[union-attr]
+                side="LONG" if side == 1 else "SHORT",
+                quantity=quantity,
+                entry_price=float(entry),
+                current_price=klines[open_idx].close,
+                unrealized_pnl=0.0,
+                stop_loss=None if math.isnan(sl) else float(sl),
+                take_profit=None if math.isnan(tp) else float(tp),
+                trailing_stop_distance=None if math.isnan(trail) else float(trail),
+                timestamp=klines[open_idx].timestamp
+            ))
+
     def _open_position(
         self,
         signal: Signal,
@@ -151,7 +566,7 @@ class Backtester:
         """Open a new position."""
         quantity = 0.01  # Fixed size for simplicity
         
-        exec_price = self._get_execution_price(price, signal.direction)
+        exec_price = self._get_execution_price(price, _SIDE_CODES[signal.direction])
 
         position = Position(
             symbol=signal.symbol,
@@ -166,16 +581,16 @@ class Backtester:
             timestamp=timestamp
         )
 
-        self.positions.append(position)
+        self._add_position(position)
 
-        self.trades.append({
-            "timestamp": timestamp,
-            "type": "OPEN",
-            "side": signal.direction,
-            "price": exec_price,
-            "quantity": quantity,
-            "signal_confidence": signal.confidence
-        })
+        self.trades.append(TradeRecord(
+            timestamp=timestamp,
+            type="OPEN",
+            side=signal.direction,
+            price=exec_price,
+            quantity=quantity,
+            signal_confidence=signal.confidence
+        ))
 
     def _close_position(
         self,
@@ -185,43 +600,46 @@ class Backtester:
         reason: str = "SIGNAL"
     ) -> float:
         """Close a position and return PnL."""
-        exec_price = self._get_execution_price(price, "SELL" if position.side == "LONG" else "BUY")
-        
-        if position.side == "LONG":
-            pnl = (exec_price - position.entry_price) * position.quantity
-        else:
-            pnl = (position.entry_price - exec_price) * position.quantity
-
-        self.trades.append({
-            "timestamp": timestamp,
-            "type": "CLOSE",
-            "side": position.side,
-            "price": exec_price,
-            "quantity": position.quantity,
-            "pnl": pnl,
-            "pnl": pnl,
-            "entry_price": position.entry_price,
-            "reason": reason
-        })
-
-        self.positions.remove(position)
+        sign = _SIDE_CODES[position.side]
+        # Closing is the opposite-side fill
+        exec_price = self._get_execution_price(price, -sign)
+        pnl = sign * (exec_price - position.entry_price) * position.quantity
+
+        self.trades.append(TradeRecord(
+            timestamp=timestamp,
+            type="CLOSE",
+            side=position.side,
+            price=exec_price,
+            quantity=position.quantity,
+            pnl=pnl,
+            entry_price=position.entry_price,
+            reason=reason
+        ))
+
+        self._closed_pnls.append(pnl)
+        self._remove_position()
         return pnl
 
-    def _calculate_equity(self, current_price: float) -> float:
-        """Calculate current equity (balance + unrealized PnL)."""
-        unrealized_pnl = 0.0
+    def _add_position(self, position: Position) -> None:
+        """Track a newly opened position."""
+        signed_qty = position.quantity if position.side == "LONG" else -position.quantity
+        self._net_qty = signed_qty
+        self._net_cost = signed_qty * position.entry_price
+        self.position = position
 
-        for position in self.positions:
-            if position.side == "LONG":
-                unrealized_pnl += (current_price - position.entry_price) * position.quantity
-            else:
-                unrealized_pnl += (position.entry_price - current_price) * position.quantity
+    def _remove_position(self) -> None:
+        """Stop tracking the closed position."""
+        self.position = None
+        self._net_qty = 0.0
+        self._net_cost = 0.0
 
-        return self.balance + unrealized_pnl
+    def _calculate_equity(self, current_price: float) -> float:
+        """Calculate current equity (balance + unrealized PnL)."""
+        return self.balance + current_price * self._net_qty - self._net_cost
 
     def get_results(self) -> dict[str, Any]:
         """Get backtesting results and metrics."""
-        if not self.equity_curve:
+        if not self._eq_len:
             return {
                 "total_return": 0.0,
                 "total_trades": 0,
@@ -232,13 +650,11 @@ class Backtester:
                 "avg_win_loss_ratio": 0.0
             }
 
-        final_equity = self.equity_curve[-1][1]
+        final_equity = self._last_equity
         total_return = (final_equity - self.initial_balance) / self.initial_balance * 100
 
-        # Calculate win rate
-        closed_trades = [t for t in self.trades if t["type"] == "CLOSE"]
-        winning_trades = [t for t in closed_trades if t["pnl"] > 0]
-        win_rate = len(winning_trades) / len(closed_trades) * 100 if closed_trades else 0.0
+        # Calculate win rate and average win / average loss
+        trade_stats = aggregate_trade_stats(self._closed_pnls)
 
         # Calculate max drawdown
         max_drawdown = self._calculate_max_drawdown()
@@ -249,60 +665,20 @@ class Backtester:
         return {
             "total_return": total_return,
             "final_equity": final_equity,
-            "total_trades": len(closed_trades),
-            "win_rate": win_rate,
+            "total_trades": trade_stats.total_trades,
+            "win_rate": trade_stats.win_rate,
             "max_drawdown": max_drawdown,
             "sharpe_ratio": sharpe_ratio,
-            "avg_win_loss_ratio": calculate_average_win_loss_ratio(self.trades),
+            "avg_win_loss_ratio": trade_stats.avg_win_loss_ratio,
             "trades": self.trades
         }
 
     def _calculate_max_drawdown(self) -> float:
         """Calculate maximum drawdown percentage."""
-        if not self.equity_curve:
-            return 0.0
-
-        equities = [e for _, e in self.equity_curve]
-        peak = equities[0]
-        max_dd = 0.0
-
-        for equity in equities:
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak * 100
-            if dd > max_dd:
-                max_dd = dd
-
-        return max_dd
+        return float(self._max_drawdown)
 
     def _calculate_sharpe_ratio(self) -> float:
         """Calculate Sharpe ratio (simplified, assuming daily data)."""
-        if len(self.equity_curve) < 2:
-            return 0.0
-
-        returns = []
-        for i in range(1, len(self.equity_curve)):
-            prev_equity = self.equity_curve[i-1][1]
-            curr_equity = self.equity_curve[i][1]
-            ret = (curr_equity - prev_equity) / prev_equity
-            returns.append(ret)
-
-        if not returns:
-            return 0.0
-
-        mean_return = sum(returns) / len(returns)
-
-        if len(returns) < 2:
-            return 0.0
-
-        variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-        std_dev = variance ** 0.5
-
-        if std_dev == 0:
-            return 0.0
-
-        # Annualize (assuming daily data)
-        # New (Correct for 15m Crypto)
-        sharpe = (mean_return / std_dev) * (35040 ** 0.5)
-        return sharpe
+        # Annualize (Correct for 15m Crypto)
+        return self._returns.sharpe(annualization=SQRT_15M_PERIODS)
 
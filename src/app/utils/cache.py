@@ -0,0 +1,58 @@
+"""Time-bounded memoization for async exchange reads."""
+import time
+import logging
+from functools import wraps
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+def ttl_cache(seconds: float, maxsize: int = 128) -> Callable:
+    """
+    Cache an async function's results for `seconds`, keyed on its arguments.
+
+    Meant for exchange reads that several agents poll with identical params
+    within one tick. Exceptions are not cached. The wrapper exposes
+    `cache_clear(*args)` so writers (e.g. order execution) can invalidate
+    reads that their side effects make stale; on a method, pass `self` to
+    drop only that instance's entries.
+
+    Cached values are returned as-is: every caller within the TTL gets the
+    same object, so results must be treated as read-only.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: dict[Hashable, tuple[float, Any]] = {}
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            entry = cache.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            value = await func(*args, **kwargs)
+
+            if len(cache) >= maxsize:
+                # Drop expired entries first, then the oldest insertion
+                for stale in [k for k, (expiry, _) in cache.items() if expiry <= now]:
+                    del cache[stale]
+                if len(cache) >= maxsize:
+                    del cache[next(iter(cache))]
+            cache[key] = (now + seconds, value)
+            return value
+
+        def cache_clear(*args: Any) -> None:
+            """Drop every entry, or only those whose positional args start with `args`."""
+            if not args:
+                cache.clear()
+                return
+            n = len(args)
+            for key in [k for k in cache if k[0][:n] == args]:
+                del cache[key]
+
+        wrapper.cache_clear = cache_clear  # type: ignore
+        return wrapper
+
+    return decorator
@@ -0,0 +1,37 @@
+"""Per-tick cached wall clock.
+
+The trading loop stamps each graph iteration once via ``begin_tick`` and every
+node/tool running inside that iteration reads the same instant through
+``now()`` instead of hitting the system clock for each object it builds.
+Outside of a tick (tests, scripts) ``now()`` falls back to ``datetime.now()``.
+
+``to_ns`` turns event timestamps into integer nanoseconds so hot loops can
+compare them with int subtraction instead of allocating ``timedelta`` objects.
+"""
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+_now_cache: ContextVar[Optional[datetime]] = ContextVar("_now_cache", default=None)
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def begin_tick(timestamp: Optional[datetime] = None) -> datetime:
+    """Start a new tick and cache its timestamp for the current context."""
+    ts = timestamp or datetime.now()
+    _now_cache.set(ts)
+    return ts
+
+
+def now() -> datetime:
+    """Return the cached tick timestamp, or the current time outside a tick."""
+    return _now_cache.get() or datetime.now()
+
+
+def to_ns(value: datetime | timedelta) -> int:
+    """Exact nanoseconds since the epoch (naive datetimes taken as UTC), or of a timedelta."""
+    if isinstance(value, datetime):
+        value = value - (_EPOCH if value.tzinfo is None else _EPOCH_UTC)
+    return ((value.days * 86_400 + value.seconds) * 1_000_000 + value.microseconds) * 1_000
@@ -0,0 +1,27 @@
+"""Optional Numba JIT support.
+
+Numba is not a hard dependency. When it is missing, ``njit`` degrades to a
+no-op decorator and ``prange`` to ``range`` so kernels run as plain Python/NumPy.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("numba not found. JIT kernels will run as plain Python.")
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        """Fallback for ``numba.njit`` supporting both bare and called forms."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+    prange = range  # type: ignore[assignment]
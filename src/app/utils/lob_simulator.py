@@ -1,10 +1,11 @@
 """Limit order book simulator for testing."""
+from bisect import insort
 from datetime import datetime
-from collections import defaultdict
-from typing import Literal
-import heapq
+from collections import deque
+from typing import Literal, Optional
 
 from app.schemas.events import OrderbookUpdate
+from app.utils.clock import now
 
 
 class LOBSimulator:
@@ -16,10 +17,16 @@ class LOBSimulator:
 
     def __init__(self, symbol: str) -> None:
         self.symbol = symbol
-        # Bids: max heap (negative prices for max heap behavior)
-        self.bids: list[tuple[float, float, int]] = []  # (-price, quantity, timestamp)
-        # Asks: min heap
-        self.asks: list[tuple[float, float, int]] = []  # (price, quantity, timestamp)
+        # Per side: price -> FIFO of resting order quantities (queue position
+        # is the time priority), the aggregated quantity per level, and the
+        # sorted (ascending) level prices. Best bid is the last bid price,
+        # best ask the first ask price.
+        self.bids: dict[float, deque[float]] = {}
+        self.asks: dict[float, deque[float]] = {}
+        self._bid_totals: dict[float, float] = {}
+        self._ask_totals: dict[float, float] = {}
+        self._bid_prices: list[float] = []
+        self._ask_prices: list[float] = []
         self.order_counter = 0
 
     def add_limit_order(
@@ -29,13 +36,20 @@ class LOBSimulator:
         quantity: float
     ) -> None:
         """Add a limit order to the book."""
-        timestamp = self.order_counter
         self.order_counter += 1
 
         if side == "BUY":
-            heapq.heappush(self.bids, (-price, quantity, timestamp))
+            levels, totals, prices = self.bids, self._bid_totals, self._bid_prices
         else:
-            heapq.heappush(self.asks, (price, quantity, timestamp))
+            levels, totals, prices = self.asks, self._ask_totals, self._ask_prices
+
+        level = levels.get(price)
+        if level is None:
+            level = levels[price] = deque()
+            totals[price] = 0.0
+            insort(prices, price)
+        level.append(quantity)
+        totals[price] += quantity
 
     def execute_market_order(
         self,
@@ -57,51 +71,51 @@ class LOBSimulator:
         filled = 0.0
 
         if side == "BUY":
-            # Buy from asks
-            while remaining > 0 and self.asks:
-                ask_price, ask_qty, _ = heapq.heappop(self.asks)
-
-                fill_qty = min(remaining, ask_qty)
-                total_cost += fill_qty * ask_price
-                filled += fill_qty
-                remaining -= fill_qty
-
-                # Put back remaining quantity
-                if ask_qty > fill_qty:
-                    heapq.heappush(self.asks, (ask_price, ask_qty - fill_qty, self.order_counter))
-                    self.order_counter += 1
+            # Buy from asks, lowest price first
+            levels, totals, prices, best = self.asks, self._ask_totals, self._ask_prices, 0
         else:
-            # Sell to bids
-            while remaining > 0 and self.bids:
-                neg_bid_price, bid_qty, _ = heapq.heappop(self.bids)
-                bid_price = -neg_bid_price
+            # Sell to bids, highest price first
+            levels, totals, prices, best = self.bids, self._bid_totals, self._bid_prices, -1
+
+        while remaining > 0 and prices:
+            price = prices[best]
+            level = levels[price]
 
-                fill_qty = min(remaining, bid_qty)
-                total_cost += fill_qty * bid_price
+            while remaining > 0 and level:
+                resting = level[0]
+                fill_qty = min(remaining, resting)
+                total_cost += fill_qty * price
                 filled += fill_qty
                 remaining -= fill_qty
+                totals[price] -= fill_qty
 
-                # Put back remaining quantity
-                if bid_qty > fill_qty:
-                    heapq.heappush(self.bids, (neg_bid_price, bid_qty - fill_qty, self.order_counter))
-                    self.order_counter += 1
+                if fill_qty < resting:
+                    # Partial fill: the order keeps its place in the queue
+                    level[0] = resting - fill_qty
+                else:
+                    level.popleft()
+
+            if not level:
+                del levels[price]
+                del totals[price]
+                prices.pop(best)
 
         avg_price = total_cost / filled if filled > 0 else 0.0
         return avg_price, filled
 
     def get_best_bid(self) -> tuple[float, float] | None:
         """Get best bid (price, quantity)."""
-        if not self.bids:
+        if not self._bid_prices:
             return None
-        neg_price, qty, _ = self.bids[0]
-        return (-neg_price, qty)
+        price = self._bid_prices[-1]
+        return (price, self._bid_totals[price])
 
     def get_best_ask(self) -> tuple[float, float] | None:
         """Get best ask (price, quantity)."""
-        if not self.asks:
+        if not self._ask_prices:
             return None
-        price, qty, _ = self.asks[0]
-        return (price, qty)
+        price = self._ask_prices[0]
+        return (price, self._ask_totals[price])
 
     def get_mid_price(self) -> float | None:
         """Get mid price between best bid and ask."""
@@ -121,41 +135,31 @@ class LOBSimulator:
             return best_ask[0] - best_bid[0]
         return None
 
-    def get_orderbook_snapshot(self, depth: int = 10) -> OrderbookUpdate:
+    def get_orderbook_snapshot(
+        self,
+        depth: int = 10,
+        timestamp: Optional[datetime] = None
+    ) -> OrderbookUpdate:
         """
         Get orderbook snapshot.
 
         Args:
             depth: Number of levels to include on each side
+            timestamp: Snapshot time (e.g. the replayed bar's); defaults to
+                the current tick's cached clock
 
         Returns:
             OrderbookUpdate with current state
         """
-        # Extract top levels without popping
-        bid_levels: list[tuple[float, float]] = []
-        ask_levels: list[tuple[float, float]] = []
-
-        # Aggregate bids by price
-        bid_dict: defaultdict[float, float] = defaultdict(float)
-        for neg_price, qty, _ in self.bids:
-            price = -neg_price
-            bid_dict[price] += qty
-
-        # Sort and take top depth
-        sorted_bids = sorted(bid_dict.items(), reverse=True)[:depth]
-        bid_levels = [(price, qty) for price, qty in sorted_bids]
-
-        # Aggregate asks by price
-        ask_dict: defaultdict[float, float] = defaultdict(float)
-        for price, qty, _ in self.asks:
-            ask_dict[price] += qty
-
-        # Sort and take top depth
-        sorted_asks = sorted(ask_dict.items())[:depth]
-        ask_levels = [(price, qty) for price, qty in sorted_asks]
+        # Levels are kept sorted with running totals, so this is O(depth)
+        bid_totals = self._bid_totals
+        ask_totals = self._ask_totals
+        top_bids = self._bid_prices[max(len(self._bid_prices) - depth, 0):]
+        bid_levels = [(price, bid_totals[price]) for price in reversed(top_bids)]
+        ask_levels = [(price, ask_totals[price]) for price in self._ask_prices[:depth]]
 
         return OrderbookUpdate(
-            timestamp=datetime.now(),
+            timestamp=timestamp or now(),
             symbol=self.symbol,
             bids=bid_levels,
             asks=ask_levels
@@ -165,5 +169,9 @@ class LOBSimulator:
         """Clear the order book."""
         self.bids.clear()
         self.asks.clear()
+        self._bid_totals.clear()
+        self._ask_totals.clear()
+        self._bid_prices.clear()
+        self._ask_prices.clear()
         self.order_counter = 0
 
@@ -1,6 +1,8 @@
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 from app.config import settings
 
@@ -10,6 +12,13 @@ def setup_logging():
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
+    # Skip the per-record stack walk (findCaller) and thread/process lookups;
+    # none of these attributes are used by our formatters
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Root logger configuration
     logger = logging.getLogger()
     logger.setLevel(settings.log_level)
@@ -21,15 +30,16 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # Detailed file formatter (could be JSON in future)
+    # Detailed file formatter (could be JSON in future). No filename/lineno:
+    # the logger name already locates the module, and the caller lookup is
+    # disabled above
     file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
     # File Handler (Rotating)
     file_handler = logging.handlers.RotatingFileHandler(
@@ -38,7 +48,17 @@ def setup_logging():
         backupCount=5
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    # Callers only enqueue the record; formatting and the blocking stdout/file
+    # writes happen on the listener's background thread, off the event loop
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(listener.stop)
 
     # Specific loggers
     logging.getLogger("httpx").setLevel(logging.WARNING)
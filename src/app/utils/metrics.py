@@ -1,36 +1,299 @@
 """Trading performance metrics."""
-from typing import Any
+from typing import Any, Final, NamedTuple, Sequence, Union
 import math
 
+import numpy as np
 
-def calculate_sharpe_ratio(returns: list[float], risk_free_rate: float = 0.0) -> float:
+from app.utils.jit import NUMBA_AVAILABLE, njit
+
+# Annualization factor for daily returns
+SQRT_252: Final[float] = math.sqrt(252)
+
+
+class TradeLog:
+    """
+    Columnar record of closed-trade PnL.
+
+    Trade metrics only ever read the PnL, so it is kept in a contiguous
+    float64 buffer (grown by doubling) instead of one dict per trade.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._pnls = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def pnls(self) -> np.ndarray:
+        """PnL of each closed trade, in order (a view, not a copy)."""
+        return self._pnls[:self.n]
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.n + extra
+        if needed > self._pnls.size:
+            grown = np.empty(max(needed, self._pnls.size * 2), dtype=np.float64)
+            grown[:self.n] = self._pnls[:self.n]
+            self._pnls = grown
+
+    def append(self, pnl: float) -> None:
+        """Record one closed trade."""
+        if self.n == self._pnls.size:
+            self._reserve(1)
+        self._pnls[self.n] = pnl
+        self.n += 1
+
+    def extend(self, pnls: np.ndarray) -> None:
+        """Record a batch of closed trades."""
+        self._reserve(len(pnls))
+        self._pnls[self.n:self.n + len(pnls)] = pnls
+        self.n += len(pnls)
+
+
+# Curve/return metrics accept any float buffer: arrays (e.g. pandas
+# `.to_numpy()`) are used without copying, lists and memoryviews are converted
+FloatSeries = Union[np.ndarray, memoryview, Sequence[float]]
+
+
+def _as_series(values: FloatSeries) -> np.ndarray:
+    """View `values` as float64, dropping NaN gaps (e.g. a leading pct_change NaN)."""
+    a = np.asarray(values, dtype=np.float64)
+    if np.isnan(a).any():
+        a = a[~np.isnan(a)]
+    return a
+
+
+# Trade metrics accept the columnar log, a bare PnL array, or the legacy
+# list of trade dicts with a 'pnl' key
+Trades = Union[TradeLog, np.ndarray, list[dict[str, Any]]]
+
+
+def _trade_pnls(trades: Trades) -> np.ndarray:
+    """PnL column of a trade log (missing 'pnl' counts as 0)."""
+    if isinstance(trades, TradeLog):
+        return trades.pnls
+    if isinstance(trades, np.ndarray):
+        return trades.astype(np.float64, copy=False)
+    return np.fromiter((trade.get('pnl', 0) for trade in trades), dtype=np.float64, count=len(trades))
+
+
+@njit(cache=True)
+def _equity_pass(equity, target_return):
+    """
+    Single sweep over an equity curve for every curve-based metric.
+
+    Tracks the running peak / max drawdown and, for the period returns,
+    Welford's running mean and sum of squared deviations plus the downside
+    (below `target_return`) sum of squares and count. Returns
+    `(max_dd, count, mean, m2, downside_sq, downside_count)`.
+    """
+    peak = equity[0]
+    max_dd = 0.0
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    downside_sq = 0.0
+    downside_count = 0
+
+    for i in range(equity.shape[0]):
+        e = equity[i]
+        if e > peak:
+            peak = e
+        if peak > 0:
+            dd = (peak - e) / peak * 100
+            if dd > max_dd:
+                max_dd = dd
+
+        if i > 0:
+            r = (e - equity[i - 1]) / equity[i - 1]
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+            if r < target_return:
+                d = r - target_return
+                downside_sq += d * d
+                downside_count += 1
+
+    return max_dd, count, mean, m2, downside_sq, downside_count
+
+
+@njit(cache=True, fastmath=True)
+def _return_moments_nb(returns, target_return):
+    """
+    Compiled `_return_moments`: two scalar loops that LLVM can vectorize.
+
+    Per-call metrics on short return windows are dominated by NumPy's
+    per-operation dispatch, so a tight loop wins there.
+    """
+    n = returns.shape[0]
+    total = 0.0
+    for i in range(n):
+        total += returns[i]
+    mean = total / n
+
+    m2 = 0.0
+    downside_sq = 0.0
+    downside_count = 0
+    for i in range(n):
+        d = returns[i] - mean
+        m2 += d * d
+        if returns[i] < target_return:
+            dt = returns[i] - target_return
+            downside_sq += dt * dt
+            downside_count += 1
+
+    return n, mean, m2, downside_sq, downside_count
+
+
+def _return_moments_np(returns: np.ndarray, target_return: float) -> tuple[int, float, float, float, int]:
+    """
+    `(count, mean, m2, downside_sq, downside_count)` of a returns array.
+
+    m2 is the sum of squared deviations from the mean, computed two-pass
+    (centering first avoids the cancellation of E[X^2] - E[X]^2).
+    """
+    n = returns.size
+    mean = returns.sum() / n
+    deviations = returns - mean
+    downside = returns[returns < target_return] - target_return
+    return n, float(mean), float(deviations @ deviations), float(downside @ downside), downside.size
+
+
+# The interpreted fallback of the loop kernel would be far slower than NumPy
+_return_moments = _return_moments_nb if NUMBA_AVAILABLE else _return_moments_np
+
+
+def _sharpe_from_moments(
+    count: int,
+    mean: float,
+    m2: float,
+    risk_free_rate: float,
+    annualization: float = SQRT_252
+) -> float:
+    """Annualized Sharpe from the return count, mean and sum of squared deviations."""
+    if count < 2:
+        return 0.0
+
+    std_dev = math.sqrt(m2 / (count - 1))
+
+    if std_dev == 0:
+        return 0.0
+
+    # Annualize (sqrt of periods per year; daily returns by default)
+    return float((mean - risk_free_rate) / std_dev * annualization)
+
+
+def _sortino_from_moments(
+    count: int,
+    mean: float,
+    downside_sq: float,
+    downside_count: int,
+    risk_free_rate: float,
+    target_return: float,
+    annualization: float = SQRT_252
+) -> float:
+    """Annualized Sortino from the return mean and downside sum of squares."""
+    if count < 2:
+        return 0.0
+
+    if not downside_count:
+        return float('inf') if mean > target_return else 0.0
+
+    downside_std = math.sqrt(downside_sq / downside_count)
+
+    if downside_std == 0:
+        return 0.0
+
+    return float((mean - risk_free_rate) / downside_std * annualization)
+
+
+class RunningMoments:
+    """
+    Streaming return moments for O(1) Sharpe/Sortino.
+
+    Welford's update keeps the mean and the sum of squared deviations (`m2`)
+    without the cancellation of sum(x^2) - n*mean^2; Chan's pairwise formula
+    combines two accumulators (e.g. a batch of returns, or per-symbol runs).
+    Downside squares are taken around `target_return`, as in Sortino.
+    """
+
+    __slots__ = ("target_return", "n", "mean", "m2", "downside_n", "downside_sq")
+
+    def __init__(self, target_return: float = 0.0) -> None:
+        self.target_return = target_return
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside_n = 0
+        self.downside_sq = 0.0
+
+    @classmethod
+    def from_array(cls, returns: np.ndarray, target_return: float = 0.0) -> "RunningMoments":
+        """Accumulator equivalent to `update`-ing each of `returns` in order."""
+        moments = cls(target_return)
+        if returns.size:
+            (moments.n, moments.mean, moments.m2,
+             moments.downside_sq, moments.downside_n) = _return_moments(returns, target_return)
+        return moments
+
+    def update(self, x: float) -> None:
+        """Add one return."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.target_return:
+            d = x - self.target_return
+            self.downside_sq += d * d
+            self.downside_n += 1
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Fold another accumulator (same target) into this one."""
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.downside_n += other.downside_n
+        self.downside_sq += other.downside_sq
+
+    def sharpe(self, risk_free_rate: float = 0.0, annualization: float = SQRT_252) -> float:
+        """Annualized Sharpe ratio of the returns seen so far."""
+        return _sharpe_from_moments(self.n, self.mean, self.m2, risk_free_rate, annualization)
+
+    def sortino(self, risk_free_rate: float = 0.0, annualization: float = SQRT_252) -> float:
+        """Annualized Sortino ratio of the returns seen so far."""
+        return _sortino_from_moments(
+            self.n, self.mean, self.downside_sq, self.downside_n,
+            risk_free_rate, self.target_return, annualization
+        )
+
+
+def calculate_sharpe_ratio(returns: FloatSeries, risk_free_rate: float = 0.0) -> float:
     """
     Calculate Sharpe ratio.
 
     Args:
-        returns: List of period returns
+        returns: Period returns (list or array; NaNs are skipped)
         risk_free_rate: Risk-free rate (annualized)
 
     Returns:
         Sharpe ratio
     """
-    if not returns or len(returns) < 2:
+    a = _as_series(returns)
+    if a.size < 2:
         return 0.0
 
-    mean_return = sum(returns) / len(returns)
-    variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-    std_dev = math.sqrt(variance)
-
-    if std_dev == 0:
-        return 0.0
-
-    # Annualize assuming daily returns
-    sharpe = ((mean_return - risk_free_rate) / std_dev) * math.sqrt(252)
-    return sharpe
+    n, mean_return, m2, _, _ = _return_moments(a, 0.0)
+    return _sharpe_from_moments(n, mean_return, m2, risk_free_rate)
 
 
 def calculate_sortino_ratio(
-    returns: list[float],
+    returns: FloatSeries,
     risk_free_rate: float = 0.0,
     target_return: float = 0.0
 ) -> float:
@@ -38,58 +301,236 @@ def calculate_sortino_ratio(
     Calculate Sortino ratio (like Sharpe but only penalizes downside volatility).
 
     Args:
-        returns: List of period returns
+        returns: Period returns (list or array; NaNs are skipped)
         risk_free_rate: Risk-free rate
         target_return: Target/minimum acceptable return
 
     Returns:
         Sortino ratio
     """
-    if not returns or len(returns) < 2:
+    a = _as_series(returns)
+    if a.size < 2:
         return 0.0
 
-    mean_return = sum(returns) / len(returns)
+    n, mean_return, _, downside_sq, downside_count = _return_moments(a, target_return)
+    return _sortino_from_moments(
+        n, mean_return, downside_sq, downside_count, risk_free_rate, target_return
+    )
 
-    # Calculate downside deviation
-    downside_returns = [r - target_return for r in returns if r < target_return]
 
-    if not downside_returns:
-        return float('inf') if mean_return > target_return else 0.0
+def batch_sharpe(returns: np.ndarray, risk_free_rate: float = 0.0) -> np.ndarray:
+    """
+    Calculate the Sharpe ratio of each row of a (symbols x periods) matrix.
 
-    downside_variance = sum(r ** 2 for r in downside_returns) / len(downside_returns)
-    downside_std = math.sqrt(downside_variance)
+    Equivalent to `calculate_sharpe_ratio` per row, in a few whole-matrix
+    reductions instead of one call per symbol.
 
-    if downside_std == 0:
-        return 0.0
+    Args:
+        returns: 2D array of period returns, one row per symbol
+        risk_free_rate: Risk-free rate
+
+    Returns:
+        Array of Sharpe ratios, one per row
+    """
+    a = np.asarray(returns, dtype=np.float64)
+    k, n = a.shape
+    if n < 2:
+        return np.zeros(k)
+
+    means = a.mean(axis=1)
+    centered = a - means[:, None]
+    stds = np.sqrt(np.einsum('kn,kn->k', centered, centered) / (n - 1))
+    sharpe = np.zeros(k)
+    np.divide((means - risk_free_rate) * SQRT_252, stds, out=sharpe, where=stds > 0)
+    return sharpe
 
-    sortino = ((mean_return - risk_free_rate) / downside_std) * math.sqrt(252)
+
+def batch_sortino(
+    returns: np.ndarray,
+    risk_free_rate: float = 0.0,
+    target_return: float = 0.0
+) -> np.ndarray:
+    """
+    Calculate the Sortino ratio of each row of a (symbols x periods) matrix.
+
+    Equivalent to `calculate_sortino_ratio` per row.
+
+    Args:
+        returns: 2D array of period returns, one row per symbol
+        risk_free_rate: Risk-free rate
+        target_return: Target/minimum acceptable return
+
+    Returns:
+        Array of Sortino ratios, one per row
+    """
+    a = np.asarray(returns, dtype=np.float64)
+    k, n = a.shape
+    if n < 2:
+        return np.zeros(k)
+
+    means = a.mean(axis=1)
+    below = a < target_return
+    shortfall = np.where(below, a - target_return, 0.0)
+    downside_counts = below.sum(axis=1)
+    downside_sq = np.einsum('kn,kn->k', shortfall, shortfall)
+
+    # Rows without any downside: inf if above target, else 0 (as calculate_sortino_ratio)
+    sortino = np.where(means > target_return, np.inf, 0.0)
+    has_downside = downside_counts > 0
+    downside_std = np.sqrt(np.divide(
+        downside_sq, downside_counts, out=np.zeros(k), where=has_downside
+    ))
+    sortino[has_downside] = 0.0
+    np.divide(
+        (means - risk_free_rate) * SQRT_252, downside_std,
+        out=sortino, where=has_downside & (downside_std > 0)
+    )
     return sortino
 
 
-def calculate_max_drawdown(equity_curve: list[float]) -> float:
+# Relative variance below which a rolling window is treated as flat
+_FLAT_VARIANCE_RTOL = 1e-12
+
+
+@njit(cache=True)
+def _rolling_sharpe_nb(returns, window, risk_free_rate, annualization):
+    """
+    Sliding-window Sharpe in O(1) per step.
+
+    Keeps the window mean and sum of squared deviations, updated by
+    swapping the oldest return for the newest (Welford's add/remove form,
+    which avoids the cancellation of running sum and sum of squares).
+    Windows whose variance is within rounding drift of zero relative to
+    the series' overall scale count as flat.
+    """
+    n = returns.shape[0]
+    out = np.full(n, np.nan)
+    mean = 0.0
+    m2 = 0.0
+
+    scale = 0.0
+    for i in range(n):
+        scale += returns[i] * returns[i]
+    flat_tol = _FLAT_VARIANCE_RTOL * scale / max(n, 1)
+
+    for i in range(n):
+        x = returns[i]
+        if i < window:
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+        else:
+            old = returns[i - window]
+            new_mean = mean + (x - old) / window
+            m2 += (x - old) * (x - new_mean + old - mean)
+            mean = new_mean
+
+        if i >= window - 1:
+            variance = m2 / (window - 1)
+            if variance > flat_tol:
+                out[i] = (mean - risk_free_rate) / np.sqrt(variance) * annualization
+            else:
+                out[i] = 0.0
+
+    return out
+
+
+def _rolling_sharpe_np(
+    returns: np.ndarray,
+    window: int,
+    risk_free_rate: float,
+    annualization: float
+) -> np.ndarray:
+    """Vectorized (O(N*window)) equivalent of `_rolling_sharpe_nb`."""
+    out = np.full(returns.size, np.nan)
+    if returns.size < window:
+        return out
+
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window)
+    means = windows.mean(axis=1)
+    stds = windows.std(axis=1, ddof=1)
+    flat_tol = _FLAT_VARIANCE_RTOL * float(returns @ returns) / returns.size
+    sharpe = np.zeros_like(means)
+    np.divide((means - risk_free_rate) * annualization, stds, out=sharpe, where=stds * stds > flat_tol)
+    out[window - 1:] = sharpe
+    return out
+
+
+def rolling_sharpe(
+    returns: FloatSeries,
+    window: int,
+    risk_free_rate: float = 0.0,
+    annualization: float = SQRT_252
+) -> np.ndarray:
+    """
+    Calculate the Sharpe ratio of every trailing `window` of returns.
+
+    Args:
+        returns: Period returns (list or array; NaNs are skipped)
+        window: Number of returns per window (at least 2)
+        risk_free_rate: Risk-free rate
+        annualization: Square root of periods per year
+
+    Returns:
+        Array aligned with the returns; NaN until the first full window and
+        at NaN inputs, 0.0 for flat windows
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+
+    a = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(a)
+    kernel = _rolling_sharpe_nb if NUMBA_AVAILABLE else _rolling_sharpe_np
+    if valid.all():
+        return kernel(a, window, risk_free_rate, annualization)
+
+    # Windows span the last `window` valid returns; results are scattered
+    # back to their input positions so gaps do not shift the output
+    out = np.full(a.size, np.nan)
+    out[valid] = kernel(a[valid], window, risk_free_rate, annualization)
+    return out
+
+
+@njit(cache=True)
+def _max_drawdown_nb(equity):
+    """Running-peak max drawdown (%) in one scan; 0 while the peak is not positive."""
+    peak = equity[0]
+    max_dd = 0.0
+    for i in range(equity.shape[0]):
+        e = equity[i]
+        if e > peak:
+            peak = e
+        elif peak > 0:
+            dd = (peak - e) / peak * 100
+            if dd > max_dd:
+                max_dd = dd
+    return max_dd
+
+
+def calculate_max_drawdown(equity_curve: FloatSeries) -> float:
     """
     Calculate maximum drawdown percentage.
 
     Args:
-        equity_curve: List of equity values over time
+        equity_curve: Equity values over time (list or array; NaNs are skipped)
 
     Returns:
         Maximum drawdown as percentage
     """
-    if not equity_curve:
+    equity = _as_series(equity_curve)
+    if not equity.size:
         return 0.0
 
-    peak = equity_curve[0]
-    max_dd = 0.0
-
-    for equity in equity_curve:
-        if equity > peak:
-            peak = equity
-        dd = (peak - equity) / peak * 100 if peak > 0 else 0.0
-        if dd > max_dd:
-            max_dd = dd
+    if NUMBA_AVAILABLE:
+        # Compiled scan, without the three curve-sized temporaries below
+        return float(_max_drawdown_nb(equity))
 
-    return max_dd
+    peaks = np.maximum.accumulate(equity)
+    # Drawdown is undefined (taken as 0) while the running peak is not positive
+    drawdowns = np.divide(
+        (peaks - equity) * 100, peaks, out=np.zeros_like(equity), where=peaks > 0
+    )
+    return float(drawdowns.max())
 
 
 def calculate_calmar_ratio(
@@ -115,76 +556,91 @@ def calculate_calmar_ratio(
     return annualized_return / max_drawdown
 
 
-def calculate_win_rate(trades: list[dict[str, Any]]) -> float:
+class TradeStats(NamedTuple):
+    """Trade-log statistics computed together by `aggregate_trade_stats`."""
+
+    total_trades: int
+    win_rate: float
+    profit_factor: float
+    avg_win_loss_ratio: float
+
+
+def aggregate_trade_stats(trades: Trades) -> TradeStats:
     """
-    Calculate win rate from trade history.
+    Compute every trade-based metric from a single read of the trade log.
 
     Args:
-        trades: List of trade dictionaries with 'pnl' key
+        trades: TradeLog, PnL array or list of trade dicts with 'pnl' key
 
     Returns:
-        Win rate percentage
+        TradeStats with win rate (%), profit factor and average win / average loss
     """
-    if not trades:
-        return 0.0
+    pnls = _trade_pnls(trades)
+    if not pnls.size:
+        return TradeStats(0, 0.0, 0.0, 0.0)
 
-    winning_trades = sum(1 for trade in trades if trade.get('pnl', 0) > 0)
-    return winning_trades / len(trades) * 100
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls < 0]
 
+    win_rate = wins.size / pnls.size * 100
 
-def calculate_profit_factor(trades: list[dict[str, Any]]) -> float:
+    gross_profit = float(wins.sum())
+    gross_loss = -float(losses.sum())
+    if gross_loss == 0:
+        profit_factor = float('inf') if gross_profit > 0 else 0.0
+    else:
+        profit_factor = gross_profit / gross_loss
+
+    if not wins.size or not losses.size:
+        avg_win_loss_ratio = 0.0
+    else:
+        avg_win_loss_ratio = (gross_profit / wins.size) / (gross_loss / losses.size)
+
+    return TradeStats(pnls.size, win_rate, profit_factor, avg_win_loss_ratio)
+
+
+def calculate_win_rate(trades: Trades) -> float:
     """
-    Calculate profit factor (gross profit / gross loss).
+    Calculate win rate from trade history.
 
     Args:
-        trades: List of trade dictionaries with 'pnl' key
+        trades: TradeLog, PnL array or list of trade dicts with 'pnl' key
 
     Returns:
-        Profit factor
+        Win rate percentage
     """
-    if not trades:
-        return 0.0
+    return aggregate_trade_stats(trades).win_rate
 
-    gross_profit = sum(trade.get('pnl', 0) for trade in trades if trade.get('pnl', 0) > 0)
-    gross_loss = abs(sum(trade.get('pnl', 0) for trade in trades if trade.get('pnl', 0) < 0))
 
-    if gross_loss == 0:
-        return float('inf') if gross_profit > 0 else 0.0
+def calculate_profit_factor(trades: Trades) -> float:
+    """
+    Calculate profit factor (gross profit / gross loss).
 
-    return gross_profit / gross_loss
+    Args:
+        trades: TradeLog, PnL array or list of trade dicts with 'pnl' key
 
+    Returns:
+        Profit factor
+    """
+    return aggregate_trade_stats(trades).profit_factor
 
-def calculate_average_win_loss_ratio(trades: list[dict[str, Any]]) -> float:
+
+def calculate_average_win_loss_ratio(trades: Trades) -> float:
     """
     Calculate average win / average loss ratio.
 
     Args:
-        trades: List of trade dictionaries with 'pnl' key
+        trades: TradeLog, PnL array or list of trade dicts with 'pnl' key
 
     Returns:
         Win/Loss ratio
     """
-    if not trades:
-        return 0.0
-
-    winning_trades = [trade.get('pnl', 0) for trade in trades if trade.get('pnl', 0) > 0]
-    losing_trades = [abs(trade.get('pnl', 0)) for trade in trades if trade.get('pnl', 0) < 0]
-
-    if not winning_trades or not losing_trades:
-        return 0.0
-
-    avg_win = sum(winning_trades) / len(winning_trades)
-    avg_loss = sum(losing_trades) / len(losing_trades)
-
-    if avg_loss == 0:
-        return float('inf')
-
-    return avg_win / avg_loss
+    return aggregate_trade_stats(trades).avg_win_loss_ratio
 
 
 def generate_performance_report(
-    equity_curve: list[float],
-    trades: list[dict[str, Any]],
+    equity_curve: FloatSeries,
+    trades: Trades,
     initial_balance: float,
     years: float = 1.0
 ) -> dict[str, float]:
@@ -192,38 +648,44 @@ def generate_performance_report(
     Generate comprehensive performance report.
 
     Args:
-        equity_curve: List of equity values
-        trades: List of trade dictionaries
+        equity_curve: Equity values (list or array; NaNs are skipped)
+        trades: TradeLog, PnL array or list of trade dicts with 'pnl' key
         initial_balance: Starting balance
         years: Period length in years
 
     Returns:
         Dictionary of performance metrics
     """
-    if not equity_curve:
+    equity = _as_series(equity_curve)
+    if not equity.size:
         return {}
 
-    final_equity = equity_curve[-1]
+    final_equity = float(equity[-1])
     total_return = (final_equity - initial_balance) / initial_balance * 100
 
-    # Calculate returns
-    returns = []
-    for i in range(1, len(equity_curve)):
-        ret = (equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1]
-        returns.append(ret)
+    if NUMBA_AVAILABLE:
+        # Drawdown and return moments in one compiled pass over the curve
+        max_dd, count, mean, m2, downside_sq, downside_count = _equity_pass(equity, 0.0)
+        max_dd = float(max_dd)
+    else:
+        returns = np.diff(equity) / equity[:-1]
+        max_dd = calculate_max_drawdown(equity)
+        count, mean, m2, downside_sq, downside_count = (
+            _return_moments(returns, 0.0) if returns.size else (0, 0.0, 0.0, 0.0, 0)
+        )
 
-    max_dd = calculate_max_drawdown(equity_curve)
+    trade_stats = aggregate_trade_stats(trades)
 
     return {
         "total_return_pct": total_return,
         "final_equity": final_equity,
         "max_drawdown_pct": max_dd,
-        "sharpe_ratio": calculate_sharpe_ratio(returns),
-        "sortino_ratio": calculate_sortino_ratio(returns),
+        "sharpe_ratio": _sharpe_from_moments(count, mean, m2, 0.0),
+        "sortino_ratio": _sortino_from_moments(count, mean, downside_sq, downside_count, 0.0, 0.0),
         "calmar_ratio": calculate_calmar_ratio(total_return, max_dd, years),
-        "total_trades": len(trades),
-        "win_rate_pct": calculate_win_rate(trades),
-        "profit_factor": calculate_profit_factor(trades),
-        "avg_win_loss_ratio": calculate_average_win_loss_ratio(trades)
+        "total_trades": trade_stats.total_trades,
+        "win_rate_pct": trade_stats.win_rate,
+        "profit_factor": trade_stats.profit_factor,
+        "avg_win_loss_ratio": trade_stats.avg_win_loss_ratio
     }
 
@@ -1,4 +1,6 @@
 """Persistence utility for saving and loading application state."""
+import asyncio
+import atexit
 import json
 import os
 import logging
@@ -7,14 +9,47 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=_ORJSON_OPTIONS, default=str)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=2, default=str).encode()
+
+    _loads = json.loads
+
+# How long state may sit dirty in memory before it is written
+FLUSH_INTERVAL_SECONDS = 0.5
+
 class StateManager:
-    """Manages state persistence to disk."""
+    """
+    Manages state persistence to disk.
 
-    def __init__(self, data_dir: Optional[str] = None) -> None:
+    Inside an event loop, saves are coalesced: the latest data per key is
+    kept in memory and written by a background task at most once per
+    `flush_interval` (off the loop, in a worker thread). Outside a loop, or
+    via `flush()` and at interpreter exit, pending state is written
+    synchronously.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None, flush_interval: float = FLUSH_INTERVAL_SECONDS) -> None:
         if data_dir is None:
             data_dir = os.getenv("DATA_DIR", "data")
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        # Latest unsaved data per key
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        # Batch currently being written by the flusher
+        self._writing: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        atexit.register(self.flush)
 
     def _get_path(self, key: str) -> Path:
         """Get file path for a given key, sanitizing special characters."""
@@ -24,18 +59,57 @@ class StateManager:
     def save_state(self, key: str, data: Dict[str, Any]) -> bool:
         """
         Save state to disk as JSON.
-        
+
+        Within a running event loop this only marks `key` dirty and returns
+        True; the background flusher writes it. `data` is serialized at
+        flush time, so callers should pass a fresh snapshot (e.g. `to_dict()`).
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._dirty.pop(key, None)
+            return self._write(key, data)
+
+        self._dirty[key] = data
+        task = self._flush_task
+        # A task left pending on a closed loop never finishes; start a new one
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_loop())
+        return True
+
+    async def _flush_loop(self) -> None:
+        """Write dirty keys every `flush_interval` until nothing is pending."""
+        while self._dirty:
+            await asyncio.sleep(self.flush_interval)
+            self._writing, self._dirty = self._dirty, {}
+            try:
+                await asyncio.to_thread(self._write_all, self._writing)
+            finally:
+                self._writing = {}
+
+    def _write_all(self, pending: Dict[str, Dict[str, Any]]) -> None:
+        for key, data in pending.items():
+            self._write(key, data)
+
+    def flush(self) -> None:
+        """Synchronously write all pending state."""
+        pending, self._dirty = self._dirty, {}
+        self._write_all(pending)
+
+    def _write(self, key: str, data: Dict[str, Any]) -> bool:
+        """
+        Write one key to disk.
+
         Uses atomic write pattern (write to temp, then rename) to prevent corruption.
         """
         file_path = self._get_path(key)
         temp_path = file_path.with_suffix(".tmp")
         
         try:
-            with open(temp_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
+            temp_path.write_bytes(_dumps(data))
+
             # Atomic rename
-            temp_path.replace(file_path)
+            os.replace(temp_path, file_path)
             return True
             
         except Exception as e:
@@ -48,21 +122,25 @@ class StateManager:
             return False
 
     def load_state(self, key: str) -> Optional[Dict[str, Any]]:
-        """Load state from disk."""
+        """Load state from disk (or the pending, not yet flushed, save)."""
+        pending = self._dirty.get(key) or self._writing.get(key)
+        if pending is not None:
+            return pending
+
         file_path = self._get_path(key)
         
         if not file_path.exists():
             return None
             
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return _loads(file_path.read_bytes())
         except Exception as e:
             logger.error(f"Failed to load state for {key}: {e}")
             return None
             
     def clear_state(self, key: str) -> bool:
         """Delete state file."""
+        self._dirty.pop(key, None)
         file_path = self._get_path(key)
         if file_path.exists():
             try:
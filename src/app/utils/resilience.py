@@ -13,22 +13,37 @@ class CircuitBreakerOpenException(Exception):
     pass
 
 class CircuitBreaker:
-    """Simple circuit breaker pattern."""
+    """
+    Simple circuit breaker pattern.
+
+    Breakers are only touched from the event loop thread, and none of these
+    methods await, so each update is atomic with respect to other tasks
+    without a lock. While open, the breaker keeps the monotonic deadline
+    until which calls are rejected, so `check()` on the closed fast path is a
+    single attribute test and never reads the clock.
+    """
+
+    __slots__ = ("failure_threshold", "recovery_timeout", "failures", "last_failure_time", "state", "_open_until")
+
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.failures = 0
         self.last_failure_time = 0.0
         self.state = "CLOSED"  # CLOSED, OPEN
+        # Monotonic time until which calls are rejected; 0.0 while closed
+        self._open_until = 0.0
 
     def record_failure(self):
         self.failures += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
         logger.warning(f"Circuit Breaker recorded failure {self.failures}/{self.failure_threshold}")
         if self.failures >= self.failure_threshold:
             if self.state == "CLOSED":
                 logger.critical(f"Circuit Breaker OPENED after {self.failures} failures")
                 self.state = "OPEN"
+            # A failed trial call re-arms the full recovery window
+            self._open_until = self.last_failure_time + self.recovery_timeout
 
     def record_success(self):
         if self.state == "OPEN":
@@ -38,15 +53,15 @@ class CircuitBreaker:
             
         self.state = "CLOSED"
         self.failures = 0
+        self._open_until = 0.0
 
     def check(self):
-        if self.state == "OPEN":
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                # Allow one trial (in a real half-open impl, we'd limit concurrency here)
-                pass
-            else:
-                remaining = int(self.recovery_timeout - (time.time() - self.last_failure_time))
-                raise CircuitBreakerOpenException(f"Circuit breaker is OPEN. Retrying in {remaining}s")
+        if self._open_until:
+            remaining = self._open_until - time.monotonic()
+            # Once the window has passed, allow trial calls (in a real
+            # half-open impl, we'd limit concurrency here)
+            if remaining >= 0:
+                raise CircuitBreakerOpenException(f"Circuit breaker is OPEN. Retrying in {int(remaining)}s")
 
 # Global circuit breaker instance for API calls
 api_circuit_breaker = CircuitBreaker()
@@ -100,27 +115,23 @@ def api_retry_policy():
     )
 
     def decorator(func: Callable) -> Callable:
+        # Apply the retry logic once, at decoration time, rather than
+        # re-wrapping a fresh closure on every call
+        execute_with_retries = tenacity_decorator(func)
+
         # Wrap the function to check circuit breaker first AND record success
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # 1. Check Circuit Breaker BEFORE even trying
             api_circuit_breaker.check()
-            
+
             # 2. Execute with Retry Logic
-            # Note: We need to apply the tenacity retry logic to the actual execution
-            # But we can't just call func() because we want to retry if func() fails.
-            # So we wrap the execution in the tenacity_decorator
-            
-            @tenacity_decorator
-            async def _execute_with_retries():
-                return await func(*args, **kwargs)
-                
-            result = await _execute_with_retries()
-            
+            result = await execute_with_retries(*args, **kwargs)
+
             # 3. If we get here, it was successful
             api_circuit_breaker.record_success()
             return result
-            
+
         return wrapper
-        
+
     return decorator
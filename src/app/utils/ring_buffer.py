@@ -0,0 +1,63 @@
+"""Fixed-size float ring buffer for streaming indicator inputs."""
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Bounded float64 FIFO with a deque-like interface.
+
+    Each value is written twice, at `i` and `i + maxlen`, so the window in
+    insertion order is always one contiguous slice: `view()` hands
+    indicators an array without copying, and `append` stays O(1).
+    """
+
+    __slots__ = ("maxlen", "_data", "_end", "_size")
+
+    def __init__(self, maxlen: int, values: Iterable[float] = ()) -> None:
+        self.maxlen = maxlen
+        self._data = np.zeros(2 * maxlen, dtype=np.float64)
+        self._end = 0
+        self._size = 0
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.view().tolist())
+
+    def view(self) -> np.ndarray:
+        """Oldest-to-newest window (a view, valid until the next write)."""
+        start = (self._end - self._size) % self.maxlen
+        return self._data[start:start + self._size]
+
+    def append(self, value: float) -> None:
+        """Add one value, dropping the oldest when full."""
+        end = self._end
+        self._data[end] = self._data[end + self.maxlen] = value
+        self._end = (end + 1) % self.maxlen
+        if self._size < self.maxlen:
+            self._size += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Add a batch of values in one vectorized write."""
+        values = np.fromiter(values, dtype=np.float64) if not isinstance(values, np.ndarray) \
+            else values.astype(np.float64, copy=False)
+        n = values.size
+        if n == 0:
+            return
+        if n >= self.maxlen:
+            window = values[-self.maxlen:]
+            self._data[:self.maxlen] = window
+            self._data[self.maxlen:] = window
+            self._end = 0
+            self._size = self.maxlen
+            return
+
+        idx = (self._end + np.arange(n)) % self.maxlen
+        self._data[idx] = values
+        self._data[idx + self.maxlen] = values
+        self._end = (self._end + n) % self.maxlen
+        self._size = min(self._size + n, self.maxlen)
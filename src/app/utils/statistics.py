@@ -1,7 +1,10 @@
 """Statistical utilities for trading (ADF, Hurst, GARCH)."""
 import numpy as np
 import logging
-from typing import Optional, Tuple, Literal
+from functools import lru_cache
+from typing import Hashable, Optional, Tuple, Literal
+
+from app.utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,36 @@ except ImportError:
     logger.warning("arch package not found. GARCH volatility disabled.")
 
 
+# GARCH(1,1) is re-fitted every this many forecasts per cache key; calls in
+# between reuse the fitted parameters and only rerun the variance recursion
+GARCH_REFIT_INTERVAL = 50
+# cache key -> ([mu, omega, alpha, beta] of the last fit, forecasts since)
+_garch_cache: dict[Hashable, tuple[np.ndarray, int]] = {}
+
+# Span of the EWMA volatility estimate
+EWMA_SPAN = 20
+
+# Lags for the Hurst estimate and their logs (the regression x-axis)
+_HURST_LAGS = np.arange(2, 20)
+_LOG_HURST_LAGS = np.log(_HURST_LAGS)
+
+
+@lru_cache(maxsize=128)
+def _adf_p_value(series: bytes) -> float:
+    """
+    ADF p-value of a float64 series (passed as bytes so it can be cached;
+    the same window is often tested again before a new bar arrives).
+
+    Uses a fixed lag from Schwert's rule instead of the AIC lag search,
+    which fits one regression per candidate lag.
+    """
+    ts = np.frombuffer(series, dtype=np.float64)
+    maxlag = int(12 * (ts.size / 100) ** 0.25)
+    # adfuller returns: adf, pvalue, usedlag, nobs, critical values
+    result = adfuller(ts, maxlag=maxlag, regression='c', autolag=None)
+    return float(result[1])
+
+
 def check_stationarity(timeseries: list[float], max_p_value: float = 0.05) -> Tuple[bool, float]:
     """
     Perform Augmented Dickey-Fuller test to check for stationarity.
@@ -29,12 +62,15 @@ def check_stationarity(timeseries: list[float], max_p_value: float = 0.05) -> Tu
     if not STATSMODELS_AVAILABLE or len(timeseries) < 30:
         return False, 1.0
 
+    ts = np.asarray(timeseries, dtype=np.float64)
+    # A flat series makes the regression degenerate
+    if ts.std() < 1e-12:
+        return False, 1.0
+
     try:
-        # adfuller returns: adf, pvalue, usedlag, nobs, critical values, icbest
-        result = adfuller(timeseries)
-        p_value = result[1]
+        p_value = _adf_p_value(ts.tobytes())
         is_stationary = p_value < max_p_value
-        return is_stationary, float(p_value)
+        return is_stationary, p_value
     except Exception as e:
         logger.error(f"ADF Test Error: {e}")
         return False, 1.0
@@ -51,11 +87,22 @@ def calculate_hurst(timeseries: list[float]) -> float:
         return 0.5
 
     try:
-        lags = range(2, 20)
-        tau = [np.sqrt(np.std(np.subtract(timeseries[lag:], timeseries[:-lag]))) for lag in lags]
-        
+        ts = np.asarray(timeseries, dtype=np.float64)
+        n = ts.size
+        # All lagged differences at once: row k holds ts[i + lag_k] - ts[i],
+        # masked to the n - lag_k valid positions
+        idx = np.arange(n)
+        ahead = idx + _HURST_LAGS[:, None]
+        valid = ahead < n
+        diffs = np.where(valid, ts[np.minimum(ahead, n - 1)] - ts, 0.0)
+        counts = n - _HURST_LAGS
+        means = diffs.sum(axis=1) / counts
+        centered = np.where(valid, diffs - means[:, None], 0.0)
+        std = np.sqrt(np.einsum('ij,ij->i', centered, centered) / counts)
+        tau = np.sqrt(std)
+
         # Polyfit log(lags) vs log(tau) gives Hurst
-        poly = np.polyfit(np.log(lags), np.log(tau), 1)
+        poly = np.polyfit(_LOG_HURST_LAGS, np.log(tau), 1)
         return float(poly[0]) * 2.0 
         # Note: various implementations exist. This is a simplified R/S proxy.
         # A more robust one might be needed if critical.
@@ -64,25 +111,67 @@ def calculate_hurst(timeseries: list[float]) -> float:
         return 0.5
 
 
-def forecast_volatility(returns: list[float], method: Literal['GARCH', 'EWMA'] = 'GARCH') -> Optional[float]:
+@njit(cache=True)
+def _garch_next_variance(resid, omega, alpha, beta):
+    """One-step-ahead GARCH(1,1) variance, backcast from the mean squared residual."""
+    sigma2 = 0.0
+    for i in range(resid.shape[0]):
+        sigma2 += resid[i] * resid[i]
+    sigma2 /= resid.shape[0]
+
+    for i in range(resid.shape[0]):
+        sigma2 = omega + alpha * resid[i] * resid[i] + beta * sigma2
+    return sigma2
+
+
+def _ewma_volatility(returns: np.ndarray, span: int = EWMA_SPAN) -> float:
+    """Exponentially weighted (zero-mean) volatility, newest return weighted most."""
+    decay = 1.0 - 2.0 / (span + 1)
+    weights = decay ** np.arange(returns.size - 1, -1, -1)
+    return float(np.sqrt((weights * returns * returns).sum() / weights.sum()))
+
+
+def forecast_volatility(
+    returns: list[float],
+    method: Literal['GARCH', 'EWMA'] = 'GARCH',
+    cache_key: Hashable = None
+) -> Optional[float]:
     """
     Forecast next period volatility.
     Input 'returns' should be percentage returns (e.g., 0.01 for 1%).
+
+    GARCH parameters are cached per `cache_key` (e.g. the symbol) and only
+    re-fitted every GARCH_REFIT_INTERVAL calls. Without a key every call fits.
     """
     if not returns or len(returns) < 30:
         return None
 
+    if method == 'EWMA':
+        return _ewma_volatility(np.asarray(returns, dtype=np.float64))
+
     # Handle GARCH
     if method == 'GARCH' and ARCH_AVAILABLE:
         try:
             # Rescale returns to be more friendly for optimizers (often expects integers like 1.0 for 1%)
             # But arch_model usually handles it. If returns are very small (0.0001), optimization fails.
             # Let's upscale by 100 for calculation then downscale.
-            scaled_returns = [r * 100.0 for r in returns]
-            
+            scaled_returns = np.asarray(returns, dtype=np.float64) * 100.0
+
+            cached = _garch_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None and cached[1] < GARCH_REFIT_INTERVAL:
+                params, age = cached
+                _garch_cache[cache_key] = (params, age + 1)
+                mu, omega, alpha, beta = params
+                next_var_scaled = _garch_next_variance(scaled_returns - mu, omega, alpha, beta)
+                return float(np.sqrt(next_var_scaled)) / 100.0
+
             am = arch_model(scaled_returns, vol='Garch', p=1, q=1, rescale=False)
             res = am.fit(disp='off', show_warning=False)
-            
+            if cache_key is not None:
+                _garch_cache[cache_key] = (
+                    res.params[['mu', 'omega', 'alpha[1]', 'beta[1]']].to_numpy(dtype=np.float64), 1
+                )
+
             # Forecast next volatility
             forecast = res.forecast(horizon=1)
             next_vol_scaled = np.sqrt(forecast.variance.values[-1, :])[0]
@@ -0,0 +1,122 @@
+"""Test backtesting engine."""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import app.utils.backtester as backtester
+from app.utils.backtester import Backtester
+from app.schemas.events import KlineEvent
+from app.schemas.models import Signal
+
+
+def _random_session(n: int = 500, seed: int = 7) -> tuple[list[KlineEvent], list[Signal | None]]:
+    """Random-walk candles with a mix of signals, stops, targets and trailing stops."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 100.0
+    klines: list[KlineEvent] = []
+    signals: list[Signal | None] = []
+
+    for i in range(n):
+        open_p = price
+        price = max(1.0, price + rng.gauss(0, 1))
+        klines.append(KlineEvent(
+            timestamp=start + timedelta(minutes=15 * i),
+            symbol="BTC/USD",
+            interval="15m",
+            open=open_p,
+            high=max(open_p, price) + abs(rng.gauss(0, 0.5)),
+            low=min(open_p, price) - abs(rng.gauss(0, 0.5)),
+            close=price,
+            volume=1.0
+        ))
+
+        if rng.random() < 0.5:
+            signals.append(None)
+            continue
+        direction = rng.choice(["LONG", "SHORT", "NEUTRAL"])
+        sign = 1 if direction == "LONG" else -1
+        directional = direction != "NEUTRAL"
+        signals.append(Signal(
+            timestamp=klines[-1].timestamp,
+            symbol="BTC/USD",
+            strategy="test",
+            direction=direction,
+            strength=1.0,
+            confidence=rng.random(),
+            stop_loss=price - 2 * sign if directional else None,
+            take_profit=rng.choice([None, price + 3 * sign]) if directional else None,
+            trailing_stop_distance=rng.choice([None, 1.5]) if directional else None
+        ))
+
+    return klines, signals
+
+
+def test_run_matches_process_signal(monkeypatch):
+    """The compiled batch replay must reproduce the per-bar path exactly."""
+    # Force the kernel path so it is checked even where numba is missing
+    monkeypatch.setattr(backtester, "NUMBA_AVAILABLE", True)
+    klines, signals = _random_session()
+
+    stepwise = Backtester()
+    for kline, signal in zip(klines, signals):
+        if signal is not None:
+            stepwise.process_signal(signal, kline.close, kline.high, kline.low, kline.timestamp)
+
+    batch = Backtester()
+    batch.run(klines, signals)
+
+    assert [t for t, _ in batch.equity_curve] == [t for t, _ in stepwise.equity_curve]
+    assert [e for _, e in batch.equity_curve] == pytest.approx([e for _, e in stepwise.equity_curve])
+    assert [(t.type, t.side, t.reason) for t in batch.trades] == \
+        [(t.type, t.side, t.reason) for t in stepwise.trades]
+    assert batch.balance == pytest.approx(stepwise.balance)
+    assert batch.position == stepwise.position
+
+
+def test_running_metrics_match_full_scan():
+    """Incrementally tracked drawdown and Sharpe agree with a rescan of the curve."""
+    klines, signals = _random_session()
+    half = len(klines) // 2
+
+    bt = Backtester()
+    for kline, signal in zip(klines[:half], signals[:half]):
+        if signal is not None:
+            bt.process_signal(signal, kline.close, kline.high, kline.low, kline.timestamp)
+    bt.run(klines[half:], signals[half:])
+
+    equities = np.array([e for _, e in bt.equity_curve])
+    peak = np.maximum.accumulate(equities)
+    returns = np.diff(equities) / equities[:-1]
+    results = bt.get_results()
+
+    assert results["max_drawdown"] == pytest.approx(((peak - equities) / peak * 100).max())
+    assert results["sharpe_ratio"] == pytest.approx(
+        returns.mean() / returns.std(ddof=1) * 35040 ** 0.5, rel=1e-6
+    )
+
+
+def test_equity_sampling_interval(monkeypatch):
+    """Sub-sampled curves keep the interval in both paths and the true final equity."""
+    monkeypatch.setattr(backtester, "NUMBA_AVAILABLE", True)
+    klines, signals = _random_session()
+    interval = timedelta(hours=2)
+
+    full = Backtester()
+    full.run(klines, signals)
+
+    stepwise = Backtester(equity_sampling_interval=interval)
+    for kline, signal in zip(klines, signals):
+        if signal is not None:
+            stepwise.process_signal(signal, kline.close, kline.high, kline.low, kline.timestamp)
+    batch = Backtester(equity_sampling_interval=interval)
+    batch.run(klines, signals)
+
+    times = [t for t, _ in batch.equity_curve]
+    assert times == [t for t, _ in stepwise.equity_curve]
+    assert len(times) < len(full.equity_curve)
+    assert all(b - a >= interval for a, b in zip(times, times[1:]))
+    assert batch.get_results()["final_equity"] == pytest.approx(full.get_results()["final_equity"])
+    assert stepwise.get_results()["final_equity"] == pytest.approx(full.get_results()["final_equity"])
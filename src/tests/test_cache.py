@@ -0,0 +1,115 @@
+"""Test the TTL cache for async exchange reads."""
+from types import SimpleNamespace
+
+import pytest
+
+import app.utils.cache as cache_module
+from app.utils.cache import ttl_cache
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    # Swap the module's `time` reference so the event loop keeps the real clock
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_kwargs_order_is_ignored(clock) -> None:
+    """Hits within the TTL reuse the result, whatever the keyword order; expiry refetches."""
+    calls = []
+
+    @ttl_cache(seconds=1.0)
+    async def fetch(symbol: str, limit: int = 20, depth: int = 1) -> list[int]:
+        calls.append((symbol, limit, depth))
+        return [len(calls)]
+
+    first = await fetch("BTCUSDT", limit=5, depth=2)
+    assert await fetch("BTCUSDT", depth=2, limit=5) is first
+    assert len(calls) == 1
+
+    clock.now += 1.0
+    assert await fetch("BTCUSDT", limit=5, depth=2) == [2]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_exceptions_are_not_cached(clock) -> None:
+    """A failed read is retried on the next call instead of replaying the error."""
+    attempts = []
+
+    @ttl_cache(seconds=10.0)
+    async def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("exchange down")
+        return "ok"
+
+    with pytest.raises(ConnectionError):
+        await flaky()
+    assert await flaky() == "ok"
+    assert await flaky() == "ok"
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_eviction_drops_expired_then_oldest(clock) -> None:
+    """A full cache first sheds expired entries, then the oldest live one."""
+    calls = []
+
+    @ttl_cache(seconds=5.0, maxsize=2)
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        return key
+
+    await fetch("a")
+    clock.now += 5.0                 # "a" expires
+    await fetch("b")
+    await fetch("c")                 # evicts expired "a", keeps "b"
+    await fetch("d")                 # full of live entries: evicts oldest ("b")
+    calls.clear()
+
+    await fetch("c")
+    await fetch("d")
+    assert calls == []
+    await fetch("b")
+    assert calls == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_cache_clear_all_or_per_instance(clock) -> None:
+    """cache_clear() empties the cache; cache_clear(self) only drops that instance."""
+
+    class Client:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        @ttl_cache(seconds=10.0)
+        async def read(self) -> int:
+            self.calls += 1
+            return self.calls
+
+    one, two = Client(), Client()
+    await one.read()
+    await two.read()
+
+    one.read.cache_clear(one)
+    await one.read()
+    await two.read()
+    assert (one.calls, two.calls) == (2, 1)
+
+    Client.read.cache_clear()
+    await one.read()
+    await two.read()
+    assert (one.calls, two.calls) == (3, 2)
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
@@ -5,6 +6,15 @@ from app.schemas.models import Order, ExecutionResult
 from app.schemas.events import OrderbookUpdate
 from app.nodes.execution_agent import execution_agent_node, smart_execute_order
 
+_real_sleep = asyncio.sleep
+
+
+async def _yield_only(delay, result=None):
+    """Stand-in for asyncio.sleep: yields to the loop once instead of waiting."""
+    await _real_sleep(0)
+    return result
+
+
 @pytest.mark.asyncio
 async def test_smart_execute_fill_immediately():
     """Test that smart execution places a limit order and returns success if filled."""
@@ -47,7 +57,8 @@ async def test_smart_execute_fill_immediately():
         # Agent usually receives MARKET orders from strategy
         order.order_type = "MARKET"
         
-        result = await smart_execute_order(order)
+        with patch("asyncio.sleep", _yield_only):
+            result = await smart_execute_order(order)
         
         assert result.success
         assert result.status == "FILLED"
@@ -100,7 +111,7 @@ async def test_smart_execute_timeout_and_chase():
         )
         
         # We need to mock asyncio.sleep to avoid waiting real time
-        with patch("asyncio.sleep", return_value=None):
+        with patch("asyncio.sleep", _yield_only):
             result = await smart_execute_order(order)
             
         assert result.success
@@ -10,8 +10,7 @@ from app.nodes.feature_engineering import (
 from app.schemas.events import KlineEvent, OrderbookUpdate
 
 
-@pytest.mark.asyncio
-async def test_compute_features_with_klines() -> None:
+def test_compute_features_with_klines() -> None:
     """Test feature computation with kline data."""
     # Create sample klines
     klines = [
@@ -37,15 +36,14 @@ async def test_compute_features_with_klines() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await compute_features_node(state)
+    result = compute_features_node(state)
 
     assert result["features"] is not None
     assert result["features"].price > 0
     assert result["features"].symbol == "BTCUSDT"
 
 
-@pytest.mark.asyncio
-async def test_compute_features_with_orderbook() -> None:
+def test_compute_features_with_orderbook() -> None:
     """Test feature computation with orderbook."""
     orderbook = OrderbookUpdate(
         timestamp=datetime.now(),
@@ -63,7 +61,7 @@ async def test_compute_features_with_orderbook() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await compute_features_node(state)
+    result = compute_features_node(state)
 
     assert result["features"] is not None
     features = result["features"]
@@ -73,8 +71,7 @@ async def test_compute_features_with_orderbook() -> None:
     assert features.spread is not None
 
 
-@pytest.mark.asyncio
-async def test_feature_engine_ema_computation() -> None:
+def test_feature_engine_ema_computation() -> None:
     """Test EMA computation."""
     from app.nodes.feature_engineering import FeatureEngine
 
@@ -89,8 +86,26 @@ async def test_feature_engine_ema_computation() -> None:
     assert result > 0
 
 
-@pytest.mark.asyncio
-async def test_features_include_all_expected_fields() -> None:
+def test_streaming_ema_matches_batch() -> None:
+    """A seeded streaming EMA continues the batch recurrence one price at a time."""
+    from app.nodes.feature_engineering import FeatureEngine
+
+    engine = FeatureEngine()
+    prices = [100.0 + (i % 7) - 0.5 * (i % 3) for i in range(60)]
+
+    engine.seed_ema("BTCUSDT", prices[:9], 9)
+    for price in prices[9:]:
+        streamed = engine.compute_ema_streaming("BTCUSDT", price, 9)
+
+    assert streamed == pytest.approx(engine.compute_ema(prices, 9))
+    assert not engine.is_ema_seeded("ETHUSDT", 9)
+
+    restored = FeatureEngine()
+    restored.from_dict(engine.to_dict())
+    assert restored.compute_ema_streaming("BTCUSDT", 101.0, 9) == engine.compute_ema_streaming("BTCUSDT", 101.0, 9)
+
+
+def test_features_include_all_expected_fields() -> None:
     """Test that features include all expected technical indicators."""
     # Create comprehensive sample data
     klines = [
@@ -123,7 +138,7 @@ async def test_features_include_all_expected_fields() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await compute_features_node(state)
+    result = compute_features_node(state)
 
     assert result["features"] is not None
     features = result["features"]
@@ -137,3 +152,110 @@ async def test_features_include_all_expected_fields() -> None:
     assert hasattr(features, 'orderbook_imbalance')
     assert hasattr(features, 'spread')
 
+
+
+def test_packed_klines_match_kline_events(monkeypatch) -> None:
+    """A KLINE_DTYPE batch yields the same features as the equivalent KlineEvents."""
+    import app.nodes.feature_engineering as fe
+    from app.nodes.feature_engineering import FeatureEngine
+    from app.schemas.events import klines_to_array
+
+    klines = [
+        KlineEvent(
+            timestamp=datetime(2024, 1, 1, i // 60, i % 60),
+            symbol="BTCUSDT",
+            interval="1m",
+            open=50000.0 + i,
+            high=50100.0 + (i * 7) % 90,
+            low=49900.0 - (i * 3) % 40,
+            close=50050.0 + (i * 11) % 60,
+            volume=10.0
+        )
+        for i in range(120)
+    ]
+    monkeypatch.setattr(fe, "_features_loaded", True)
+
+    results = []
+    for batch in (klines, klines_to_array(klines)):
+        monkeypatch.setattr(fe, "feature_engine", FeatureEngine())
+        state: FeatureState = {
+            "trades": [], "orderbook": None, "klines": batch, "features": None,
+            "symbol": "BTCUSDT", "timestamp": datetime.now()
+        }
+        results.append(compute_features_node(state)["features"].model_dump(exclude={"timestamp"}))
+
+    assert results[0] == results[1]
+
+
+def test_emas_advance_once_per_closed_kline(monkeypatch) -> None:
+    """Intra-bar ticks leave the EMAs alone; each new closed kline is one streaming step."""
+    import app.nodes.feature_engineering as fe
+    from app.nodes.feature_engineering import FeatureEngine
+
+    klines = [
+        KlineEvent(
+            timestamp=datetime(2024, 1, 1, i // 60, i % 60),
+            symbol="BTCUSDT",
+            interval="1m",
+            open=100.0,
+            high=101.0,
+            low=99.0,
+            close=100.0 + (i * 7) % 13,
+            volume=1.0
+        )
+        for i in range(61)
+    ]
+    monkeypatch.setattr(fe, "_features_loaded", True)
+    monkeypatch.setattr(fe, "feature_engine", FeatureEngine())
+
+    def run(batch: list[KlineEvent], mid: float) -> float:
+        orderbook = OrderbookUpdate(
+            timestamp=datetime.now(), symbol="BTCUSDT", bids=[(mid - 0.5, 1.0)], asks=[(mid + 0.5, 1.0)]
+        )
+        state: FeatureState = {
+            "trades": [], "orderbook": orderbook, "klines": batch, "features": None,
+            "symbol": "BTCUSDT", "timestamp": datetime.now()
+        }
+        return compute_features_node(state)["features"].ema_9
+
+    closes = [k.close for k in klines]
+    first = run(klines[:60], 100.0)
+    assert first == pytest.approx(FeatureEngine().compute_ema(closes[:60], 9))
+    # Same candles, different live prices: no change
+    assert run(klines[:60], 150.0) == first
+    assert run(klines[:60], 50.0) == first
+
+    alpha = 2.0 / 10
+    assert run(klines, 150.0) == pytest.approx(alpha * closes[60] + (1 - alpha) * first)
+
+
+def test_update_ema_resolves_default_symbol_at_call_time(monkeypatch) -> None:
+    """Without an explicit symbol, update_ema keys state on the current settings.symbol."""
+    from app.config import settings
+    from app.nodes.feature_engineering import FeatureEngine
+
+    engine = FeatureEngine()
+    monkeypatch.setattr(settings, "symbol", "ETHUSDT")
+    for i in range(settings.ema_short_period):
+        engine.update_ema(100.0 + i)
+
+    assert engine.is_ema_seeded("ETHUSDT", settings.ema_short_period)
+    assert not engine.is_ema_seeded("BTCUSDT", settings.ema_short_period)
+
+
+def test_bollinger_cache_reuses_unchanged_window() -> None:
+    """Keyed band calls are served from the cache and the cache stays bounded."""
+    from app.nodes.feature_engineering import BB_CACHE_SIZE, FeatureEngine
+
+    engine = FeatureEngine()
+    prices = [100.0 + (i % 5) for i in range(20)]
+
+    bands = engine.compute_bollinger_bands(prices, 20, 2.0, cache_key=("BTCUSDT", 1))
+    assert bands == engine.compute_bollinger_bands(prices, 20, 2.0)
+    # Same key: the cached window is returned without looking at the prices
+    assert engine.compute_bollinger_bands([0.0] * 20, 20, 2.0, cache_key=("BTCUSDT", 1)) == bands
+    assert engine.compute_bollinger_bands([0.0] * 20, 20, 2.0, cache_key=("BTCUSDT", 2)) == (0.0, 0.0, 0.0)
+
+    for ts in range(3, 3 + 2 * BB_CACHE_SIZE):
+        engine.compute_bollinger_bands(prices, 20, 2.0, cache_key=("BTCUSDT", ts))
+    assert len(engine._bb_cache) == BB_CACHE_SIZE
@@ -1,7 +1,13 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.tools.kotak_neo_tool import KotakNeoTool
 from app.schemas.models import Order
+from app.utils.clock import begin_tick
 
 @pytest.fixture
 def mock_settings():
@@ -10,11 +16,14 @@ def mock_settings():
         mock_settings.kotak_mobile_number = "1234567890"
         mock_settings.kotak_password = "password"
         mock_settings.kotak_totp_secret = "secret"
+        mock_settings.symbol = "NSE_CM|RELIANCE-EQ"
         yield mock_settings
 
 @pytest.fixture
 def mock_neo_api():
-    with patch("app.tools.kotak_neo_tool.NeoAPI") as mock_api:
+    # Stand in for the SDK so the client paths run without neo_api_client installed
+    with patch("app.tools.kotak_neo_tool.KOTAK_AVAILABLE", True), \
+            patch("app.tools.kotak_neo_tool.NeoAPI") as mock_api:
         yield mock_api
 
 @pytest.mark.asyncio
@@ -73,3 +82,132 @@ async def test_get_portfolio_state(mock_settings, mock_neo_api):
     assert portfolio.positions[0].symbol == "RELIANCE-EQ"
     assert portfolio.positions[0].quantity == 10.0
     assert portfolio.positions[0].unrealized_pnl == 1000.0
+
+@pytest.mark.asyncio
+async def test_execute_orders_batch(mock_settings, mock_neo_api):
+    tool = KotakNeoTool()
+    await tool.initialize()
+
+    tool.client.place_order.side_effect = [{"nOrdNo": "1"}, {"nOrdNo": "2"}]
+
+    orders = [
+        Order(symbol="NSE_CM|RELIANCE-EQ", side="BUY", quantity=10, price=2500.0, order_type="LIMIT"),
+        Order(symbol="NSE_CM|TCS-EQ", side="SELL", quantity=5, order_type="MARKET"),
+    ]
+
+    results = await tool.execute_orders_batch(orders)
+
+    assert [r.success for r in results] == [True, True]
+    assert sorted(r.order_id for r in results) == ["1", "2"]
+    assert tool.client.place_order.call_count == 2
+
+@pytest.mark.asyncio
+async def test_execute_orders_batch_caps_in_flight(mock_settings, mock_neo_api):
+    """Placements run MAX_BATCH_SIZE at a time and results keep the input order."""
+    tool = KotakNeoTool()
+    await tool.initialize()
+
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def place_order(**kwargs):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return {"nOrdNo": kwargs["quantity"]}
+
+    tool.client.place_order.side_effect = place_order
+    orders = [
+        Order(symbol="NSE_CM|RELIANCE-EQ", side="BUY", quantity=i + 1, order_type="MARKET")
+        for i in range(2 * KotakNeoTool.MAX_BATCH_SIZE + 5)
+    ]
+
+    results = await tool.execute_orders_batch(orders)
+
+    assert [r.order_id for r in results] == [str(float(i + 1)) for i in range(len(orders))]
+    assert 1 < in_flight[1] <= KotakNeoTool.MAX_BATCH_SIZE
+    assert tool.client.place_order.call_count == len(orders)
+
+@pytest.mark.asyncio
+async def test_feed_updates_orderbook_and_trades(mock_settings, mock_neo_api):
+    tool = KotakNeoTool()
+    await tool.initialize()
+
+    symbol = "NSE_CM|RELIANCE-EQ"
+    await tool.subscribe_market_data({symbol: "2885"})
+    tool.client.subscribe.assert_called_once()
+
+    tick_time = begin_tick(datetime(2024, 1, 2, 10, 0, 1))
+    tool._on_feed_message({"data": [{
+        "tk": "2885", "bp": "2499.5", "bq": "10", "sp": "2500.5", "bs": "12",
+        "ltp": "2500", "ltq": "5", "ltt": "10:00:01",
+    }]})
+
+    book = await tool.get_orderbook(symbol)
+    assert book.bids == [(2499.5, 10.0)]
+    assert book.asks == [(2500.5, 12.0)]
+    assert book.timestamp == tick_time
+
+    trades = await tool.get_recent_trades(symbol)
+    assert len(trades) == 1
+    assert trades[0].price == 2500.0
+    assert trades[0].quantity == 5.0
+    assert trades[0].timestamp == tick_time
+
+SCRIP_CSV = "pSymbol,pExchSeg,pTrdSymbol\n2885,nse_cm,RELIANCE-EQ\n11536,nse_cm,TCS-EQ\n"
+
+
+def _scrip_session(csv_text: str = SCRIP_CSV) -> MagicMock:
+    """aiohttp.ClientSession stand-in whose GET returns `csv_text`."""
+    response = MagicMock()
+    response.text = AsyncMock(return_value=csv_text)
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get.return_value = response
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=None)
+    return session
+
+@pytest.mark.asyncio
+async def test_scrip_master_token_lookup(mock_settings, mock_neo_api):
+    tool = KotakNeoTool()
+    await tool.initialize()
+    tool.client.scrip_master.return_value = "https://example.com/nse_cm.csv"
+
+    with patch("app.tools.kotak_neo_tool.aiohttp.ClientSession", return_value=_scrip_session()):
+        assert await tool.load_scrip_master("nse_cm")
+
+    assert tool._token("NSE_CM|RELIANCE-EQ") == "2885"
+    assert tool._token("TCS-EQ") == "11536"
+    assert tool._token("NSE_CM|UNKNOWN-EQ") is None
+
+
+@pytest.mark.asyncio
+async def test_initialize_loads_scrip_master_and_refreshes(mock_settings, mock_neo_api):
+    """initialize() downloads the scrip master, subscribes the configured symbol and keeps refreshing."""
+    mock_neo_api.return_value.scrip_master.return_value = "https://example.com/nse_cm.csv"
+    session = _scrip_session()
+
+    with patch("app.tools.kotak_neo_tool.aiohttp.ClientSession", return_value=session), \
+            patch("app.tools.kotak_neo_tool.SCRIP_MASTER_REFRESH_SECONDS", 0):
+        tool = KotakNeoTool()
+        await tool.initialize()
+
+        assert tool._token("NSE_CM|RELIANCE-EQ") == "2885"
+        subscribed = tool.client.subscribe.call_args.kwargs["instrument_tokens"]
+        assert subscribed == [{"instrument_token": "2885", "exchange_segment": "NSE_CM"}]
+        assert tool._scrip_refresh_task is not None
+
+        # The refresh loop reloads the file on its own
+        for _ in range(100):
+            if session.get.call_count >= 3:
+                break
+            await asyncio.sleep(0.01)
+        assert session.get.call_count >= 3
+
+        await tool.close()
+    assert tool._scrip_refresh_task is None
@@ -0,0 +1,34 @@
+"""Test limit order book simulator."""
+from datetime import datetime
+
+from app.utils.lob_simulator import LOBSimulator
+
+
+def test_partial_fill_keeps_time_priority():
+    """A partially filled order stays ahead of later orders at its price."""
+    lob = LOBSimulator("BTC/USD")
+    lob.add_limit_order("SELL", 100.0, 2.0)  # first in queue
+    lob.add_limit_order("SELL", 100.0, 5.0)
+    lob.add_limit_order("SELL", 101.0, 1.0)
+
+    avg_price, filled = lob.execute_market_order("BUY", 1.5)
+    assert (avg_price, filled) == (100.0, 1.5)
+    assert list(lob.asks[100.0]) == [0.5, 5.0]
+    assert lob.get_best_ask() == (100.0, 5.5)
+
+
+def test_market_order_walks_levels():
+    """Market orders sweep levels from the touch and snapshot stays aggregated."""
+    lob = LOBSimulator("BTC/USD")
+    for price, qty in [(99.0, 1.0), (98.0, 2.0), (99.0, 1.0), (97.0, 3.0)]:
+        lob.add_limit_order("BUY", price, qty)
+
+    avg_price, filled = lob.execute_market_order("SELL", 3.0)
+    assert filled == 3.0
+    assert avg_price == (2 * 99.0 + 98.0) / 3
+
+    ts = datetime(2024, 1, 1, 12, 0)
+    snapshot = lob.get_orderbook_snapshot(depth=5, timestamp=ts)
+    assert snapshot.timestamp == ts
+    assert snapshot.bids == [(98.0, 1.0), (97.0, 3.0)]
+    assert snapshot.asks == []
@@ -1,5 +1,4 @@
 """Test mean reversion strategy logic."""
-import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 from app.nodes.mean_reversion_policy import mean_reversion_strategy_node, MeanReversionState
@@ -7,8 +6,7 @@ from app.schemas.models import MarketFeatures, Signal
 from app.schemas.events import KlineEvent
 from app.config import settings
 
-@pytest.mark.asyncio
-async def test_mean_reversion_long_signal_confirmed():
+def test_mean_reversion_long_signal_confirmed():
     """Test that strategy generates LONG signal when oversold AND confirmed."""
     # Setup:
     # 1. Previous Candle: Close < Lower Band (Oversold)
@@ -60,7 +58,7 @@ async def test_mean_reversion_long_signal_confirmed():
     with patch("app.nodes.mean_reversion_policy.feature_engine") as mock_engine:
         mock_engine.compute_bollinger_bands.return_value = (102.0, 100.0, 98.0) # Upper, Mid, Lower
         
-        result = await mean_reversion_strategy_node(state)
+        result = mean_reversion_strategy_node(state)
         signal = result["signals"][0]
         
         assert signal.direction == "LONG"
@@ -69,8 +67,7 @@ async def test_mean_reversion_long_signal_confirmed():
         assert "Price closed back inside" in signal.reasoning
         assert "Oversold" not in signal.reasoning # The new logic doesn't explicitly say "Oversold" in the reasoning string I constructed, it says "RSI ..."
 
-@pytest.mark.asyncio
-async def test_mean_reversion_wait_for_confirmation():
+def test_mean_reversion_wait_for_confirmation():
     """Test that strategy WAITS (Neutral) when price is outside but no crossover."""
     # Setup:
     # Previous: Outside (95 < 98)
@@ -117,14 +114,13 @@ async def test_mean_reversion_wait_for_confirmation():
     with patch("app.nodes.mean_reversion_policy.feature_engine") as mock_engine:
         mock_engine.compute_bollinger_bands.return_value = (102.0, 100.0, 98.0)
         
-        result = await mean_reversion_strategy_node(state)
+        result = mean_reversion_strategy_node(state)
         signal = result["signals"][0]
         
         assert signal.direction == "NEUTRAL"
         assert "waiting for confirmation" in signal.reasoning
 
-@pytest.mark.asyncio
-async def test_mean_reversion_short_signal_confirmed():
+def test_mean_reversion_short_signal_confirmed():
     """Test that strategy generates SHORT signal when overbought AND confirmed."""
     # Setup:
     # Previous: Close > Upper Band (105 > 102)
@@ -170,7 +166,7 @@ async def test_mean_reversion_short_signal_confirmed():
     with patch("app.nodes.mean_reversion_policy.feature_engine") as mock_engine:
         mock_engine.compute_bollinger_bands.return_value = (102.0, 100.0, 98.0)
         
-        result = await mean_reversion_strategy_node(state)
+        result = mean_reversion_strategy_node(state)
         signal = result["signals"][0]
         
         assert signal.direction == "SHORT"
@@ -0,0 +1,205 @@
+"""Test performance metrics."""
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.metrics import (
+    SQRT_252,
+    RunningMoments,
+    TradeLog,
+    TradeStats,
+    aggregate_trade_stats,
+    batch_sharpe,
+    batch_sortino,
+    calculate_max_drawdown,
+    calculate_sharpe_ratio,
+    calculate_sortino_ratio,
+    generate_performance_report,
+    rolling_sharpe,
+    _max_drawdown_nb,
+    _return_moments_nb,
+    _return_moments_np,
+    _rolling_sharpe_nb,
+    _rolling_sharpe_np
+)
+
+
+def test_report_matches_individual_metrics():
+    """The fused single-pass report agrees with the standalone metric functions."""
+    rng = random.Random(3)
+    equity = np.cumprod([100.0] + [1 + rng.gauss(0.0005, 0.01) for _ in range(999)])
+    returns = np.diff(equity) / equity[:-1]
+
+    report = generate_performance_report(equity.tolist(), [], initial_balance=100.0)
+
+    assert report["final_equity"] == equity[-1]
+    assert report["max_drawdown_pct"] == pytest.approx(calculate_max_drawdown(equity))
+    assert report["sharpe_ratio"] == pytest.approx(calculate_sharpe_ratio(returns))
+    assert report["sortino_ratio"] == pytest.approx(calculate_sortino_ratio(returns))
+
+
+def test_metric_edge_cases():
+    """Short, flat and loss-free inputs keep their documented fallbacks."""
+    assert calculate_sharpe_ratio([0.01]) == 0.0
+    assert calculate_sharpe_ratio([0.01, 0.01, 0.01]) == 0.0
+    assert calculate_sortino_ratio([0.01, 0.02]) == float('inf')
+    assert calculate_max_drawdown([]) == 0.0
+    assert calculate_max_drawdown([100.0, 80.0, 120.0, 90.0]) == pytest.approx(25.0)
+    assert generate_performance_report([], [], initial_balance=100.0) == {}
+
+
+def test_aggregate_trade_stats():
+    """All trade statistics come out of one pass; trades without 'pnl' count as flat."""
+    trades = [{"pnl": 30.0}, {"pnl": -10.0}, {"pnl": 10.0}, {"pnl": -20.0}, {}]
+
+    assert aggregate_trade_stats(trades) == TradeStats(
+        total_trades=5, win_rate=40.0, profit_factor=40.0 / 30.0, avg_win_loss_ratio=20.0 / 15.0
+    )
+    assert aggregate_trade_stats([]) == TradeStats(0, 0.0, 0.0, 0.0)
+    assert aggregate_trade_stats([{"pnl": 5.0}]).profit_factor == float('inf')
+
+
+def test_trade_log_matches_dict_trades():
+    """A columnar TradeLog and the equivalent dict list give the same stats."""
+    pnls = [5.0, -2.0, 0.0, 7.5, -1.0] * 300
+    log = TradeLog(capacity=4)
+    log.extend(np.array(pnls[:2]))
+    for pnl in pnls[2:]:
+        log.append(pnl)
+
+    assert len(log) == len(pnls)
+    assert log.pnls.tolist() == pnls
+    assert aggregate_trade_stats(log) == aggregate_trade_stats([{"pnl": p} for p in pnls])
+    assert aggregate_trade_stats(TradeLog()) == TradeStats(0, 0.0, 0.0, 0.0)
+
+
+def test_running_moments_streaming_and_merge():
+    """Streaming updates and Chan merges reproduce the batch Sharpe/Sortino."""
+    rng = random.Random(5)
+    returns = np.array([rng.gauss(0.0005, 0.01) for _ in range(500)])
+
+    streamed = RunningMoments()
+    for r in returns:
+        streamed.update(r)
+    merged = RunningMoments.from_array(returns[:123])
+    merged.merge(RunningMoments.from_array(returns[123:]))
+
+    for moments in (streamed, merged):
+        assert moments.n == returns.size
+        assert moments.sharpe() == pytest.approx(calculate_sharpe_ratio(returns))
+        assert moments.sortino() == pytest.approx(calculate_sortino_ratio(returns))
+    assert RunningMoments().sharpe() == 0.0
+
+
+def test_metrics_accept_arrays_and_skip_nans():
+    """Arrays and memoryviews work directly; NaN gaps are dropped, not propagated."""
+    returns = np.array([0.01, -0.02, 0.015, 0.003, -0.004])
+    with_gap = np.concatenate(([np.nan], returns))
+
+    assert calculate_sharpe_ratio(with_gap) == calculate_sharpe_ratio(returns.tolist())
+    assert calculate_sortino_ratio(memoryview(returns)) == calculate_sortino_ratio(returns)
+    assert calculate_max_drawdown([np.nan, 100.0, 80.0]) == pytest.approx(20.0)
+
+
+def test_nan_gaps_are_dropped_not_propagated():
+    """Interior gaps are skipped too: the metrics see the series with the NaNs removed."""
+    returns = np.array([0.01, -0.02, 0.015, 0.003, -0.004, 0.007])
+    gappy = returns.copy()
+    gappy[[0, 3]] = np.nan
+    kept = returns[[1, 2, 4, 5]]
+
+    assert calculate_sharpe_ratio(gappy) == calculate_sharpe_ratio(kept)
+    assert calculate_sortino_ratio(gappy) == calculate_sortino_ratio(kept)
+    assert calculate_sharpe_ratio([np.nan, np.nan]) == 0.0
+
+    # A missing equity mark neither hides nor invents a drawdown
+    equity = [100.0, 120.0, np.nan, 90.0, 110.0]
+    assert calculate_max_drawdown(equity) == pytest.approx(25.0)
+    report = generate_performance_report(equity, [], initial_balance=100.0)
+    assert report == generate_performance_report([100.0, 120.0, 90.0, 110.0], [], initial_balance=100.0)
+    assert generate_performance_report([np.nan], [], initial_balance=100.0) == {}
+
+
+def test_rolling_sharpe_keeps_alignment_across_gaps():
+    """NaN inputs yield NaN at their own position; the other outputs stay in place."""
+    rng = random.Random(3)
+    returns = np.array([rng.gauss(0.0005, 0.01) for _ in range(40)])
+    gappy = returns.copy()
+    gappy[[5, 25]] = np.nan
+    valid = ~np.isnan(gappy)
+
+    out = rolling_sharpe(gappy, 10)
+    assert out.shape == gappy.shape
+    assert np.isnan(out[[5, 25]]).all()
+    np.testing.assert_allclose(out[valid], rolling_sharpe(gappy[valid], 10), equal_nan=True)
+
+
+def test_return_moments_kernel_matches_numpy():
+    """The compiled moment loops agree with the NumPy path (only meaningful with numba)."""
+    pytest.importorskip("numba")
+    rng = random.Random(7)
+    returns = np.array([rng.gauss(0.0005, 0.01) for _ in range(250)])
+
+    for target in (0.0, 0.001):
+        got = _return_moments_nb(returns, target)
+        want = _return_moments_np(returns, target)
+        assert got[0] == want[0] and got[4] == want[4]
+        assert got[1:4] == pytest.approx(want[1:4])
+
+
+def test_rolling_sharpe_matches_windowed_calls():
+    """Both rolling kernels agree with calling calculate_sharpe_ratio per window."""
+    rng = random.Random(11)
+    returns = np.array([rng.gauss(0.0003, 0.01) for _ in range(300)])
+    returns[100:120] = 0.0  # a flat stretch
+    window = 20
+
+    expected = [calculate_sharpe_ratio(returns[i - window + 1:i + 1]) for i in range(window - 1, returns.size)]
+
+    for kernel in (_rolling_sharpe_nb, _rolling_sharpe_np):
+        out = kernel(returns, window, 0.0, SQRT_252)
+        assert np.isnan(out[:window - 1]).all()
+        assert out[window - 1:] == pytest.approx(expected, abs=1e-9)
+    assert rolling_sharpe(returns, window) == pytest.approx(_rolling_sharpe_np(returns, window, 0.0, SQRT_252), nan_ok=True)
+
+
+def _drawdown_cases() -> list[tuple[np.ndarray, float]]:
+    """Equity curves, including non-positive peaks, with their reference max drawdown."""
+    rng = random.Random(13)
+    curves = [
+        np.cumprod([100.0] + [1 + rng.gauss(0, 0.02) for _ in range(499)]),
+        np.array([-5.0, -3.0, 2.0, 1.0, 4.0, 3.0]),
+        np.array([100.0]),
+    ]
+    cases = []
+    for equity in curves:
+        peaks = np.maximum.accumulate(equity)
+        expected = np.where(peaks > 0, (peaks - equity) / np.where(peaks > 0, peaks, 1.0) * 100, 0.0).max()
+        cases.append((equity, expected))
+    return cases
+
+
+def test_max_drawdown_matches_reference():
+    """calculate_max_drawdown handles long curves and non-positive peaks."""
+    for equity, expected in _drawdown_cases():
+        assert calculate_max_drawdown(equity) == pytest.approx(expected)
+
+
+def test_max_drawdown_kernel_matches_vectorized():
+    """The compiled scan agrees with the NumPy path (only meaningful with numba)."""
+    pytest.importorskip("numba")
+    for equity, expected in _drawdown_cases():
+        assert _max_drawdown_nb(equity) == pytest.approx(expected)
+
+
+def test_batch_metrics_match_per_symbol_calls():
+    """Row-wise batch Sharpe/Sortino equal the per-series functions, edge rows included."""
+    rng = random.Random(17)
+    rows = [[rng.gauss(0.0005, 0.01) for _ in range(250)] for _ in range(5)]
+    rows.append([0.01] * 250)               # flat: Sharpe 0, no downside -> inf Sortino
+    rows.append([-0.01] * 250)              # constant loss: zero downside deviation
+    matrix = np.array(rows)
+
+    assert batch_sharpe(matrix).tolist() == pytest.approx([calculate_sharpe_ratio(r) for r in rows])
+    assert batch_sortino(matrix).tolist() == pytest.approx([calculate_sortino_ratio(r) for r in rows])
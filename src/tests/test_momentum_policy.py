@@ -6,8 +6,7 @@ from app.nodes.momentum_policy import momentum_strategy_node, MomentumState
 from app.schemas.models import MarketFeatures
 
 
-@pytest.mark.asyncio
-async def test_momentum_long_signal() -> None:
+def test_momentum_long_signal() -> None:
     """Test momentum strategy generates LONG signal when EMA(9) > EMA(50) and price > EMA(9)."""
     features = MarketFeatures(
         timestamp=datetime.now(),
@@ -26,7 +25,7 @@ async def test_momentum_long_signal() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await momentum_strategy_node(state)
+    result = momentum_strategy_node(state)
 
     assert result["signal"] is not None
     signal = result["signal"]
@@ -37,8 +36,7 @@ async def test_momentum_long_signal() -> None:
     assert signal.strategy == "momentum"
 
 
-@pytest.mark.asyncio
-async def test_momentum_short_signal() -> None:
+def test_momentum_short_signal() -> None:
     """Test momentum strategy generates SHORT signal when EMA(9) < EMA(50) and price < EMA(9)."""
     features = MarketFeatures(
         timestamp=datetime.now(),
@@ -57,7 +55,7 @@ async def test_momentum_short_signal() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await momentum_strategy_node(state)
+    result = momentum_strategy_node(state)
 
     assert result["signal"] is not None
     signal = result["signal"]
@@ -67,8 +65,7 @@ async def test_momentum_short_signal() -> None:
     assert signal.confidence > 0
 
 
-@pytest.mark.asyncio
-async def test_momentum_neutral_signal() -> None:
+def test_momentum_neutral_signal() -> None:
     """Test momentum strategy generates NEUTRAL signal when conditions are unclear."""
     features = MarketFeatures(
         timestamp=datetime.now(),
@@ -88,7 +85,7 @@ async def test_momentum_neutral_signal() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await momentum_strategy_node(state)
+    result = momentum_strategy_node(state)
 
     assert result["signal"] is not None
     signal = result["signal"]
@@ -97,8 +94,7 @@ async def test_momentum_neutral_signal() -> None:
     assert signal.direction == "NEUTRAL" or signal.confidence < 0.5
 
 
-@pytest.mark.asyncio
-async def test_momentum_insufficient_features() -> None:
+def test_momentum_insufficient_features() -> None:
     """Test momentum strategy handles missing features gracefully."""
     features = MarketFeatures(
         timestamp=datetime.now(),
@@ -115,7 +111,7 @@ async def test_momentum_insufficient_features() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await momentum_strategy_node(state)
+    result = momentum_strategy_node(state)
 
     assert result["signal"] is not None
     signal = result["signal"]
@@ -124,8 +120,7 @@ async def test_momentum_insufficient_features() -> None:
     assert signal.confidence == 0.0
 
 
-@pytest.mark.asyncio
-async def test_momentum_signal_includes_risk_params() -> None:
+def test_momentum_signal_includes_risk_params() -> None:
     """Test that momentum signals include stop loss and take profit levels."""
     features = MarketFeatures(
         timestamp=datetime.now(),
@@ -143,7 +138,7 @@ async def test_momentum_signal_includes_risk_params() -> None:
         "timestamp": datetime.now()
     }
 
-    result = await momentum_strategy_node(state)
+    result = momentum_strategy_node(state)
 
     assert result["signal"] is not None
     signal = result["signal"]
@@ -154,3 +149,85 @@ async def test_momentum_signal_includes_risk_params() -> None:
         assert signal.take_profit is not None
         assert signal.entry_price is not None
 
+
+
+def test_momentum_entry_batch_matches_node() -> None:
+    """The vectorized entry kernel agrees with the node for flat symbols, row by row."""
+    import math
+    import random
+
+    import numpy as np
+
+    from app.nodes.momentum_policy import momentum_entry_batch
+
+    rng = random.Random(21)
+
+    def maybe(value: float) -> float | None:
+        return None if rng.random() < 0.2 else value
+
+    rows = []
+    for _ in range(400):
+        price = 100.0 + rng.uniform(-5, 5)
+        rows.append(dict(
+            price=price,
+            ema_9=maybe(100.0 + rng.uniform(-3, 3)),
+            ema_50=maybe(100.0 + rng.uniform(-3, 3)),
+            ema_200=maybe(100.0 + rng.uniform(-6, 6)),
+            adx=maybe(rng.uniform(10, 40)),
+            rsi=maybe(rng.uniform(20, 80)),
+            atr=maybe(rng.uniform(0.5, 2)),
+            ofi_sma=maybe(rng.uniform(-10, 10)),
+        ))
+
+    columns = {
+        key: np.array([math.nan if row[key] is None else row[key] for row in rows])
+        for key in rows[0]
+    }
+    batch = momentum_entry_batch(**columns)
+
+    for i, row in enumerate(rows):
+        features = MarketFeatures(timestamp=datetime.now(), symbol="BTCUSDT", **row)
+        state: MomentumState = {
+            "features": features, "signal": None, "symbol": "BTCUSDT", "timestamp": datetime.now()
+        }
+        signal = momentum_strategy_node(state)["signals"][0]
+
+        assert {"LONG": 1, "SHORT": -1, "NEUTRAL": 0}[signal.direction] == batch.direction[i]
+        assert signal.strength == pytest.approx(batch.strength[i])
+        assert signal.confidence == pytest.approx(batch.confidence[i])
+        if batch.direction[i]:
+            assert signal.stop_loss == pytest.approx(batch.stop_loss[i])
+            assert signal.trailing_stop_distance == pytest.approx(batch.trailing_stop_distance[i])
+
+
+def test_parallel_entry_kernel_matches_numpy() -> None:
+    """The per-symbol prange kernel and the array-mask path agree exactly (only with numba)."""
+    pytest.importorskip("numba")
+    import numpy as np
+
+    from app.nodes.momentum_policy import _momentum_entry_nb, _momentum_entry_np
+
+    rng = np.random.default_rng(23)
+    n = 500
+
+    def column(low: float, high: float) -> np.ndarray:
+        values = rng.uniform(low, high, n)
+        values[rng.random(n) < 0.15] = np.nan
+        values[rng.random(n) < 0.05] = 0.0
+        return values
+
+    columns = dict(
+        price=100.0 + rng.uniform(-5, 5, n),
+        ema_9=column(97, 103),
+        ema_50=column(97, 103),
+        ema_200=column(94, 106),
+        adx=column(10, 40),
+        rsi=column(20, 80),
+        atr=column(0.5, 2),
+        ofi_sma=column(-10, 10),
+    )
+
+    expected = _momentum_entry_np(**columns)
+    for got, want in zip(_momentum_entry_nb(**columns), expected):
+        np.testing.assert_array_equal(got, want)
+    assert expected.direction.any()
@@ -0,0 +1,32 @@
+"""Test state persistence."""
+import asyncio
+
+import pytest
+
+from app.utils.persistence import StateManager
+
+
+def test_save_outside_loop_writes_immediately(tmp_path) -> None:
+    """Without an event loop, save_state is a synchronous atomic write."""
+    manager = StateManager(str(tmp_path))
+
+    assert manager.save_state("features_BTC/USDT", {"ema_9": 1.5})
+    assert (tmp_path / "features_BTC_USDT.json").exists()
+    assert manager.load_state("features_BTC/USDT") == {"ema_9": 1.5}
+
+
+@pytest.mark.asyncio
+async def test_saves_in_loop_are_coalesced(tmp_path) -> None:
+    """Repeated saves within one interval collapse into a single deferred write."""
+    manager = StateManager(str(tmp_path), flush_interval=0.01)
+    path = tmp_path / "features.json"
+
+    for i in range(50):
+        manager.save_state("features", {"tick": i})
+
+    assert not path.exists()
+    assert manager.load_state("features") == {"tick": 49}
+
+    await asyncio.sleep(0.1)
+    assert path.exists()
+    assert StateManager(str(tmp_path)).load_state("features") == {"tick": 49}
@@ -0,0 +1,24 @@
+"""Test the float ring buffer."""
+from collections import deque
+
+import numpy as np
+
+from app.utils.ring_buffer import RingBuffer
+
+
+def test_ring_buffer_matches_deque():
+    """Appends and batch extends keep the same window as a bounded deque."""
+    ring = RingBuffer(5)
+    expected: deque[float] = deque(maxlen=5)
+
+    for i in range(12):
+        ring.append(float(i))
+        expected.append(float(i))
+        assert list(ring) == list(expected)
+
+    for batch in ([20.0, 21.0], np.arange(30.0, 33.0), np.arange(40.0, 48.0), []):
+        ring.extend(batch)
+        expected.extend(batch)
+        assert ring.view().tolist() == list(expected)
+    assert len(ring) == 5
+    assert list(RingBuffer(3, [1.0, 2.0])) == [1.0, 2.0]
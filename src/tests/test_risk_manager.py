@@ -1,178 +1,150 @@
 """Test risk management logic."""
+import asyncio
+
 import pytest
 from datetime import datetime
+from typing import NamedTuple
+
 from app.nodes.risk_manager import risk_management_node, RiskState
 from app.schemas.models import Signal, PortfolioState, RiskLimits, MarketFeatures, Position
 from app.config import settings
 
-@pytest.mark.asyncio
-async def test_volatility_sizing():
-    """Test volatility-based position sizing."""
-    # Setup
-    settings.risk_per_trade_percent = 0.01  # 1% risk
-    settings.atr_stop_multiplier = 2.0
-    
-    # Portfolio: $10,000 equity
-    portfolio = PortfolioState(
+# Timestamps play no part in sizing; one value keeps the shared inputs identical
+_TS = datetime.now()
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """One event loop for every case in this module; the node holds no loop-bound state."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def _risk_settings(monkeypatch):
+    """Pin the sizing settings per test and restore them afterwards."""
+    monkeypatch.setattr(settings, "risk_per_trade_percent", 0.01)  # 1% risk
+    monkeypatch.setattr(settings, "atr_stop_multiplier", 2.0)
+    monkeypatch.setattr(settings, "allow_shorting", True)
+
+
+# Shared inputs are built once per module; the node only reads them
+@pytest.fixture(scope="module")
+def base_portfolio() -> PortfolioState:
+    """$10,000 equity, flat."""
+    return PortfolioState(
         balance=10000.0,
         equity=10000.0,
         positions=[],
         open_orders=[],
-        timestamp=datetime.now()
+        timestamp=_TS
     )
-    
-    # Signal: LONG at $100
-    signal = Signal(
-        timestamp=datetime.now(),
+
+
+def _signal(direction: str, stop_loss: float) -> Signal:
+    return Signal(
+        timestamp=_TS,
         symbol="BTC/USD",
         strategy="test",
-        direction="LONG",
+        direction=direction,
         strength=1.0,
         confidence=1.0,
-        entry_price=100.0
+        entry_price=100.0,
+        stop_loss=stop_loss
     )
-    
-    # Features: ATR = 2.0
-    features = MarketFeatures(
-        timestamp=datetime.now(),
+
+
+@pytest.fixture(scope="module")
+def base_signal_long() -> Signal:
+    """LONG at $100."""
+    return _signal("LONG", 96.0)
+
+
+@pytest.fixture(scope="module")
+def base_signal_short() -> Signal:
+    """SHORT at $100."""
+    return _signal("SHORT", 104.0)
+
+
+def _features(atr: float | None) -> MarketFeatures:
+    return MarketFeatures(
+        timestamp=_TS,
         symbol="BTC/USD",
         price=100.0,
-        atr=2.0
+        atr=atr
     )
-    
-    # Risk Limits: Volatility sizing
-    risk_limits = RiskLimits(
-        max_position_size=100.0, # Large enough not to cap (need > 25.0)
-        position_sizing_method="VOLATILITY"
-    )
-    
-    state: RiskState = {
-        "signal": signal,
-        "features": features,
-        "portfolio": portfolio,
-        "approved_orders": [],
-        "risk_limits": risk_limits,
-        "symbol": "BTC/USD",
-        "timestamp": datetime.now()
-    }
-    
-    # Execution
-    result = await risk_management_node(state)
-    orders = result["approved_orders"]
-    
-    assert len(orders) == 1
-    order = orders[0]
-    
-    # Calculation:
+
+
+@pytest.fixture(scope="module")
+def base_features_atr() -> MarketFeatures:
+    """ATR = 2.0."""
+    return _features(2.0)
+
+
+@pytest.fixture(scope="module")
+def base_features_no_atr() -> MarketFeatures:
+    """No ATR available."""
+    return _features(None)
+
+
+@pytest.fixture(scope="module")
+def make_state(base_portfolio):
+    """Build a RiskState around one signal with VOLATILITY sizing."""
+    def make(signal: Signal, features: MarketFeatures, max_position_size: float) -> RiskState:
+        return {
+            "signals": [signal],
+            "features": features,
+            "portfolio": base_portfolio,
+            "approved_orders": [],
+            "risk_limits": RiskLimits(
+                max_position_size=max_position_size,
+                position_sizing_method="VOLATILITY"
+            ),
+            "symbol": "BTC/USD",
+            "timestamp": _TS
+        }
+    return make
+
+
+class RiskCase(NamedTuple):
+    """Inputs that vary between risk-node cases and the order they should produce."""
+    signal: str
+    features: str
+    max_position_size: float
+    expected_quantity: float
+    expected_stop: float | None
+
+
+RISK_CASES = [
     # Risk Amount = 10000 * 0.01 = 100
     # Stop Distance = ATR * Multiplier = 2.0 * 2.0 = 4.0
-    # Position Size = 100 / 4.0 = 25.0 units
-    
-    assert order.quantity == 25.0
-    assert order.stop_price == 100.0 - 4.0  # 96.0
+    # Position Size = 100 / 4.0 = 25.0 units (cap of 100 does not bind)
+    RiskCase("base_signal_long", "base_features_atr", 100.0, 25.0, 100.0 - 4.0),
+    # Stop Price for SHORT = Entry + (ATR * Multiplier) = 104.0; size capped at 1.0
+    RiskCase("base_signal_short", "base_features_atr", 1.0, 1.0, 104.0),
+    # No ATR: fall back to fixed size min(max_pos, 0.01) and no stop
+    RiskCase("base_signal_long", "base_features_no_atr", 0.5, 0.01, None),
+]
 
-@pytest.mark.asyncio
-async def test_atr_stop_loss_short():
-    """Test ATR stop loss for SHORT positions."""
-    # Setup
-    settings.atr_stop_multiplier = 2.0
-    settings.allow_shorting = True
-    
-    portfolio = PortfolioState(
-        balance=10000.0,
-        equity=10000.0,
-        positions=[],
-        open_orders=[],
-        timestamp=datetime.now()
-    )
-    
-    signal = Signal(
-        timestamp=datetime.now(),
-        symbol="BTC/USD",
-        strategy="test",
-        direction="SHORT",
-        strength=1.0,
-        confidence=1.0,
-        entry_price=100.0
-    )
-    
-    features = MarketFeatures(
-        timestamp=datetime.now(),
-        symbol="BTC/USD",
-        price=100.0,
-        atr=2.0
-    )
-    
-    risk_limits = RiskLimits(
-        max_position_size=1.0,
-        position_sizing_method="VOLATILITY"
-    )
-    
-    state: RiskState = {
-        "signal": signal,
-        "features": features,
-        "portfolio": portfolio,
-        "approved_orders": [],
-        "risk_limits": risk_limits,
-        "symbol": "BTC/USD",
-        "timestamp": datetime.now()
-    }
-    
-    result = await risk_management_node(state)
-    order = result["approved_orders"][0]
-    
-    # Stop Price for SHORT = Entry + (ATR * Multiplier)
-    # 100 + (2.0 * 2.0) = 104.0
-    assert order.stop_price == 104.0
 
 @pytest.mark.asyncio
-async def test_fallback_sizing():
-    """Test fallback to fixed sizing when ATR is missing."""
-    portfolio = PortfolioState(
-        balance=10000.0,
-        equity=10000.0,
-        positions=[],
-        open_orders=[],
-        timestamp=datetime.now()
-    )
-    
-    signal = Signal(
-        timestamp=datetime.now(),
-        symbol="BTC/USD",
-        strategy="test",
-        direction="LONG",
-        strength=1.0,
-        confidence=1.0,
-        entry_price=100.0
-    )
-    
-    # No ATR
-    features = MarketFeatures(
-        timestamp=datetime.now(),
-        symbol="BTC/USD",
-        price=100.0,
-        atr=None
+@pytest.mark.parametrize("case", RISK_CASES, ids=["volatility", "short_stop", "fallback"])
+async def test_risk_node(case: RiskCase, make_state, request):
+    """Volatility sizing, ATR stops for both sides and the fixed-size fallback."""
+    state = make_state(
+        request.getfixturevalue(case.signal),
+        request.getfixturevalue(case.features),
+        max_position_size=case.max_position_size
     )
-    
-    risk_limits = RiskLimits(
-        max_position_size=0.5,
-        position_sizing_method="VOLATILITY"
-    )
-    
-    state: RiskState = {
-        "signal": signal,
-        "features": features,
-        "portfolio": portfolio,
-        "approved_orders": [],
-        "risk_limits": risk_limits,
-        "symbol": "BTC/USD",
-        "timestamp": datetime.now()
-    }
-    
+
     result = await risk_management_node(state)
-    order = result["approved_orders"][0]
-    
-    # Should fallback to fixed size (min(max_pos, 0.01))
-    # max_pos = 0.5, default fixed = 0.01 -> 0.01
-    assert order.quantity == 0.01
-    assert order.stop_price is None
+    orders = result["approved_orders"]
+
+    assert len(orders) == 1
+    order = orders[0]
+    assert order.quantity == case.expected_quantity
+    if case.expected_stop is None:
+        assert order.stop_price is None
+    else:
+        assert order.stop_price == case.expected_stop
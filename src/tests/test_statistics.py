@@ -0,0 +1,47 @@
+"""Test statistical utilities."""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.utils.statistics as statistics
+from app.utils.statistics import GARCH_REFIT_INTERVAL, forecast_volatility
+
+
+@pytest.fixture
+def counted_fits(monkeypatch) -> list[int]:
+    """Replace arch_model with a fixed GARCH(1,1) fit and record how often it is fitted."""
+    fits: list[int] = []
+    params = pd.Series({"mu": 0.0, "omega": 0.05, "alpha[1]": 0.1, "beta[1]": 0.85})
+
+    def arch_model(scaled_returns, **kwargs):
+        def fit(**kwargs):
+            fits.append(1)
+            variance = statistics._garch_next_variance(scaled_returns, 0.05, 0.1, 0.85)
+            forecast = SimpleNamespace(variance=pd.DataFrame([[variance]]))
+            return SimpleNamespace(params=params, forecast=lambda horizon: forecast)
+        return SimpleNamespace(fit=fit)
+
+    monkeypatch.setattr(statistics, "ARCH_AVAILABLE", True)
+    monkeypatch.setattr(statistics, "arch_model", arch_model, raising=False)
+    monkeypatch.setattr(statistics, "_garch_cache", {})
+    return fits
+
+
+def test_garch_refits_per_key_interval_and_always_without_key(counted_fits) -> None:
+    """Keyed calls reuse parameters between refits; calls without a key never share a fit."""
+    rng = random.Random(19)
+    returns = [rng.gauss(0, 0.01) for _ in range(200)]
+
+    keyed = [forecast_volatility(returns, cache_key="BTCUSDT") for _ in range(GARCH_REFIT_INTERVAL + 1)]
+    assert len(counted_fits) == 2
+    assert keyed == pytest.approx([keyed[0]] * len(keyed))
+
+    counted_fits.clear()
+    for _ in range(3):
+        forecast_volatility(returns)
+    assert len(counted_fits) == 3
+    assert None not in statistics._garch_cache
+    assert np.isfinite(keyed[0])